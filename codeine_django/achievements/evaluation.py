@@ -0,0 +1,216 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from celery.exceptions import OperationalError
+
+from collections import defaultdict
+
+import threading
+
+from .models import Achievement, AchievementRequirement, MemberAchievement, RequirementVersion
+from common.skills import get_members_with_skills
+from notifications.models import Notification
+from notifications.fanout import fan_out
+
+# edits through the ORM bump the shared version and reach every process on its next evaluation,
+# edits that skip signals (bulk updates, raw SQL) are picked up after this long
+REQUIREMENT_CACHE_TIMEOUT = 5 * 60  # seconds
+REQUIREMENT_VERSION_NAME = 'achievement_requirements'
+BACKFILL_BATCH_SIZE = 1000
+BACKFILL_DELAY = 60  # seconds, requirements are added one request at a time
+
+
+def get_requirement_version():
+    return RequirementVersion.objects.filter(name=REQUIREMENT_VERSION_NAME).values_list('version', flat=True).first() or 0
+# end def
+
+
+def bump_requirement_version():
+    '''
+    Marks the requirement tables of every process stale
+    '''
+    RequirementVersion.objects.get_or_create(name=REQUIREMENT_VERSION_NAME)
+    RequirementVersion.objects.filter(name=REQUIREMENT_VERSION_NAME).update(version=F('version') + 1)
+# end def
+
+
+class RequirementTable:
+    '''
+    In-process table of the requirements of active achievements, indexed by stat
+    Reloaded with one query when the shared RequirementVersion changes, see achievements.signals,
+    checked with one primary key lookup per evaluation
+    '''
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.requirements = {}  # achievement_id -> {stat: experience points}
+        self.achievements_by_stat = defaultdict(set)  # stat -> achievement ids
+        self.loaded = None
+        self.version = None
+        self.lock = threading.Lock()
+    # end def
+
+    def invalidate(self):
+        # other processes must not reload before the edit is visible to them
+        transaction.on_commit(bump_requirement_version)
+        with self.lock:
+            self.loaded = None
+        # end with
+    # end def
+
+    def load(self, version):
+        requirements = defaultdict(dict)
+        achievements_by_stat = defaultdict(set)
+        rows = AchievementRequirement.objects.filter(achievement__is_deleted=False).values_list('achievement_id', 'stat', 'experience_point')
+        for achievement_id, stat, experience_point in rows:
+            # several requirements on one stat all have to be met
+            requirements[achievement_id][stat] = max(requirements[achievement_id].get(stat, 0), experience_point)
+            achievements_by_stat[stat].add(achievement_id)
+        # end for
+
+        self.requirements = dict(requirements)
+        self.achievements_by_stat = achievements_by_stat
+        self.loaded = timezone.now()
+        self.version = version
+    # end def
+
+    def is_stale(self, version):
+        if self.loaded is None or self.version != version:
+            return True
+        # end if
+        return (timezone.now() - self.loaded).total_seconds() > self.timeout
+    # end def
+
+    def get(self, stats):
+        '''
+        {achievement_id: {stat: experience points}} of achievements with a requirement on any of the stats
+        '''
+        version = get_requirement_version()
+        with self.lock:
+            if self.is_stale(version):
+                self.load(version)
+            # end if
+
+            achievement_ids = set()
+            for stat in stats:
+                achievement_ids |= self.achievements_by_stat.get(stat, set())
+            # end for
+            return {achievement_id: self.requirements[achievement_id] for achievement_id in achievement_ids}
+        # end with
+    # end def
+# end class
+
+
+requirement_table = RequirementTable(REQUIREMENT_CACHE_TIMEOUT)
+
+
+def meets_requirements(stats, requirements):
+    return all(stats.get(stat, 0) >= experience_point for stat, experience_point in requirements.items())
+# end def
+
+
+def notify_achievement(achievement, user_ids):
+    '''
+    Sends one notification for achievement to every user
+    '''
+    notification = Notification(
+        title='Congratulations! You met the requirements for a new achievement!',
+        description=f'You have attained {achievement.title}!',
+        notification_type='GENERAL'
+    )
+    notification.save()
+    return fan_out(notification.id, user_ids)
+# end def
+
+
+def evaluate_achievements(member, changed_stats):
+    '''
+    Awards the achievements member newly meets, checking only achievements with a requirement on the changed stats
+    Returns the MemberAchievements created
+    '''
+    candidates = requirement_table.get(changed_stats)
+    earned = [achievement_id for achievement_id, requirements in candidates.items() if meets_requirements(member.stats, requirements)]
+    if len(earned) == 0:
+        return []
+    # end if
+
+    owned = set(MemberAchievement.objects.filter(member=member, achievement__in=earned).values_list('achievement_id', flat=True))
+    member_achievements = [MemberAchievement(achievement_id=achievement_id, member=member) for achievement_id in earned if achievement_id not in owned]
+    MemberAchievement.objects.bulk_create(member_achievements)
+
+    # bulk_create skips post_save, so members are notified here
+    for achievement in Achievement.objects.filter(pk__in=[member_achievement.achievement_id for member_achievement in member_achievements]):
+        notify_achievement(achievement, [member.user_id])
+    # end for
+    return member_achievements
+# end def
+
+
+def backfill_achievement(achievement_id, batch_size=BACKFILL_BATCH_SIZE):
+    '''
+    Awards an achievement to every member who already meets its requirements
+    Achievements without requirements are not awarded
+    Returns the number of members awarded
+    '''
+    achievement = Achievement.objects.filter(pk=achievement_id, is_deleted=False).first()
+    if achievement is None:
+        return 0
+    # end if
+
+    requirements = defaultdict(int)
+    for stat, experience_point in achievement.achievement_requirements.values_list('stat', 'experience_point'):
+        requirements[stat] = max(requirements[stat], experience_point)
+    # end for
+    if len(requirements) == 0:
+        return 0
+    # end if
+
+    members = get_members_with_skills(requirements).exclude(achievements__achievement=achievement)
+
+    awarded = 0
+    batch = []
+    for member_id, user_id in members.values_list('id', 'user_id').iterator():
+        batch.append((member_id, user_id))
+        if len(batch) >= batch_size:
+            awarded += award_achievement(achievement, batch)
+            batch = []
+        # end if
+    # end for
+
+    if len(batch) > 0:
+        awarded += award_achievement(achievement, batch)
+    # end if
+    return awarded
+# end def
+
+
+def award_achievement(achievement, members):
+    '''
+    Awards achievement to a batch of (member id, user id) with one insert and one notification
+    '''
+    with transaction.atomic():
+        MemberAchievement.objects.bulk_create([MemberAchievement(achievement=achievement, member_id=member_id) for member_id, user_id in members])
+        notify_achievement(achievement, [user_id for member_id, user_id in members if user_id is not None])
+    # end with
+    return len(members)
+# end def
+
+
+def schedule_backfill(achievement_id):
+    '''
+    Backfills achievement through celery once the current transaction commits, inline when the broker is unreachable
+    '''
+    from .tasks import backfill_member_achievements
+
+    achievement_id = str(achievement_id)
+
+    def enqueue():
+        try:
+            backfill_member_achievements.apply_async(args=(achievement_id,), countdown=BACKFILL_DELAY)
+        except OperationalError:
+            backfill_member_achievements(achievement_id)
+        # end try-except
+    # end def
+
+    transaction.on_commit(enqueue)
+# end def
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from achievements.evaluation import backfill_achievement
+from achievements.models import Achievement
+
+
+class Command(BaseCommand):
+    help = 'Awards achievements to members who already meet their requirements'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--achievement', help='Only backfill the achievement with this id')
+    # end def
+
+    def handle(self, *args, **options):
+        achievements = Achievement.objects.filter(is_deleted=False)
+        if options['achievement'] is not None:
+            achievements = achievements.filter(pk=options['achievement'])
+        # end if
+
+        awarded = 0
+        for achievement_id in achievements.values_list('id', flat=True):
+            awarded += backfill_achievement(achievement_id)
+        # end for
+        self.stdout.write(f'{self.style.SUCCESS("Success")}: {awarded} achievements awarded')
+    # end def
+# end class
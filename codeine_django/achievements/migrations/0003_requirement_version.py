@@ -0,0 +1,20 @@
+# Generated by Django 3.2.3 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0002_auto_20210412_1423'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequirementVersion',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('version', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
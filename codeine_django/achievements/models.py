@@ -6,6 +6,8 @@ from django.core.exceptions import ValidationError
 
 import uuid
 
+from common.models import SKILLS
+
 
 def image_directory_path(instance, filename):
     return 'achievement_{0}/image_{1}'.format(instance.id, filename)
@@ -22,22 +24,7 @@ class Achievement(models.Model):
 
 
 class AchievementRequirement(models.Model):
-    STATS = (
-        ('PY', 'Python'),
-        ('JAVA', 'Java'),
-        ('JS', 'Javascript'),
-        ('CPP', 'C++'),
-        ('CS', 'C#'),
-        ('HTML', 'HTML'),
-        ('CSS', 'CSS'),
-        ('RUBY', 'Ruby'),
-        ('SEC', 'Security'),
-        ('DB', 'Database Administration'),
-        ('FE', 'Frontend'),
-        ('BE', 'Backend'),
-        ('UI', 'UI/UX'),
-        ('ML', 'Machine Learning'),
-    )
+    STATS = SKILLS
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, unique=True)
     stat = models.CharField(max_length=255, choices=STATS)
@@ -52,3 +39,12 @@ class MemberAchievement(models.Model):
     member = models.ForeignKey('common.Member', on_delete=models.CASCADE, related_name='achievements')
     timestamp = models.DateTimeField(auto_now_add=True)
 # end class
+
+
+class RequirementVersion(models.Model):
+    '''
+    Counts achievement and requirement edits, shared by every web and celery process, see achievements.evaluation
+    '''
+    name = models.CharField(max_length=255, primary_key=True)
+    version = models.PositiveIntegerField(default=0)
+# end class
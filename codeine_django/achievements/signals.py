@@ -1,25 +1,30 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
-from .models import MemberAchievement
-from notifications.models import Notification, NotificationObject
+from .models import Achievement, AchievementRequirement, MemberAchievement
+from .evaluation import requirement_table, notify_achievement, schedule_backfill
 
 
 @receiver(post_save, sender=MemberAchievement)
 def update_member_achievement(sender, instance, created, **kwargs):
-    achievement = instance.achievement
-    receiver = instance.member.user
-
     if created:
-        title = f'Congratulations! You met the requirements for a new achievement!'
-        description = f'You have attained {achievement.title}!'
-        notification_type = 'GENERAL'
-        notification = Notification(
-            title=title, description=description, notification_type=notification_type)
-        notification.save()
-
-        notification_object = NotificationObject(
-            receiver=receiver, notification=notification)
-        notification_object.save()
+        notify_achievement(instance.achievement, [instance.member.user_id])
     # end if
 # end def
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def invalidate_achievements(sender, instance, **kwargs):
+    requirement_table.invalidate()
+# end def
+
+
+@receiver(post_save, sender=AchievementRequirement)
+@receiver(post_delete, sender=AchievementRequirement)
+def update_achievement_requirements(sender, instance, **kwargs):
+    requirement_table.invalidate()
+
+    # members who already meet the new requirements get the achievement too
+    schedule_backfill(instance.achievement_id)
+# end def
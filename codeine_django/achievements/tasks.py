@@ -0,0 +1,11 @@
+from __future__ import absolute_import, unicode_literals
+
+from celery import shared_task
+
+from .evaluation import backfill_achievement
+
+
+@shared_task
+def backfill_member_achievements(achievement_id):
+    return backfill_achievement(achievement_id)
+# end def
@@ -1,3 +1,130 @@
 from django.test import TestCase
 
-# Create your tests here.
+from datetime import timedelta
+
+from .evaluation import RequirementTable, REQUIREMENT_CACHE_TIMEOUT, requirement_table, evaluate_achievements, backfill_achievement
+from .models import Achievement, AchievementRequirement, MemberAchievement
+from common.models import BaseUser, Member
+from notifications.models import NotificationObject
+
+
+class AchievementTestCase(TestCase):
+
+    def create_member(self, index, stats):
+        user = BaseUser.objects.create_user(f'member{index}@codeine.com', 'password')
+        return Member.objects.create(user=user, unique_id=f'member{index}', stats=stats)
+    # end def
+
+    def create_achievement(self, title, requirements):
+        achievement = Achievement.objects.create(title=title)
+        for stat, experience_point in requirements.items():
+            AchievementRequirement.objects.create(achievement=achievement, stat=stat, experience_point=experience_point)
+        # end for
+        return achievement
+    # end def
+# end class
+
+
+class RequirementTableTest(AchievementTestCase):
+
+    def setUp(self):
+        self.achievement = self.create_achievement('Pythonista', {'PY': 100})
+
+        # the table of another web or celery process
+        self.other = RequirementTable(REQUIREMENT_CACHE_TIMEOUT)
+        self.assertEqual(self.other.get(['PY']), {self.achievement.id: {'PY': 100}})
+    # end def
+
+    def test_edits_reach_other_processes_through_the_shared_version(self):
+        AchievementRequirement.objects.filter(achievement=self.achievement).update(experience_point=500)
+        self.assertEqual(self.other.get(['PY']), {self.achievement.id: {'PY': 100}})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            requirement_table.invalidate()
+        # end with
+        self.assertEqual(self.other.get(['PY']), {self.achievement.id: {'PY': 500}})
+    # end def
+
+    def test_edits_skipping_signals_are_picked_up_after_the_timeout(self):
+        AchievementRequirement.objects.filter(achievement=self.achievement).update(experience_point=500)
+        self.other.loaded -= timedelta(seconds=REQUIREMENT_CACHE_TIMEOUT + 1)
+        self.assertEqual(self.other.get(['PY']), {self.achievement.id: {'PY': 500}})
+    # end def
+
+    def test_version_is_read_once_per_lookup(self):
+        with self.assertNumQueries(1):
+            self.other.get(['PY', 'JAVA'])
+        # end with
+    # end def
+# end class
+
+
+class EvaluateAchievementsTest(AchievementTestCase):
+
+    def test_awards_only_met_achievements_of_changed_stats(self):
+        met = self.create_achievement('Pythonista', {'PY': 100})
+        self.create_achievement('Python master', {'PY': 200})
+        self.create_achievement('Full stack', {'PY': 100, 'JS': 100})
+        java = self.create_achievement('Java', {'JAVA': 10})
+        member = self.create_member(0, {'PY': 150, 'JAVA': 20})
+
+        # JAVA did not change, so its achievement is not checked
+        member_achievements = evaluate_achievements(member, {'PY': 150})
+        self.assertEqual([member_achievement.achievement_id for member_achievement in member_achievements], [met.id])
+        self.assertFalse(MemberAchievement.objects.filter(member=member, achievement=java).exists())
+        self.assertEqual(NotificationObject.objects.filter(receiver=member.user).count(), 1)
+
+        # owned achievements are not awarded again
+        self.assertEqual(evaluate_achievements(member, {'PY': 150}), [])
+        self.assertEqual(MemberAchievement.objects.filter(member=member).count(), 1)
+    # end def
+
+    def test_deleted_achievements_are_not_awarded(self):
+        achievement = self.create_achievement('Pythonista', {'PY': 100})
+        achievement.is_deleted = True
+        achievement.save()
+
+        member = self.create_member(0, {'PY': 150})
+        self.assertEqual(evaluate_achievements(member, {'PY': 150}), [])
+    # end def
+# end class
+
+
+class BackfillAchievementTest(AchievementTestCase):
+
+    def setUp(self):
+        self.members = [self.create_member(index, {'PY': points, 'JS': points}) for index, points in enumerate([50, 150, 300, 400])]
+    # end def
+
+    def test_awards_members_meeting_every_requirement_in_batches(self):
+        achievement = self.create_achievement('Pythonista', {'PY': 100, 'JS': 200})
+        MemberAchievement.objects.create(achievement=achievement, member=self.members[3])
+        NotificationObject.objects.all().delete()
+
+        self.assertEqual(backfill_achievement(achievement.id, batch_size=1), 1)
+        awarded = MemberAchievement.objects.filter(achievement=achievement).values_list('member_id', flat=True)
+        self.assertEqual(set(awarded), {self.members[2].id, self.members[3].id})
+        self.assertEqual(list(NotificationObject.objects.values_list('receiver_id', flat=True)), [self.members[2].user_id])
+
+        # a second run finds nobody new
+        self.assertEqual(backfill_achievement(achievement.id), 0)
+    # end def
+
+    def test_batches_share_one_notification_each(self):
+        achievement = self.create_achievement('Pythonista', {'PY': 100})
+
+        self.assertEqual(backfill_achievement(achievement.id, batch_size=2), 3)
+        self.assertEqual(MemberAchievement.objects.filter(achievement=achievement).count(), 3)
+        self.assertEqual(NotificationObject.objects.values('notification').distinct().count(), 2)
+    # end def
+
+    def test_achievements_without_requirements_are_not_awarded(self):
+        achievement = self.create_achievement('Empty', {})
+        self.assertEqual(backfill_achievement(achievement.id), 0)
+
+        achievement = self.create_achievement('Deleted', {'PY': 100})
+        Achievement.objects.filter(pk=achievement.pk).update(is_deleted=True)
+        self.assertEqual(backfill_achievement(achievement.id), 0)
+        self.assertFalse(MemberAchievement.objects.exists())
+    # end def
+# end class
@@ -9,7 +9,6 @@ from rest_framework.permissions import IsAdminUser, AllowAny
 from .models import Achievement
 from .serializers import AchievementSerializer, FullAchievementSerializer
 from common.permissions import IsMemberOrAdminOrReadOnly
-from utils.member_utils import get_member_stats
 
 
 @api_view(['GET', 'POST'])
@@ -129,7 +128,6 @@ def get_member_achievements(request, pk):
     Returns all member achievements
     '''
     if request.method == 'GET':
-        # print(get_member_stats(pk))
         return Response()
     # end if
 # end def
@@ -9,6 +9,7 @@ from rest_framework.permissions import (
 
 from .models import Achievement, AchievementRequirement
 from .serializers import AchievementRequirementSerializer
+from common.skills import get_skill_code
 
 
 @api_view(['GET', 'POST', 'DELETE'])
@@ -40,31 +41,10 @@ def achievement_requirement_view(request, pk):
             # print(data['stat'])
 
             achievement = Achievement.objects.get(pk=pk)
-            stat = data['stat']
-            if stat == 'Machine Learning':
-                stat = 'ML'
-            if stat == 'Database Administration':
-                stat = 'DB'
-            if stat == 'Security':
-                stat = 'SEC'
-            if stat == 'UI/UX':
-                stat = 'UI'
-            if stat == 'Frontend':
-                stat = "FE"
-            if stat == 'Backend':
-                stat = 'BE'
-            if stat == 'Python':
-                stat = 'PY'
-            if stat == 'Java':
-                stat = 'JAVA'
-            if stat == 'Javascript':
-                stat = 'JS'
-            if stat == 'C++':
-                stat = 'CPP'
-            if stat == 'C#':
-                stat = 'CS'
-            if stat == 'Ruby':
-                stat = 'RUBY'
+            stat = get_skill_code(data['stat'])
+            if stat is None:
+                raise ValueError(f'Unknown stat {data["stat"]}')
+            # end if
 
             requirement = AchievementRequirement(
                 stat=stat,
@@ -124,7 +104,10 @@ def single_achievement_requirement_view(request, pk, req_id):
             data = request.data
 
             if 'stat' in data:
-                requirement.category = data['stat']
+                requirement.stat = get_skill_code(data['stat'])
+                if requirement.stat is None:
+                    raise ValueError(f'Unknown stat {data["stat"]}')
+                # end if
             if 'experience_point' in data:
                 requirement.experience_point = data['experience_point']
             # end if
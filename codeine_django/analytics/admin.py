@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import EventLog
+from .models import EventLog, ActiveSession
 
 
 class EventLogAdmin(admin.ModelAdmin):
@@ -17,4 +17,17 @@ class EventLogAdmin(admin.ModelAdmin):
 # end class
 
 
+
+
+class ActiveSessionAdmin(admin.ModelAdmin):
+    list_display = (
+        'started',
+        'session_type',
+        'target_id',
+        'user',
+    )
+# end class
+
+
 admin.site.register(EventLog, EventLogAdmin)
+admin.site.register(ActiveSession, ActiveSessionAdmin)
@@ -0,0 +1,162 @@
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from collections import deque
+
+import atexit
+import logging
+import threading
+import uuid
+
+from .models import EventLog
+from .sessions import track_sessions
+from courses.models import Course, CourseMaterial, Quiz
+from industry_projects.models import IndustryProject
+
+logger = logging.getLogger(__name__)
+
+# payload strings clients send -> stored codes
+PAYLOAD_CODES = {label: code for code, label in EventLog.Payload.choices if code != EventLog.Payload.UNKNOWN}
+
+# foreign keys accepted from clients, validated in one query per model when a batch is written
+EVENT_REFERENCES = (
+    ('course_id', Course),
+    ('course_material_id', CourseMaterial),
+    ('quiz_id', Quiz),
+    ('industry_project_id', IndustryProject),
+)
+
+def build_event(user, data):
+    '''
+    Validates a client event into a dict that can be buffered, without touching the database
+    Raises KeyError/ValueError for malformed events
+    '''
+    payload = data['payload']
+    if payload not in PAYLOAD_CODES:
+        raise ValueError(f'Unknown payload {payload}')
+    # end if
+
+    event = {
+        'payload': PAYLOAD_CODES[payload],
+        'user_id': user.id if user is not None and user.is_authenticated else None,
+        'search_string': data.get('search_string', None),
+        'timestamp': timezone.now(),
+    }
+
+    for key, model in EVENT_REFERENCES:
+        value = data.get(key, None)
+        event[key] = uuid.UUID(str(value)) if value not in (None, '') else None
+    # end for
+
+    if event['search_string'] is not None:
+        event['search_string'] = str(event['search_string'])[:255]
+    # end if
+    return event
+# end def
+
+
+def write_events(events):
+    '''
+    Writes buffered events with one bulk insert, durations come from analytics.sessions
+    References to rows that do not exist are dropped, as the single event endpoint always did
+    '''
+    if len(events) == 0:
+        return 0
+    # end if
+
+    for key, model in EVENT_REFERENCES:
+        ids = set(event[key] for event in events if event[key] is not None)
+        existing = set(model.objects.filter(pk__in=ids).values_list('pk', flat=True)) if len(ids) > 0 else set()
+        for event in events:
+            if event[key] not in existing:
+                event[key] = None
+            # end if
+        # end for
+    # end for
+
+    event_logs = [EventLog(**event) for event in sorted(events, key=lambda event: event['timestamp'])]
+
+    with transaction.atomic():
+        track_sessions(event_logs)
+        EventLog.objects.bulk_create(event_logs, batch_size=settings.ANALYTICS_BATCH_SIZE)
+    # end with
+    return len(event_logs)
+# end def
+
+
+class EventBuffer:
+    '''
+    In-process ring buffer of events, written in batches by a background thread
+    When the buffer is full the oldest events are dropped, analytics never block requests
+    '''
+
+    def __init__(self, size, batch_size, interval):
+        self.events = deque(maxlen=size)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+    # end def
+
+    def add(self, events):
+        with self.lock:
+            self.events.extend(events)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='analytics-event-buffer', daemon=True)
+                self.thread.start()
+            # end if
+        # end with
+
+        if len(self.events) >= self.batch_size:
+            self.wakeup.set()
+        # end if
+    # end def
+
+    def take(self):
+        with self.lock:
+            events = [self.events.popleft() for i in range(min(self.batch_size, len(self.events)))]
+        # end with
+        return events
+    # end def
+
+    def flush(self):
+        written = 0
+        events = self.take()
+        while len(events) > 0:
+            try:
+                written += write_events(events)
+            except Exception:
+                logger.exception('Dropped %s analytics events', len(events))
+            # end try-except
+            events = self.take()
+        # end while
+        return written
+    # end def
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            close_old_connections()
+            self.flush()
+        # end while
+    # end def
+# end class
+
+
+event_buffer = EventBuffer(settings.ANALYTICS_BUFFER_SIZE, settings.ANALYTICS_BATCH_SIZE, settings.ANALYTICS_FLUSH_INTERVAL)
+atexit.register(event_buffer.flush)
+
+
+def ingest_events(events):
+    '''
+    Buffers events when ANALYTICS_BUFFERED is set, writes them right away otherwise
+    '''
+    if settings.ANALYTICS_BUFFERED:
+        event_buffer.add(events)
+    else:
+        write_events(events)
+    # end if-else
+# end def
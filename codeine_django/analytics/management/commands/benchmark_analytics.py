@@ -0,0 +1,114 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from datetime import timedelta
+from random import choice, randint
+
+import time
+
+from analytics.models import EventLog
+from common.models import BaseUser, Partner
+from courses.models import Course, CourseMaterial
+from industry_projects.models import IndustryProject
+
+ENDPOINTS = (
+    # (url, query string needs a course id)
+    ('/analytics/course-conversion-rate', False),
+    ('/analytics/course-material-time', True),
+    ('/analytics/course-time', True),
+    ('/analytics/inactive-members', True),
+    ('/analytics/course-members-stats', True),
+    ('/analytics/course-search-ranking', False),
+    ('/analytics/ip-search-ranking', False),
+    ('/analytics/ip-viewer-average-skill', False),
+    ('/analytics/ip-application-rate', False),
+)
+SEARCH_STRINGS = ('python', 'java', 'react', 'django', 'sql', 'machine learning', 'css', 'security')
+
+
+class Command(BaseCommand):
+    help = 'Times the analytics endpoints against the current EventLog table, optionally seeding synthetic events first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Number of synthetic events to insert first, e.g. 10000000')
+        parser.add_argument('--days', type=int, default=120, help='Spread seeded events over this many days')
+        parser.add_argument('--runs', type=int, default=3, help='Timed runs per endpoint, the best one is reported')
+    # end def
+
+    def seed(self, count, days):
+        users = list(BaseUser.objects.values_list('id', flat=True)[:1000])
+        courses = list(Course.objects.values_list('id', flat=True))
+        course_materials = list(CourseMaterial.objects.values_list('id', 'chapter__course_id'))
+        industry_projects = list(IndustryProject.objects.values_list('id', flat=True))
+        if len(users) == 0 or len(courses) == 0:
+            raise CommandError('Seeding needs users and courses, run initdb first')
+        # end if
+
+        now = timezone.now()
+        seconds = days * 24 * 60 * 60
+        written = 0
+        while written < count:
+            event_logs = []
+            for i in range(min(10000, count - written)):
+                event_log = EventLog(user_id=choice(users), timestamp=now - timedelta(seconds=randint(0, seconds)))
+                kind = randint(0, 9)
+                if kind < 4 or len(course_materials) == 0:
+                    event_log.payload = EventLog.Payload.COURSE_VIEW
+                    event_log.course_id = choice(courses)
+                elif kind < 7:
+                    event_log.payload = EventLog.Payload.STOP_COURSE_MATERIAL
+                    event_log.course_material_id, event_log.course_id = choice(course_materials)
+                    event_log.duration = randint(60, 2400)
+                elif kind < 8 or len(industry_projects) == 0:
+                    event_log.payload = EventLog.Payload.SEARCH_COURSE
+                    event_log.search_string = choice(SEARCH_STRINGS)
+                else:
+                    event_log.payload = EventLog.Payload.VIEW_INDUSTRY_PROJECT
+                    event_log.industry_project_id = choice(industry_projects)
+                # end if-else
+                event_logs.append(event_log)
+            # end for
+
+            EventLog.objects.bulk_create(event_logs)
+            written += len(event_logs)
+            self.stdout.write(f'Seeded {written}/{count} events')
+        # end while
+    # end def
+
+    def handle(self, *args, **options):
+        if options['seed'] > 0:
+            self.seed(options['seed'], options['days'])
+        # end if
+
+        partner = Partner.objects.filter(courses__isnull=False).select_related('user').first()
+        if partner is None:
+            raise CommandError('No partner with courses to run the analytics views as')
+        # end if
+        course = partner.courses.first()
+
+        client = APIClient()
+        client.force_authenticate(partner.user)
+
+        self.stdout.write(f'EventLog rows: {EventLog.objects.count()}')
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for url, needs_course in ENDPOINTS:
+                path = f'{url}?course_id={course.id}' if needs_course else url
+
+                timings = []
+                for i in range(options['runs']):
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        response = client.get(path)
+                        timings.append(time.perf_counter() - start)
+                    # end with
+                # end for
+
+                result = f'{min(timings) * 1000:.1f} ms, {len(queries)} queries'
+                self.stdout.write(f'{url} [{response.status_code}]: {self.style.SUCCESS(result)}')
+            # end for
+        # end with
+    # end def
+# end class
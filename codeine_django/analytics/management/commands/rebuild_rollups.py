@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the daily analytics rollups from the whole EventLog history'
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {written} groups'))
+    # end def
+# end class
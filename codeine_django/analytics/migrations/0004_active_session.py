@@ -0,0 +1,30 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0003_event_log_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActiveSession',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_type', models.CharField(choices=[('COURSE', 'Course'), ('COURSE_MATERIAL', 'Course Material'), ('ASSESSMENT', 'Assessment')], max_length=255)),
+                ('target_id', models.UUIDField()),
+                ('started', models.DateTimeField(db_index=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='activesession',
+            constraint=models.UniqueConstraint(fields=('user', 'session_type', 'target_id'), name='ActiveSession Unique Constraint: target'),
+        ),
+    ]
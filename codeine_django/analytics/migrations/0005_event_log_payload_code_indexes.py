@@ -0,0 +1,110 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+UNKNOWN_PAYLOAD = (0, 'unknown')
+PAYLOADS = [(1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')]
+
+
+def encode_payloads(apps, schema_editor):
+    EventLog = apps.get_model('analytics', 'EventLog')
+    for code, payload in PAYLOADS:
+        EventLog.objects.filter(payload=payload).update(payload_code=code)
+    # end for
+
+    # payloads were never validated before, any other string is kept under an explicit unknown code
+    code, payload = UNKNOWN_PAYLOAD
+    EventLog.objects.filter(payload_code=None).update(payload_code=code)
+# end def
+
+
+def decode_payloads(apps, schema_editor):
+    EventLog = apps.get_model('analytics', 'EventLog')
+    for code, payload in [UNKNOWN_PAYLOAD] + PAYLOADS:
+        EventLog.objects.filter(payload_code=code).update(payload=payload)
+    # end for
+# end def
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_course_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('industry_projects', '0001_initial'),
+        ('analytics', '0004_active_session'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventlog',
+            name='course',
+            field=models.ForeignKey(blank=True, db_index=False, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, to='courses.course'),
+        ),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='course_material',
+            field=models.ForeignKey(blank=True, db_index=False, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, to='courses.coursematerial'),
+        ),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='industry_project',
+            field=models.ForeignKey(blank=True, db_index=False, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, to='industry_projects.industryproject'),
+        ),
+        migrations.AddField(
+            model_name='eventlog',
+            name='payload_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='payload',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.RunPython(encode_payloads, decode_payloads),
+        migrations.RemoveField(
+            model_name='eventlog',
+            name='payload',
+        ),
+        migrations.RenameField(
+            model_name='eventlog',
+            old_name='payload_code',
+            new_name='payload',
+        ),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='payload',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')]),
+        ),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='event_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['payload', 'timestamp'], include=('search_string',), name='eventlog_payload_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['course', 'payload', 'timestamp'], include=('user', 'duration'), name='eventlog_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['course_material', 'payload', 'timestamp'], include=('user', 'duration'), name='eventlog_material_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['industry_project', 'payload', 'timestamp'], include=('user',), name='eventlog_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['user', 'payload', 'timestamp'], include=('course_material', 'duration'), name='eventlog_user_payload_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['user', 'timestamp'], name='eventlog_user_time_idx'),
+        ),
+    ]
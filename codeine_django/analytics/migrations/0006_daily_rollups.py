@@ -0,0 +1,106 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('courses', '0005_course_search_document'),
+        ('industry_projects', '0001_initial'),
+        ('analytics', '0005_event_log_payload_code_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCourseEventCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payload', models.PositiveSmallIntegerField(choices=[(1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')])),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyIndustryProjectEventCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payload', models.PositiveSmallIntegerField(choices=[(1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')])),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyMaterialDuration',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('duration', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailySearchCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payload', models.PositiveSmallIntegerField(choices=[(1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')])),
+                ('search_string', models.CharField(blank=True, max_length=255, null=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('timestamp', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailysearchcount',
+            index=models.Index(fields=['payload', 'date'], name='search_rollup_payload_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailysearchcount',
+            constraint=models.UniqueConstraint(fields=('date', 'payload', 'search_string'), name='DailySearchCount Unique Constraint: day'),
+        ),
+        migrations.AddField(
+            model_name='dailymaterialduration',
+            name='course_material',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.coursematerial'),
+        ),
+        migrations.AddField(
+            model_name='dailymaterialduration',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='dailyindustryprojecteventcount',
+            name='industry_project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='industry_projects.industryproject'),
+        ),
+        migrations.AddField(
+            model_name='dailyindustryprojecteventcount',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='dailycourseeventcount',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.course'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailymaterialduration',
+            constraint=models.UniqueConstraint(fields=('date', 'course_material', 'user'), name='DailyMaterialDuration Unique Constraint: day'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyindustryprojecteventcount',
+            constraint=models.UniqueConstraint(fields=('date', 'industry_project', 'payload', 'user'), name='DailyIndustryProjectEventCount Unique Constraint: day'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailycourseeventcount',
+            constraint=models.UniqueConstraint(fields=('date', 'course', 'payload'), name='DailyCourseEventCount Unique Constraint: day'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0006_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMemberSkillDuration',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('skill', models.CharField(max_length=10)),
+                ('duration', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailymaterialduration',
+            index=models.Index(fields=['user', 'date'], name='material_rollup_user_idx'),
+        ),
+        migrations.AddField(
+            model_name='dailymemberskillduration',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='dailymemberskillduration',
+            index=models.Index(fields=['user', 'date'], name='skill_rollup_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailymemberskillduration',
+            constraint=models.UniqueConstraint(fields=('date', 'user', 'skill'), name='DailyMemberSkillDuration Unique Constraint: day'),
+        ),
+    ]
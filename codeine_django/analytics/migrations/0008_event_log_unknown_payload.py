@@ -0,0 +1,33 @@
+# Generated by Django 3.2.3 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_member_skill_rollup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailycourseeventcount',
+            name='payload',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'unknown'), (1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')]),
+        ),
+        migrations.AlterField(
+            model_name='dailyindustryprojecteventcount',
+            name='payload',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'unknown'), (1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')]),
+        ),
+        migrations.AlterField(
+            model_name='dailysearchcount',
+            name='payload',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'unknown'), (1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')]),
+        ),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='payload',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'unknown'), (1, 'course view'), (2, 'continue course'), (3, 'stop course'), (4, 'continue course material'), (5, 'stop course material'), (6, 'start assessment'), (7, 'continue assessment'), (8, 'stop assessment'), (9, 'search course'), (10, 'search industry project'), (11, 'view industry project')]),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def set_written(apps, schema_editor):
+    # rows already in the table count as written when they happened, as the watermark assumed so far
+    EventLog = apps.get_model('analytics', 'EventLog')
+    EventLog.objects.update(written=models.F('timestamp'))
+# end def
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_event_log_unknown_payload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventlog',
+            name='written',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(set_written, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='eventlog',
+            name='written',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['written'], name='eventlog_written_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 import uuid
 
@@ -6,30 +7,159 @@ import uuid
 class EventLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, unique=True)
 
-    # payloads:
-    # 1. "course view", course
-    # 2. "continue course", course, user
-    # 3. "stop course", course, user,
-    # 4. "continue course material", course material, user
-    # 5. "stop course material", course material, user
-    # 6. "start assessment", quiz, user
-    # 7. "stop assessment", quiz, user
-    # 8. "search course", search string, user
-    # 9. "search industry project", search string, user
-    # 10. "view industry project", industry project, user
-    payload = models.CharField(max_length=255)
-
-    timestamp = models.DateTimeField(auto_now_add=True)
-    user = models.ForeignKey('common.BaseUser', on_delete=models.SET_NULL, null=True, blank=True, default=None, related_name='event_logs')
-    course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, null=True, blank=True, default=None)
-    course_material = models.ForeignKey('courses.CourseMaterial', on_delete=models.CASCADE, null=True, blank=True, default=None)
+    class Payload(models.IntegerChoices):
+        # labels are the payload strings clients send
+        UNKNOWN = 0, 'unknown'  # unrecognised strings stored before payloads were validated, never accepted from clients
+        COURSE_VIEW = 1, 'course view'  # course
+        CONTINUE_COURSE = 2, 'continue course'  # course, user
+        STOP_COURSE = 3, 'stop course'  # course, user
+        CONTINUE_COURSE_MATERIAL = 4, 'continue course material'  # course material, user
+        STOP_COURSE_MATERIAL = 5, 'stop course material'  # course material, user
+        START_ASSESSMENT = 6, 'start assessment'  # quiz, user
+        CONTINUE_ASSESSMENT = 7, 'continue assessment'  # quiz, user
+        STOP_ASSESSMENT = 8, 'stop assessment'  # quiz, user
+        SEARCH_COURSE = 9, 'search course'  # search string, user
+        SEARCH_INDUSTRY_PROJECT = 10, 'search industry project'  # search string, user
+        VIEW_INDUSTRY_PROJECT = 11, 'view industry project'  # industry project, user
+    # end class
+
+    payload = models.PositiveSmallIntegerField(choices=Payload.choices)
+
+    timestamp = models.DateTimeField(default=timezone.now)  # set when the event is received, it may be written later
+    written = models.DateTimeField(auto_now_add=True)  # set when the row is inserted, rollups follow this, see analytics.rollups
+    user = models.ForeignKey('common.BaseUser', on_delete=models.SET_NULL, null=True, blank=True, default=None, related_name='event_logs', db_index=False)
+    course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, null=True, blank=True, default=None, db_index=False)
+    course_material = models.ForeignKey('courses.CourseMaterial', on_delete=models.CASCADE, null=True, blank=True, default=None, db_index=False)
     quiz = models.ForeignKey('courses.Quiz', on_delete=models.CASCADE, null=True, blank=True, default=None)
-    industry_project = models.ForeignKey('industry_projects.IndustryProject', on_delete=models.CASCADE, null=True, blank=True, default=None)
+    industry_project = models.ForeignKey('industry_projects.IndustryProject', on_delete=models.CASCADE, null=True, blank=True, default=None, db_index=False)
     duration = models.PositiveBigIntegerField(null=True, blank=True, default=None)
 
     search_string = models.CharField(max_length=255, null=True, blank=True, default=None)
 
     class Meta:
         ordering = ['-timestamp']
+        # one index per access pattern of the analytics views: equality columns first, then the timestamp range
+        # the columns the views read are included so postgres can answer from the index alone
+        indexes = [
+            models.Index(fields=['payload', 'timestamp'], include=['search_string'], name='eventlog_payload_time_idx'),
+            models.Index(fields=['course', 'payload', 'timestamp'], include=['user', 'duration'], name='eventlog_course_idx'),
+            models.Index(fields=['course_material', 'payload', 'timestamp'], include=['user', 'duration'], name='eventlog_material_idx'),
+            models.Index(fields=['industry_project', 'payload', 'timestamp'], include=['user'], name='eventlog_project_idx'),
+            models.Index(fields=['user', 'payload', 'timestamp'], include=['course_material', 'duration'], name='eventlog_user_payload_idx'),
+            models.Index(fields=['user', 'timestamp'], name='eventlog_user_time_idx'),
+            models.Index(fields=['written'], name='eventlog_written_idx'),
+        ]
+    # end Meta
+# end class
+
+
+class ActiveSession(models.Model):
+    '''
+    Open "continue" event per user and target, closed by the matching "stop" event, see analytics.sessions
+    '''
+    class SessionType(models.TextChoices):
+        COURSE = 'COURSE', 'Course'
+        COURSE_MATERIAL = 'COURSE_MATERIAL', 'Course Material'
+        ASSESSMENT = 'ASSESSMENT', 'Assessment'
+    # end class
+
+    user = models.ForeignKey('common.BaseUser', on_delete=models.CASCADE, related_name='+')
+    session_type = models.CharField(max_length=255, choices=SessionType.choices)
+    target_id = models.UUIDField()  # course, course material or quiz id
+    started = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'session_type', 'target_id'], name='ActiveSession Unique Constraint: target')
+        ]
+    # end Meta
+# end class
+
+
+class RollupWatermark(models.Model):
+    '''
+    EventLog rows written before the watermark are counted in the daily rollups, see analytics.rollups
+    '''
+    name = models.CharField(max_length=255, primary_key=True)
+    timestamp = models.DateTimeField()
+# end class
+
+
+class DailyCourseEventCount(models.Model):
+    date = models.DateField()
+    course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, related_name='+')
+    payload = models.PositiveSmallIntegerField(choices=EventLog.Payload.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'course', 'payload'], name='DailyCourseEventCount Unique Constraint: day')
+        ]
+    # end Meta
+# end class
+
+
+class DailyMaterialDuration(models.Model):
+    date = models.DateField()
+    course_material = models.ForeignKey('courses.CourseMaterial', on_delete=models.CASCADE, related_name='+')
+    user = models.ForeignKey('common.BaseUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    duration = models.PositiveBigIntegerField(default=0)  # sum of stop course material durations
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'course_material', 'user'], name='DailyMaterialDuration Unique Constraint: day')
+        ]
+        indexes = [
+            models.Index(fields=['user', 'date'], name='material_rollup_user_idx'),
+        ]
+    # end Meta
+# end class
+
+
+class DailySearchCount(models.Model):
+    date = models.DateField()
+    payload = models.PositiveSmallIntegerField(choices=EventLog.Payload.choices)
+    search_string = models.CharField(max_length=255, null=True, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'payload', 'search_string'], name='DailySearchCount Unique Constraint: day')
+        ]
+        indexes = [
+            models.Index(fields=['payload', 'date'], name='search_rollup_payload_idx'),
+        ]
+    # end Meta
+# end class
+
+
+class DailyIndustryProjectEventCount(models.Model):
+    date = models.DateField()
+    industry_project = models.ForeignKey('industry_projects.IndustryProject', on_delete=models.CASCADE, related_name='+')
+    payload = models.PositiveSmallIntegerField(choices=EventLog.Payload.choices)
+    user = models.ForeignKey('common.BaseUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'industry_project', 'payload', 'user'], name='DailyIndustryProjectEventCount Unique Constraint: day')
+        ]
+    # end Meta
+# end class
+
+
+class DailyMemberSkillDuration(models.Model):
+    date = models.DateField()
+    user = models.ForeignKey('common.BaseUser', on_delete=models.CASCADE, related_name='+')
+    skill = models.CharField(max_length=10)  # coding language or category of the course, see courses.models.Course
+    duration = models.PositiveBigIntegerField(default=0)  # sum of stop course material durations
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'user', 'skill'], name='DailyMemberSkillDuration Unique Constraint: day')
+        ]
+        indexes = [
+            models.Index(fields=['user', 'date'], name='skill_rollup_user_idx'),
+        ]
     # end Meta
 # end class
@@ -0,0 +1,298 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from collections import defaultdict
+from datetime import timedelta
+
+from .models import (
+    EventLog,
+    RollupWatermark,
+    DailyCourseEventCount,
+    DailyMaterialDuration,
+    DailySearchCount,
+    DailyIndustryProjectEventCount,
+    DailyMemberSkillDuration,
+)
+from courses.models import Course
+
+WATERMARK_NAME = 'event_log_rollup'
+SEARCH_PAYLOADS = (EventLog.Payload.SEARCH_COURSE, EventLog.Payload.SEARCH_INDUSTRY_PROJECT)
+ROLLUP_MODELS = (DailyCourseEventCount, DailyMaterialDuration, DailySearchCount, DailyIndustryProjectEventCount, DailyMemberSkillDuration)
+
+
+def get_rollup_events(event_logs):
+    '''
+    Event logs counted by each rollup, as {rollup model: (event logs, keys, {value field: aggregate})}
+    '''
+    return {
+        DailyCourseEventCount: (event_logs.exclude(course=None), ('course_id', 'payload'), {'count': Count('id')}),
+        DailyMaterialDuration: (
+            event_logs.filter(payload=EventLog.Payload.STOP_COURSE_MATERIAL).exclude(course_material=None).exclude(duration=None),
+            ('course_material_id', 'user_id'),
+            {'duration': Sum('duration')}
+        ),
+        DailySearchCount: (event_logs.filter(payload__in=SEARCH_PAYLOADS), ('payload', 'search_string'), {'count': Count('id')}),
+        DailyIndustryProjectEventCount: (event_logs.exclude(industry_project=None), ('industry_project_id', 'payload', 'user_id'), {'count': Count('id')}),
+        DailyMemberSkillDuration: (
+            event_logs.filter(payload=EventLog.Payload.STOP_COURSE_MATERIAL).exclude(user=None).exclude(course_material=None).exclude(duration=None),
+            ('user_id', 'skill'),
+            {'duration': Sum('duration')}
+        ),
+    }
+# end def
+
+
+def get_rollup_rows(event_logs, keys, values):
+    '''
+    Event logs grouped by day and keys, as [{'date', *keys, *values}]
+    '''
+    return list(event_logs.annotate(date=TruncDate('timestamp')).order_by().values('date', *keys).annotate(**values))
+# end def
+
+
+def get_member_skill_rows(event_logs, keys, values):
+    '''
+    Durations grouped by day and member, credited in full to every coding language and category of the course
+    '''
+    rows = get_rollup_rows(event_logs, ('user_id', 'course_material__chapter__course_id'), values)
+    course_ids = set(row['course_material__chapter__course_id'] for row in rows)
+    courses = Course.objects.filter(pk__in=course_ids).only('id', 'coding_languages', 'categories')
+    skills = {course.id: list(course.coding_languages) + list(course.categories) for course in courses}
+
+    durations = defaultdict(int)
+    for row in rows:
+        for skill in skills.get(row['course_material__chapter__course_id'], []):
+            durations[(row['date'], row['user_id'], skill)] += row['duration']
+        # end for
+    # end for
+    return [{'date': date, 'user_id': user_id, 'skill': skill, 'duration': duration} for (date, user_id, skill), duration in durations.items()]
+# end def
+
+
+# rollups whose rows are not a plain group by of event log columns
+ROLLUP_ROWS = {
+    DailyMemberSkillDuration: get_member_skill_rows,
+}
+
+
+def roll_up(model, event_logs, keys, values):
+    '''
+    Adds event logs grouped by day and keys onto the rollup rows of model
+    Returns the number of groups rolled up
+    '''
+    rows = ROLLUP_ROWS.get(model, get_rollup_rows)(event_logs, keys, values)
+    if len(rows) == 0:
+        return 0
+    # end if
+
+    existing = model.objects.filter(date__in=set(row['date'] for row in rows))
+    existing = {(rollup.date, *[getattr(rollup, key) for key in keys]): rollup for rollup in existing}
+
+    created = []
+    updated = []
+    for row in rows:
+        rollup = existing.get((row['date'], *[row[key] for key in keys]), None)
+        if rollup is None:
+            created.append(model(**row))
+        else:
+            for field in values:
+                setattr(rollup, field, getattr(rollup, field) + row[field])
+            # end for
+            updated.append(rollup)
+        # end if-else
+    # end for
+
+    model.objects.bulk_create(created, batch_size=settings.ANALYTICS_BATCH_SIZE)
+    model.objects.bulk_update(updated, list(values), batch_size=settings.ANALYTICS_BATCH_SIZE)
+    return len(rows)
+# end def
+
+
+def get_watermark():
+    watermark = RollupWatermark.objects.filter(pk=WATERMARK_NAME).first()
+    return watermark.timestamp if watermark is not None else None
+# end def
+
+
+def roll_up_event_logs():
+    '''
+    Rolls up event logs written since the watermark, up to ANALYTICS_ROLLUP_LAG ago
+    The watermark follows insert time, so buffered events are counted on the day they happened whenever they are written,
+    the lag only leaves time for insert transactions to commit, see analytics.ingestion
+    Returns the number of rollup groups written
+    '''
+    until = timezone.now() - timedelta(seconds=settings.ANALYTICS_ROLLUP_LAG)
+
+    with transaction.atomic():
+        watermark, created = RollupWatermark.objects.select_for_update().get_or_create(
+            pk=WATERMARK_NAME,
+            defaults={'timestamp': until}
+        )
+        if created:
+            # the first run rolls up the whole history
+            event_logs = EventLog.objects.filter(written__lt=until)
+        elif watermark.timestamp < until:
+            event_logs = EventLog.objects.filter(written__gte=watermark.timestamp, written__lt=until)
+        else:
+            return 0
+        # end if-else
+
+        written = 0
+        for model, (rollup_event_logs, keys, values) in get_rollup_events(event_logs).items():
+            written += roll_up(model, rollup_event_logs, keys, values)
+        # end for
+
+        watermark.timestamp = until
+        watermark.save()
+    # end with
+    return written
+# end def
+
+
+def rebuild_rollups():
+    '''
+    Drops every rollup row and rolls up the whole EventLog history again
+    '''
+    with transaction.atomic():
+        RollupWatermark.objects.filter(pk=WATERMARK_NAME).delete()
+        for model in ROLLUP_MODELS:
+            model.objects.all().delete()
+        # end for
+    # end with
+    return roll_up_event_logs()
+# end def
+
+
+def get_sources(model, cutoff=None):
+    '''
+    Rollup rows from cutoff on, and the raw event logs written past the watermark they do not include yet
+    cutoff must fall on the start of a day, see utils.date_utils
+    '''
+    watermark = get_watermark()
+
+    rollups = model.objects.all() if watermark is not None else model.objects.none()
+    event_logs = EventLog.objects.all()
+    if cutoff is not None:
+        rollups = rollups.filter(date__gte=timezone.localtime(cutoff).date())
+        event_logs = event_logs.filter(timestamp__gte=cutoff)
+    # end if
+    if watermark is not None:
+        event_logs = event_logs.filter(written__gte=watermark)
+    # end if
+
+    rollup_event_logs, keys, values = get_rollup_events(event_logs)[model]
+    return rollups, rollup_event_logs
+# end def
+
+
+def get_course_event_counts(courses, cutoff=None):
+    '''
+    {course_id: number of events} for events on the courses since cutoff
+    '''
+    rollups, event_logs = get_sources(DailyCourseEventCount, cutoff)
+
+    counts = defaultdict(int)
+    for course_id, count in rollups.filter(course__in=courses).values('course_id').annotate(total=Sum('count')).order_by().values_list('course_id', 'total'):
+        counts[course_id] += count
+    # end for
+    for course_id, count in event_logs.filter(course__in=courses).values('course_id').annotate(total=Count('id')).order_by().values_list('course_id', 'total'):
+        counts[course_id] += count
+    # end for
+    return counts
+# end def
+
+
+def get_material_durations(course_materials):
+    '''
+    {course_material_id: {user_id: total time spent}} over all time
+    '''
+    rollups, event_logs = get_sources(DailyMaterialDuration)
+
+    durations = defaultdict(lambda: defaultdict(int))
+    for queryset in (rollups, event_logs):
+        queryset = queryset.filter(course_material__in=course_materials).values('course_material_id', 'user_id')
+        for course_material_id, user_id, duration in queryset.annotate(total=Sum('duration')).order_by().values_list('course_material_id', 'user_id', 'total'):
+            durations[course_material_id][user_id] += duration
+        # end for
+    # end for
+    return durations
+# end def
+
+
+def get_search_ranking(payload, cutoff=None, limit=10):
+    '''
+    Most searched terms since cutoff, as [{'search_string', 'search_count'}]
+    '''
+    rollups, event_logs = get_sources(DailySearchCount, cutoff)
+
+    counts = defaultdict(int)
+    for search_string, count in rollups.filter(payload=payload).values('search_string').annotate(total=Sum('count')).order_by().values_list('search_string', 'total'):
+        counts[search_string] += count
+    # end for
+    for search_string, count in event_logs.filter(payload=payload).values('search_string').annotate(total=Count('id')).order_by().values_list('search_string', 'total'):
+        counts[search_string] += count
+    # end for
+
+    ranking = sorted(counts.items(), key=lambda item: -item[1])[:limit]
+    return [{'search_string': search_string, 'search_count': count} for search_string, count in ranking]
+# end def
+
+
+def get_industry_project_event_counts(industry_projects, cutoff=None):
+    '''
+    {industry_project_id: number of events} for events on the industry projects since cutoff
+    '''
+    rollups, event_logs = get_sources(DailyIndustryProjectEventCount, cutoff)
+
+    counts = defaultdict(int)
+    for industry_project_id, count in rollups.filter(industry_project__in=industry_projects).values('industry_project_id').annotate(total=Sum('count')).order_by().values_list('industry_project_id', 'total'):
+        counts[industry_project_id] += count
+    # end for
+    for industry_project_id, count in event_logs.filter(industry_project__in=industry_projects).values('industry_project_id').annotate(total=Count('id')).order_by().values_list('industry_project_id', 'total'):
+        counts[industry_project_id] += count
+    # end for
+    return counts
+# end def
+
+
+def get_industry_project_viewers(industry_projects):
+    '''
+    {industry_project_id: set of user ids} of signed in users who viewed the industry projects
+    '''
+    rollups, event_logs = get_sources(DailyIndustryProjectEventCount)
+
+    viewers = defaultdict(set)
+    for queryset in (rollups, event_logs):
+        queryset = queryset.filter(
+            industry_project__in=industry_projects,
+            payload=EventLog.Payload.VIEW_INDUSTRY_PROJECT
+        ).exclude(user=None)
+        for industry_project_id, user_id in queryset.values_list('industry_project_id', 'user_id').distinct().order_by():
+            viewers[industry_project_id].add(user_id)
+        # end for
+    # end for
+    return viewers
+# end def
+
+
+def get_member_time_spent(user, cutoff=None):
+    '''
+    Total time spent by the user on course materials since cutoff, and {skill: time spent}
+    '''
+    rollups, event_logs = get_sources(DailyMaterialDuration, cutoff)
+    total = rollups.filter(user=user).aggregate(total=Sum('duration'))['total'] or 0
+    total += event_logs.filter(user=user).aggregate(total=Sum('duration'))['total'] or 0
+
+    rollups, event_logs = get_sources(DailyMemberSkillDuration, cutoff)
+    durations = defaultdict(int)
+    for skill, duration in rollups.filter(user=user).values('skill').annotate(total=Sum('duration')).order_by().values_list('skill', 'total'):
+        durations[skill] += duration
+    # end for
+    for row in get_member_skill_rows(event_logs.filter(user=user), ('user_id', 'skill'), {'duration': Sum('duration')}):
+        durations[row['skill']] += row['duration']
+    # end for
+    return total, durations
+# end def
@@ -6,6 +6,7 @@ from common.serializers import NestedBaseUserSerializer
 
 class EventLogSerializer(serializers.ModelSerializer):
     user = NestedBaseUserSerializer()
+    payload = serializers.CharField(source='get_payload_display', read_only=True)
 
     class Meta:
         model = EventLog
@@ -13,3 +14,12 @@ class EventLogSerializer(serializers.ModelSerializer):
     # end class
 
 # end class
+
+
+class InactiveMemberSerializer(NestedBaseUserSerializer):
+    last_active = serializers.DateTimeField(read_only=True)  # annotated, latest event on any course
+
+    class Meta(NestedBaseUserSerializer.Meta):
+        fields = NestedBaseUserSerializer.Meta.fields + ('last_active',)
+    # end Meta
+# end class
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.utils import timezone
+
+from datetime import timedelta
+
+from .models import ActiveSession, EventLog
+
+# payload -> (session type, reference holding the target id)
+SESSION_STARTS = {
+    EventLog.Payload.CONTINUE_COURSE: (ActiveSession.SessionType.COURSE, 'course_id'),
+    EventLog.Payload.CONTINUE_COURSE_MATERIAL: (ActiveSession.SessionType.COURSE_MATERIAL, 'course_material_id'),
+    EventLog.Payload.START_ASSESSMENT: (ActiveSession.SessionType.ASSESSMENT, 'quiz_id'),
+    EventLog.Payload.CONTINUE_ASSESSMENT: (ActiveSession.SessionType.ASSESSMENT, 'quiz_id'),
+}
+SESSION_STOPS = {
+    EventLog.Payload.STOP_COURSE: (ActiveSession.SessionType.COURSE, 'course_id'),
+    EventLog.Payload.STOP_COURSE_MATERIAL: (ActiveSession.SessionType.COURSE_MATERIAL, 'course_material_id'),
+    EventLog.Payload.STOP_ASSESSMENT: (ActiveSession.SessionType.ASSESSMENT, 'quiz_id'),
+}
+
+
+def get_session_key(event_log):
+    session = SESSION_STARTS.get(event_log.payload, SESSION_STOPS.get(event_log.payload, None))
+    if session is None or event_log.user_id is None:
+        return None
+    # end if
+
+    session_type, reference = session
+    target_id = getattr(event_log, reference)
+    if target_id is None:
+        return None
+    # end if
+    return (event_log.user_id, session_type, target_id)
+# end def
+
+
+def track_sessions(event_logs):
+    '''
+    Opens sessions on start events and closes them on stop events, setting duration on the stop event log
+    Event logs must be ordered by timestamp; only the sessions they touch are read, so the cost does not grow with history
+    Expects to run inside a transaction, the sessions read stay locked until it commits
+    so that concurrent writers cannot close the same session twice
+    '''
+    keys = set(key for key in map(get_session_key, event_logs) if key is not None)
+    if len(keys) == 0:
+        return
+    # end if
+
+    # locked in primary key order, so that writers touching the same sessions do not deadlock
+    stored = ActiveSession.objects.select_for_update().filter(
+        user_id__in=set(key[0] for key in keys),
+        target_id__in=set(key[2] for key in keys)
+    ).order_by('pk')
+    stored = {(session.user_id, session.session_type, session.target_id): session for session in stored}
+    stored = {key: session for key, session in stored.items() if key in keys}
+
+    timeout = settings.ANALYTICS_SESSION_TIMEOUT
+    sessions = {key: session.started for key, session in stored.items()}
+    for event_log in event_logs:
+        key = get_session_key(event_log)
+        if key is None:
+            continue
+        # end if
+
+        # a start on an open session means the previous one was abandoned, the latest start wins
+        if event_log.payload in SESSION_STARTS:
+            sessions[key] = event_log.timestamp
+        else:
+            started = sessions.pop(key, None)
+            if started is not None:
+                duration = event_log.timestamp.timestamp() - started.timestamp()
+                if 0 <= duration <= timeout:
+                    event_log.duration = duration
+                # end if
+            # end if
+        # end if-else
+    # end for
+
+    ActiveSession.objects.filter(pk__in=[session.pk for session in stored.values()]).delete()
+    ActiveSession.objects.bulk_create([
+        ActiveSession(user_id=user_id, session_type=session_type, target_id=target_id, started=started)
+        for (user_id, session_type, target_id), started in sessions.items()
+    ], ignore_conflicts=True)
+# end def
+
+
+def expire_sessions():
+    '''
+    Drops sessions left open for longer than ANALYTICS_SESSION_TIMEOUT, their stop event never came
+    Returns the number of sessions dropped
+    '''
+    cutoff = timezone.now() - timedelta(seconds=settings.ANALYTICS_SESSION_TIMEOUT)
+    deleted, _ = ActiveSession.objects.filter(started__lt=cutoff).delete()
+    return deleted
+# end def
@@ -0,0 +1,18 @@
+from __future__ import absolute_import, unicode_literals
+
+from celery import shared_task
+
+from .sessions import expire_sessions
+from . import rollups
+
+
+@shared_task
+def expire_active_sessions():
+    return expire_sessions()
+# end def
+
+
+@shared_task
+def roll_up_event_logs():
+    return rollups.roll_up_event_logs()
+# end def
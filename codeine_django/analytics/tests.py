@@ -1,3 +1,216 @@
-from django.test import TestCase
+from django.db import connection
+from django.db.models import Sum
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from datetime import timedelta
+
+from .ingestion import write_events
+from .models import ActiveSession, EventLog, RollupWatermark, DailyCourseEventCount
+from .rollups import roll_up_event_logs, get_course_event_counts, get_member_time_spent, WATERMARK_NAME
+from common.models import BaseUser, Member, Partner
+from courses.models import Course, Chapter, CourseMaterial, Enrollment
+from utils.member_utils import get_average_skill_set, average_skill_sets
+
+
+def create_event(payload, user, course, timestamp):
+    return {
+        'payload': payload,
+        'user_id': user.id,
+        'search_string': None,
+        'timestamp': timestamp,
+        'course_id': course.id,
+        'course_material_id': None,
+        'quiz_id': None,
+        'industry_project_id': None,
+    }
+# end def
+
+
+class AnalyticsTestCase(TestCase):
+
+    def setUp(self):
+        self.user = BaseUser.objects.create_user('member@codeine.com', 'password')
+        self.course = Course.objects.create(
+            title='Course', learning_objectives=[], requirements=[], description='Description',
+            coding_languages=['PY'], languages=['ENG'], categories=['BE'], exp_points=100, duration=3
+        )
+        self.now = timezone.now().replace(microsecond=0)
+    # end def
+
+    def event(self, payload, seconds_ago):
+        return create_event(payload, self.user, self.course, self.now - timedelta(seconds=seconds_ago))
+    # end def
+# end class
+
+
+class SessionTest(AnalyticsTestCase):
+
+    def test_stop_closes_session_once(self):
+        write_events([self.event(EventLog.Payload.CONTINUE_COURSE, 600)])
+        self.assertEqual(ActiveSession.objects.count(), 1)
+
+        write_events([self.event(EventLog.Payload.STOP_COURSE, 300)])
+        write_events([self.event(EventLog.Payload.STOP_COURSE, 200)])
+
+        durations = EventLog.objects.filter(payload=EventLog.Payload.STOP_COURSE).order_by('timestamp').values_list('duration', flat=True)
+        self.assertEqual(list(durations), [300, None])
+        self.assertEqual(ActiveSession.objects.count(), 0)
+    # end def
+
+    def test_latest_start_wins(self):
+        write_events([self.event(EventLog.Payload.CONTINUE_COURSE, 600)])
+        write_events([self.event(EventLog.Payload.CONTINUE_COURSE, 400), self.event(EventLog.Payload.STOP_COURSE, 100)])
+
+        stop = EventLog.objects.get(payload=EventLog.Payload.STOP_COURSE)
+        self.assertEqual(stop.duration, 300)
+    # end def
+# end class
+
+
+class RollupTest(AnalyticsTestCase):
+
+    def get_counts(self):
+        rolled_up = DailyCourseEventCount.objects.filter(course=self.course).aggregate(total=Sum('count'))['total'] or 0
+        return rolled_up, get_course_event_counts([self.course])[self.course.id]
+    # end def
+
+    def test_late_events_are_rolled_up(self):
+        write_events([self.event(EventLog.Payload.COURSE_VIEW, 20 * 60)])
+        EventLog.objects.update(written=self.now - timedelta(minutes=20))
+        roll_up_event_logs()
+        self.assertEqual(self.get_counts(), (1, 1))
+
+        # buffered for half an hour, written after the watermark passed its timestamp
+        write_events([self.event(EventLog.Payload.COURSE_VIEW, 30 * 60)])
+        self.assertEqual(self.get_counts(), (1, 2))
+
+        RollupWatermark.objects.filter(pk=WATERMARK_NAME).update(timestamp=self.now - timedelta(minutes=10))
+        EventLog.objects.filter(written__gte=self.now).update(written=self.now - timedelta(minutes=8))
+        roll_up_event_logs()
+        self.assertEqual(self.get_counts(), (2, 2))
+    # end def
+
+    def test_time_spent_is_credited_to_every_skill(self):
+        chapter = Chapter.objects.create(title='Chapter', order=0, course=self.course)
+        course_material = CourseMaterial.objects.create(title='Video', material_type='VIDEO', order=0, chapter=chapter)
+
+        events = [self.event(EventLog.Payload.CONTINUE_COURSE_MATERIAL, 30 * 60), self.event(EventLog.Payload.STOP_COURSE_MATERIAL, 25 * 60)]
+        for event in events:
+            event['course_id'] = None
+            event['course_material_id'] = course_material.id
+        # end for
+        write_events(events)
+        self.assertEqual(get_member_time_spent(self.user), (300, {'PY': 300, 'BE': 300}))
+
+        EventLog.objects.update(written=self.now - timedelta(minutes=20))
+        roll_up_event_logs()
+        self.assertEqual(get_member_time_spent(self.user), (300, {'PY': 300, 'BE': 300}))
+    # end def
+# end class
+
+
+class InactiveMembersTest(AnalyticsTestCase):
+
+    def test_default_response_is_one_page(self):
+        user = BaseUser.objects.create_user('partner@codeine.com', 'password')
+        partner = Partner.objects.create(user=user)
+        Course.objects.filter(pk=self.course.pk).update(partner=partner)
+
+        for index in range(api_settings.PAGE_SIZE + 5):
+            user = BaseUser.objects.create_user(f'member{index}@codeine.com', 'password')
+            member = Member.objects.create(user=user, unique_id=f'member{index}')
+            Enrollment.objects.create(course=self.course, member=member, progress=0)
+        # end for
+
+        client = APIClient()
+        client.force_authenticate(BaseUser.objects.get(pk=partner.user_id))
+        response = client.get(f'/analytics/inactive-members?course_id={self.course.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], api_settings.PAGE_SIZE + 5)
+        self.assertEqual(len(response.json()['results']), api_settings.PAGE_SIZE)
+    # end def
+# end class
+
+
+class ConversionRateTest(AnalyticsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = BaseUser.objects.create_user('partner@codeine.com', 'password')
+        self.partner = Partner.objects.create(user=user)
+        Course.objects.filter(pk=self.course.pk).update(partner=self.partner)
+
+        search = self.event(EventLog.Payload.SEARCH_COURSE, 60)
+        search['course_id'] = None
+        search['search_string'] = 'python'
+        write_events([self.event(EventLog.Payload.COURSE_VIEW, 120), self.event(EventLog.Payload.CONTINUE_COURSE, 90), search])
+        self.client = APIClient()
+    # end def
+
+    def get_views(self, user):
+        self.client.force_authenticate(BaseUser.objects.get(pk=user.pk))
+        response = self.client.get('/analytics/course-conversion-rate')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['overall_view'], sum(row['view_count'] for row in response.json()['breakdown'])
+    # end def
+
+    def test_admins_count_every_event(self):
+        admin = BaseUser.objects.create_user('admin@codeine.com', 'password', is_admin=True)
+        self.assertEqual(self.get_views(admin), (3, 2))
+    # end def
+
+    def test_partners_count_events_on_their_courses(self):
+        self.assertEqual(self.get_views(self.partner.user), (2, 2))
+    # end def
+# end class
+
+
+class SkillAverageTest(TestCase):
+
+    def test_missing_skills_count_as_zero(self):
+        for index, stats in enumerate([{'PY': 100, 'BE': 50}, {'PY': 300}]):
+            user = BaseUser.objects.create_user(f'member{index}@codeine.com', 'password')
+            Member.objects.create(user=user, unique_id=f'member{index}', stats=stats)
+        # end for
+
+        members = Member.objects.all()
+        averages = get_average_skill_set(members)
+        self.assertEqual(averages['PY'], 200)
+        self.assertEqual(averages['BE'], 25)
+        self.assertEqual(averages, average_skill_sets(members.values_list('stats', flat=True)))
+    # end def
+# end class
+
+
+class PayloadMigrationTest(TransactionTestCase):
+    migrate_from = [('analytics', '0004_active_session')]
+    migrate_to = [('analytics', '0005_event_log_payload_code_indexes')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+    # end def
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+    # end def
+
+    def test_unknown_payloads_are_kept(self):
+        apps = self.migrate(self.migrate_from)
+        EventLog = apps.get_model('analytics', 'EventLog')
+        for payload in ('course view', 'search course', 'Course View', 'typo'):
+            EventLog.objects.create(payload=payload)
+        # end for
+
+        apps = self.migrate(self.migrate_to)
+        EventLog = apps.get_model('analytics', 'EventLog')
+        payloads = sorted(EventLog.objects.values_list('payload', flat=True))
+        self.assertEqual(payloads, [0, 0, 1, 9])
+    # end def
+# end class
@@ -5,6 +5,7 @@ from . import views_course_analytics, views_earnings, views_search_analytics, vi
 urlpatterns = [
     # analytics views
     path('', views_course_analytics.post_log_view, name='Create Event Log'),
+    path('/batch', views_course_analytics.post_log_batch_view, name='Create Event Logs in batch'),
     path('/course-conversion-rate', views_course_analytics.course_conversion_rate_view, name='Course conversion metrics'),
     path('/course-material-time', views_course_analytics.course_material_average_time_view, name='Course material time metrics'),
     path('/course-time', views_course_analytics.course_average_time_view, name='Course time metrics'),
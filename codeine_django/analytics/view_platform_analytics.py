@@ -18,6 +18,7 @@ from common.models import Member, MembershipSubscription, BaseUser
 from courses.models import Course, Enrollment
 from consultations.models import ConsultationSlot
 from industry_projects.models import IndustryProject
+from utils.date_utils import get_date_cutoff
 
 
 @api_view(['GET'])
@@ -32,12 +33,12 @@ def platform_health_check_view(request):
     if request.method == 'GET':
         try:
             days = int(request.query_params.get('days', 30))
-            _date = timezone.now() - timedelta(days=days)
+            _date = get_date_cutoff(days)
 
-            hours_of_content = Course.objects.filter(published_date__date__gte=_date).aggregate(Sum('duration'))['duration__sum']
-            new_consultation_slots = ConsultationSlot.objects.filter(start_time__date__gte=_date).count()
-            new_industry_projects = IndustryProject.objects.filter(date_listed__date__gte=_date).count()
-            new_pro_members = MembershipSubscription.objects.values('member').filter(payment_transaction__timestamp__date__gte=_date).order_by().annotate(Count('id')).filter(id__count=1).count()
+            hours_of_content = Course.objects.filter(published_date__gte=_date).aggregate(Sum('duration'))['duration__sum']
+            new_consultation_slots = ConsultationSlot.objects.filter(start_time__gte=_date).count()
+            new_industry_projects = IndustryProject.objects.filter(date_listed__gte=_date).count()
+            new_pro_members = MembershipSubscription.objects.values('member').filter(payment_transaction__timestamp__gte=_date).order_by().annotate(Count('id')).filter(id__count=1).count()
 
             return Response({
                 'hours_of_content': hours_of_content,
@@ -63,7 +64,7 @@ def course_enrollment_count_view(request):
         try:
             days = int(request.query_params.get('days', 30))
             partner_id = request.query_params.get('partner_user_id', None)
-            _date = timezone.now() - timedelta(days=days)
+            _date = get_date_cutoff(days)
             partner = BaseUser.objects.filter(pk=partner_id).first()
 
             enrollments = Enrollment.objects
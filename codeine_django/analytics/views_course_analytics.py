@@ -1,8 +1,9 @@
+from django.conf import settings
 from django.db import transaction
 from django.db.utils import IntegrityError
 from django.utils import timezone
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
-from django.db.models import Q, Sum, Avg, Count, F
+from django.db.models import Q, Sum, Avg, Count, F, Exists, OuterRef, Subquery
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -15,13 +16,17 @@ from rest_framework.permissions import (
 from datetime import timedelta
 
 from .models import EventLog
-from .serializers import EventLogSerializer
+from .ingestion import build_event, ingest_events
+from .rollups import get_course_event_counts, get_material_durations
+from .serializers import EventLogSerializer, InactiveMemberSerializer
 from common.permissions import IsPartnerOrAdminOnly
 from common.models import Partner, Member, BaseUser
 from common.serializers import NestedBaseUserSerializer
 from courses.models import Course, CourseMaterial, Quiz, Enrollment
 from courses.serializers import CourseSerializer
 from industry_projects.models import IndustryProject
+from utils.date_utils import get_date_cutoff
+from utils.pagination import paginate
 
 
 @api_view(['POST'])
@@ -30,110 +35,55 @@ def post_log_view(request):
     user = request.user
     '''
     Creates a new log
+    Events are validated here and written in batches by analytics.ingestion
     '''
     if request.method == 'POST':
         data = request.data
         query_params = request.query_params
 
-        course = Course.objects.filter(pk=query_params.get('course_id', None)).first()
-        course_material = CourseMaterial.objects.filter(pk=query_params.get('course_material_id', None)).first()
-        quiz = Quiz.objects.filter(pk=query_params.get('quiz_id', None)).first()
-        industry_project = IndustryProject.objects.filter(pk=query_params.get('industry_project_id', None)).first()
-        search_string = query_params.get('search_string', None)
-
         try:
-            with transaction.atomic():
-                event_log = EventLog(
-                    payload=data['payload'],
-                    user=user if user.is_authenticated else None,
-                    course=course,
-                    course_material=course_material,
-                    quiz=quiz,
-                    industry_project=industry_project,
-                    search_string=search_string
-                )
-
-                # duration logging for course material
-                if data['payload'] == 'stop course material':
-                    stop_event = EventLog.objects.filter(
-                        Q(payload='stop course material') &
-                        Q(course_material=course_material) &
-                        Q(user=request.user)
-                    ).first()
-                    continue_event = EventLog.objects.filter(
-                        Q(payload='continue course material') &
-                        Q(course_material=course_material) &
-                        Q(user=request.user)
-                    )
-
-                    if stop_event is not None:
-                        continue_event = continue_event.filter(timestamp__gte=stop_event.timestamp).filter(course_material=course_material).last()
-                    else:
-                        continue_event = continue_event.first()
-                    # end if-else
-
-                    if continue_event is not None:
-                        event_log.duration = timezone.now().timestamp() - continue_event.timestamp.timestamp()
-                    # end if
-                # end if
-
-                # duration logging for course
-                if data['payload'] == 'stop course':
-                    stop_event = EventLog.objects.filter(
-                        Q(payload='stop course') &
-                        Q(course_material=course_material) &
-                        Q(user=request.user)
-                    ).first()
-                    continue_event = EventLog.objects.filter(
-                        Q(payload='continue course') &
-                        Q(course_material=course_material) &
-                        Q(user=request.user)
-                    )
-
-                    if stop_event is not None:
-                        continue_event = continue_event.filter(timestamp__gte=stop_event.timestamp).filter(course_material=course_material).last()
-                    else:
-                        continue_event = continue_event.first()
-                    # end if-else
-
-                    if continue_event is not None:
-                        event_log.duration = timezone.now().timestamp() - continue_event.timestamp.timestamp()
-                    # end if
-                # end if
-
-                # duration logging for assessments
-                if data['payload'] == 'stop assessment':
-                    stop_event = EventLog.objects.filter(
-                        Q(payload='stop assessment') &
-                        Q(course_material=course_material) &
-                        Q(user=request.user)
-                    ).first()
-                    continue_event = EventLog.objects.filter(
-                        Q(payload='continue assessment') &
-                        Q(course_material=course_material) &
-                        Q(user=request.user)
-                    )
-
-                    if stop_event is not None:
-                        continue_event = continue_event.filter(timestamp__gte=stop_event.timestamp).filter(course_material=course_material).last()
-                    else:
-                        continue_event = continue_event.first()
-                    # end if-else
-
-                    if continue_event is not None:
-                        event_log.duration = timezone.now().timestamp() - continue_event.timestamp.timestamp()
-                    # end if
-                # end if
-
-                event_log.save()
-            # end with
+            event = build_event(user, {
+                'payload': data['payload'],
+                'course_id': query_params.get('course_id', None),
+                'course_material_id': query_params.get('course_material_id', None),
+                'quiz_id': query_params.get('quiz_id', None),
+                'industry_project_id': query_params.get('industry_project_id', None),
+                'search_string': query_params.get('search_string', None),
+            })
+            ingest_events([event])
+
             return Response(status=status.HTTP_201_CREATED)
-        except (IntegrityError, ValueError, KeyError, ValidationError) as e:
+        except (ValueError, KeyError, TypeError) as e:
             print(str(e))
             return Response(status=status.HTTP_400_BAD_REQUEST)
-        except ObjectDoesNotExist as e:
+        # end try-except
+    # end if
+# end def
+
+
+@api_view(['POST'])
+@permission_classes((AllowAny,))
+def post_log_batch_view(request):
+    user = request.user
+    '''
+    Creates a batch of logs
+    Body: {"events": [{"payload", "course_id", "course_material_id", "quiz_id", "industry_project_id", "search_string"}, ...]}
+    '''
+    if request.method == 'POST':
+        data = request.data
+
+        try:
+            events = data['events']
+            if not isinstance(events, list) or len(events) > settings.ANALYTICS_BATCH_SIZE:
+                return Response(status=status.HTTP_400_BAD_REQUEST)
+            # end if
+
+            ingest_events([build_event(user, event) for event in events])
+
+            return Response({'accepted': len(events)}, status=status.HTTP_201_CREATED)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
             print(str(e))
-            return Response(status=status.HTTP_404_NOT_FOUND)
+            return Response(status=status.HTTP_400_BAD_REQUEST)
         # end try-except
     # end if
 # end def
@@ -150,24 +100,30 @@ def course_conversion_rate_view(request):
         partner = Partner.objects.filter(user=user).first()
 
         try:
-            overall_view = EventLog.objects
             enrollments = Enrollment.objects
 
             days = int(request.query_params.get('days', 120))
-            now = timezone.now()
 
-            overall_view = overall_view.filter(timestamp__date__gte=now - timedelta(days=days))
-            enrollments = enrollments.filter(date_created__date__gte=now - timedelta(days=days))
+            enrollments = enrollments.filter(date_created__gte=get_date_cutoff(days))
             total_enrollments = Enrollment.objects
 
             if partner is not None:
-                overall_view = overall_view.filter(course__partner=partner)
                 enrollments = enrollments.filter(course__partner=partner)
                 total_enrollments = total_enrollments.filter(course__partner=partner)
             # end if
 
-            view_count = overall_view.count()
-            enrollment_count = enrollments.count()
+            courses = partner.courses.all() if partner is not None else Course.objects.all()
+            view_counts = get_course_event_counts(courses, get_date_cutoff(days))
+
+            enrollment_counts = dict(enrollments.values('course').annotate(count=Count('id')).order_by().values_list('course', 'count'))
+
+            if partner is not None:
+                view_count = sum(view_counts.values())
+            else:
+                # admins see every event of the period, including those on no course, e.g. searches
+                view_count = EventLog.objects.filter(timestamp__gte=get_date_cutoff(days)).count()
+            # end if-else
+            enrollment_count = sum(enrollment_counts.values())
 
             res = {}
             res['overall_conversion_rate'] = enrollment_count / view_count if view_count > 0 else 0
@@ -176,13 +132,12 @@ def course_conversion_rate_view(request):
             res['total_enrollments'] = total_enrollments.count()
 
             breakdown = []
-            courses = partner.courses.all() if partner is not None else Course.objects.all()
-            for course in courses:
+            for course_id, title in courses.values_list('id', 'title'):
                 tmp = {}
-                tmp['course_id'] = course.id
-                tmp['title'] = course.title
-                view_count = overall_view.filter(course=course).count()
-                enrollment_count = enrollments.filter(course=course).count()
+                tmp['course_id'] = course_id
+                tmp['title'] = title
+                view_count = view_counts[course_id]
+                enrollment_count = enrollment_counts.get(course_id, 0)
                 tmp['conversion_rate'] = enrollment_count / view_count if view_count > 0 else 0
                 tmp['view_count'] = view_count
                 tmp['enrollment_count'] = enrollment_count
@@ -223,6 +178,8 @@ def course_material_average_time_view(request):
                 'chapters': []
             }
 
+            durations = get_material_durations(CourseMaterial.objects.filter(chapter__course=course))
+
             for chapter in course.chapters.all():
                 tmp_chap = {
                     'chapter_id': chapter.id,
@@ -236,9 +193,9 @@ def course_material_average_time_view(request):
                         'course_material_title': cm.title,
                         'material_type': cm.material_type
                     }
-                    average_time = EventLog.objects.filter(Q(course_material=cm) & Q(payload='stop course material')).exclude(duration=None).values('user').annotate(total_time=Sum('duration')).order_by().aggregate(Avg('total_time'))
-                    # print(average_time)
-                    tmp_cm['average_time_taken'] = average_time['total_time__avg']
+                    # average over members of their total time on the material
+                    user_durations = durations[cm.id]
+                    tmp_cm['average_time_taken'] = sum(user_durations.values()) / len(user_durations) if len(user_durations) > 0 else None
 
                     tmp_chap['course_materials'].append(tmp_cm)
                 # end for
@@ -276,7 +233,7 @@ def course_average_time_view(request):
 
             event_logs = EventLog.objects.filter(
                 Q(course=course) &
-                Q(payload='stop course')
+                Q(payload=EventLog.Payload.STOP_COURSE)
             ).exclude(duration=None)
 
             average_time = event_logs.values('user').annotate(total_time=Sum('duration')).order_by().aggregate(Avg('total_time'))
@@ -310,26 +267,22 @@ def inactive_members_view(request):
             courses = Course.objects.filter(partner=partner) if partner is not None else Course.objects
             course = courses.get(pk=course_id)
 
-            inactive_members = []
-            today = timezone.now() - timedelta(days=days)
-
-            for enrollment in course.enrollments.all():
-                event_logs = EventLog.objects.filter(user=enrollment.member.user).filter(
-                    Q(course=course) |
-                    Q(course_material__chapter__course=course)
-                )
-                event_log = event_logs.filter(timestamp__gte=today).first()
-
-                if event_log is not None:
-                    continue
-                # end if
-
-                event_log = EventLog.objects.filter(user=enrollment.member.user).first()
-                user_data = NestedBaseUserSerializer(enrollment.member.user, context={"request": request}).data
-                inactive_members.append({**user_data, 'last_active': event_log.timestamp})
-            # end for
-
-            return Response(inactive_members, status=status.HTTP_200_OK)
+            # latest event of each enrolled member on the course, in the same query as the members
+            course_last_active = EventLog.objects.filter(
+                Q(user=OuterRef('pk')) &
+                (Q(course=course) | Q(course_material__chapter__course=course))
+            ).order_by('-timestamp').values('timestamp')[:1]
+            last_active = EventLog.objects.filter(user=OuterRef('pk')).order_by('-timestamp').values('timestamp')[:1]
+
+            inactive_members = BaseUser.objects.filter(member__enrollments__course=course).annotate(
+                course_last_active=Subquery(course_last_active),
+                last_active=Subquery(last_active)
+            ).filter(
+                Q(course_last_active=None) |
+                Q(course_last_active__lt=timezone.now() - timedelta(days=days))
+            ).distinct().select_related('member', 'partner', 'partner__organization')
+
+            return paginate(request, inactive_members, InactiveMemberSerializer, {'request': request}, ('date_joined', 'id'), always_paginate=True)
         except ObjectDoesNotExist as e:
             print(str(e))
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -368,18 +321,11 @@ def course_member_stats_view(request):
             ).count()
             false_starter_percentage = false_starter_count / total_count if total_count > 0 else 0
 
-            active_count = 0
-            for enrollment in course.enrollments.exclude(progress=100).all():
-
-                event_log = EventLog.objects.filter(user=enrollment.member.user).filter(
-                    Q(course=course) |
-                    Q(course_material__chapter__course=course)
-                ).filter(timestamp__gte=today).first()
-
-                if event_log is not None:
-                    active_count += 1
-                # end if
-            # end for
+            active_count = course.enrollments.exclude(progress=100).filter(Exists(EventLog.objects.filter(
+                Q(user=OuterRef('member__user')) &
+                (Q(course=course) | Q(course_material__chapter__course=course)) &
+                Q(timestamp__gte=today)
+            ))).count()
             active_members_percentage = active_count / total_count if total_count > 0 else 0
 
             return Response({'false_starter_percentage': false_starter_percentage, 'active_members_percentage': active_members_percentage}, status=status.HTTP_200_OK)
@@ -449,36 +395,24 @@ def course_first_enrollment_count_view(request):
     '''
     if request.method == 'GET':
         try:
-            members = Member.objects.all()
-            ranking = {}
             days = int(request.query_params.get('days', 999))
 
-            for member in members:
-                first_enrollment = member.enrollments.first()
-
-                if first_enrollment is not None and first_enrollment.date_created < timezone.now() - timedelta(days=days):
-                    continue
-                # end if
-
-                if first_enrollment is not None:
-                    course = first_enrollment.course
-                    try:
-                        ranking[str(course.id)] += 1
-                    except KeyError:
-                        ranking[str(course.id)] = 1
-                # end if
-            # end for
-            ranking = dict(sorted(ranking.items(), key=lambda item: item[1], reverse=True))
-            res = []
-
-            for key in list(ranking.keys())[:10]:
-                course = Course.objects.get(pk=key)
-                res.append({
-                    'course_id': key,
-                    'course_title': course.title,
-                    'first_enrollment_count': ranking[key],
-                })
-            # end for
+            # earliest enrollment of each member, ties broken by id
+            first_enrollment = Enrollment.objects.filter(member=OuterRef('member')).order_by('date_created', 'id').values('id')[:1]
+            first_enrollments = Enrollment.objects.filter(
+                id=Subquery(first_enrollment),
+                date_created__gte=get_date_cutoff(days)
+            ).exclude(course=None)
+
+            ranking = first_enrollments.values('course_id', 'course__title').annotate(
+                first_enrollment_count=Count('id')
+            ).order_by('-first_enrollment_count', 'course_id')[:10]
+
+            res = [{
+                'course_id': str(row['course_id']),
+                'course_title': row['course__title'],
+                'first_enrollment_count': row['first_enrollment_count'],
+            } for row in ranking]
 
             return Response(res, status=status.HTTP_200_OK)
         except ObjectDoesNotExist as e:
@@ -18,6 +18,7 @@ from .models import EventLog
 from common.models import MembershipSubscription, PaymentTransaction, BaseUser
 from common.permissions import IsPartnerOnly
 from courses.models import Enrollment
+from utils.date_utils import get_date_cutoff
 
 
 @api_view(['GET'])
@@ -82,16 +83,15 @@ def admin_earnings_report_view(request):
     if request.method == 'GET':
         try:
             days = int(request.query_params.get('days', 999))
-            today = timezone.now()
 
             total_subscription_revenue = MembershipSubscription.objects.filter(
-                Q(expiry_date__date__gte=today - timedelta(days=days)) &
+                Q(expiry_date__gte=get_date_cutoff(days)) &
                 Q(payment_transaction__payment_status='COMPLETED')
             ).count() * 5.99
             user_count = BaseUser.objects.count()
             expenses = user_count * 0.38 + 2700
             total_contribution_income = PaymentTransaction.objects.filter(
-                Q(contributionpayment__timestamp__date__gte=today - timedelta(days=days)) &
+                Q(contributionpayment__timestamp__gte=get_date_cutoff(days)) &
                 Q(payment_status='COMPLETED')
             ).aggregate(Sum('payment_amount'))
 
@@ -15,11 +15,13 @@ from rest_framework.permissions import (
 from datetime import timedelta
 
 from .models import EventLog
+from .rollups import get_industry_project_event_counts, get_industry_project_viewers
 from common.permissions import IsPartnerOrAdminOnly
 from common.models import Partner, Member, BaseUser
 from courses.models import QuizResult, Course, CourseMaterial
-from utils.member_utils import get_average_skill_set
+from utils.member_utils import get_average_skill_set, get_grouped_average_skill_sets, average_skill_sets
 from industry_projects.models import IndustryProject, IndustryProjectApplication
+from utils.date_utils import get_date_cutoff
 
 
 @api_view(['GET'])
@@ -42,32 +44,24 @@ def viewer_average_skill_view(request):
                 industry_projects = industry_projects.filter(pk=industry_project_id)
             # end if
 
-            event_logs = EventLog.objects.filter(
-                Q(payload='view industry project') &
-                Q(industry_project__in=industry_projects.all())
-            ).exclude(
-                Q(user__member=None) &
-                Q(user=None)
-            )
-
-            members = Member.objects.filter(user__event_logs__in=event_logs)
-            average_skill_set = get_average_skill_set(members.all())
+            viewers = get_industry_project_viewers(industry_projects.all())
+            skill_sets = Member.objects.filter(user_id__in=set().union(*viewers.values())).values_list('user_id', 'stats')
+            skill_sets = dict(skill_sets.iterator())
 
             res = {
-                'unique_member_views': len(members.all()),
-                'average_skill_set': average_skill_set,
+                'unique_member_views': len(skill_sets),
+                'average_skill_set': average_skill_sets(skill_sets.values()),
                 'breakdown_by_industry_project': []
             }
 
-            for industry_project in industry_projects:
-                tmp_event_logs = event_logs.filter(industry_project=industry_project)
-                tmp_members = members.filter(user__event_logs__in=tmp_event_logs)
+            for industry_project_id, industry_project_title in industry_projects.values_list('id', 'title'):
+                tmp_skill_sets = [skill_sets[user_id] for user_id in viewers[industry_project_id] if user_id in skill_sets]
 
                 tmp_ip = {
-                    'ip_id': industry_project.id,
-                    'ip_title': industry_project.title,
-                    'unique_member_views': len(tmp_members.all()),
-                    'average_skill_set': get_average_skill_set(tmp_members),
+                    'ip_id': industry_project_id,
+                    'ip_title': industry_project_title,
+                    'unique_member_views': len(tmp_skill_sets),
+                    'average_skill_set': average_skill_sets(tmp_skill_sets),
                 }
                 res['breakdown_by_industry_project'].append(tmp_ip)
             # end for
@@ -101,20 +95,23 @@ def applicant_average_skill_view(request):
                 industry_projects = industry_projects.filter(pk=industry_project_id)
             # end if
 
-            members = Member.objects.filter(industry_project_applications__industry_project__in=industry_projects.all())
+            applications = IndustryProjectApplication.objects.filter(industry_project__in=industry_projects.all()).exclude(member=None)
+            members = Member.objects.filter(pk__in=applications.values('member'))
+            breakdown = get_grouped_average_skill_sets(applications, 'industry_project', 'member__stats')
+
             res = {
-                'unique_applicants': len(members.all()),
-                'average_skill_set': get_average_skill_set(members.all()),
+                'unique_applicants': members.count(),
+                'average_skill_set': get_average_skill_set(members),
                 'breakdown_by_industry_project': []
             }
 
-            for ip in industry_projects:
-                tmp_members = members.filter(industry_project_applications__industry_project=ip)
+            for industry_project_id, industry_project_title in industry_projects.values_list('id', 'title'):
+                applicant_count, average_skill_set = breakdown.get(industry_project_id, (0, average_skill_sets([])))
                 tmp_ip = {
-                    'ip_id': ip.id,
-                    'ip_title': ip.title,
-                    'unique_member_views': len(tmp_members.all()),
-                    'average_skill_set': get_average_skill_set(tmp_members),
+                    'ip_id': industry_project_id,
+                    'ip_title': industry_project_title,
+                    'unique_member_views': applicant_count,
+                    'average_skill_set': average_skill_set,
                 }
                 res['breakdown_by_industry_project'].append(tmp_ip)
             # end for
@@ -196,20 +193,21 @@ def ip_application_rate_view(request):
 
         try:
             days = int(request.query_params.get('days', 120))
-            now = timezone.now()
 
-            overall_views = EventLog.objects.filter(timestamp__date__gte=now - timedelta(days=days))
-            applications = IndustryProjectApplication.objects.filter(date_created__date__gte=now - timedelta(days=days))
+            applications = IndustryProjectApplication.objects.filter(date_created__gte=get_date_cutoff(days))
             industry_projects = IndustryProject.objects
 
             if partner is not None:
                 industry_projects = industry_projects.filter(partner=partner)
-                overall_views = overall_views.filter(industry_project__in=industry_projects.all())
                 applications = applications.filter(industry_project__in=industry_projects.all())
             # end if
 
-            view_count = overall_views.count()
-            application_count = applications.count()
+            view_counts = get_industry_project_event_counts(industry_projects.all(), get_date_cutoff(days))
+
+            application_counts = dict(applications.values('industry_project').annotate(count=Count('id')).order_by().values_list('industry_project', 'count'))
+
+            view_count = sum(view_counts.values())
+            application_count = sum(application_counts.values())
 
             res = {}
             res['overall_conversion_rate'] = application_count / view_count if view_count > 0 else 0
@@ -217,13 +215,13 @@ def ip_application_rate_view(request):
             res['applications'] = application_count
 
             breakdown = []
-            for ip in industry_projects.all():
+            for ip_id, ip_title in industry_projects.values_list('id', 'title'):
                 tmp = {}
-                tmp['ip_id'] = ip.id
-                tmp['ip_title'] = ip.title
+                tmp['ip_id'] = ip_id
+                tmp['ip_title'] = ip_title
 
-                view_count = overall_views.filter(industry_project=ip).count()
-                application_count = applications.filter(industry_project=ip).count()
+                view_count = view_counts[ip_id]
+                application_count = application_counts.get(ip_id, 0)
                 tmp['conversion_rate'] = application_count / view_count if view_count > 0 else 0
                 tmp['view_count'] = view_count
                 tmp['application_count'] = application_count
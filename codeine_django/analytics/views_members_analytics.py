@@ -12,14 +12,17 @@ from rest_framework.permissions import (
     AllowAny,
 )
 
+from collections import defaultdict
 from datetime import timedelta
 
 from .models import EventLog
+from .rollups import get_member_time_spent
 from common.permissions import IsPartnerOrAdminOnly
-from common.models import Partner, Member, BaseUser
-from courses.models import QuizResult, Course, CourseMaterial
+from common.models import Partner, Member, BaseUser, get_default_member_stats
+from courses.models import QuizResult, Course, CourseMaterial, Quiz
 from utils.member_utils import get_average_skill_set
 from industry_projects.models import IndustryProject, IndustryProjectApplication
+from utils.date_utils import get_date_cutoff
 
 
 @api_view(['GET'])
@@ -34,8 +37,7 @@ def course_assessment_performance_view(request):
 
         try:
             days = int(request.query_params.get('days', 120))
-            now = timezone.now()
-            quiz_results = QuizResult.objects.filter(date_created__date__gte=now - timedelta(days=days))
+            quiz_results = QuizResult.objects.filter(date_created__gte=get_date_cutoff(days))
             courses = Course.objects
 
             partner = Partner.objects.filter(user=user).first()
@@ -50,55 +52,77 @@ def course_assessment_performance_view(request):
             }
             active_courses = 0
 
-            courses = courses.all()
-            for course in courses:
+            # one row per quiz: average score, number of results and passes
+            quiz_stats = quiz_results.filter(submitted=True).filter(
+                Q(quiz__course__in=courses.all()) |
+                Q(quiz__course_material__chapter__course__in=courses.all())
+            ).values('quiz').annotate(
+                average_score=Avg('score'),
+                result_count=Count('id'),
+                passed_count=Count('id', filter=Q(passed=True))
+            ).order_by()
+            quiz_stats = {row['quiz']: row for row in quiz_stats}
+
+            quizzes = Quiz.objects.filter(pk__in=list(quiz_stats)).values(
+                'id', 'max_marks', 'course_id', 'course_material_id', 'course_material__title', 'course_material__chapter__course_id'
+            )
+            quizzes = {quiz['id']: quiz for quiz in quizzes}
+
+            def get_average_score(quiz_id):
+                total_score = quizzes[quiz_id]['max_marks']
+                return quiz_stats[quiz_id]['average_score'] / total_score if total_score > 0 else 0
+            # end def
+
+            def get_passing_rate(quiz_id):
+                return quiz_stats[quiz_id]['passed_count'] / quiz_stats[quiz_id]['result_count']
+            # end def
+
+            course_quizzes = {}
+            course_material_quizzes = defaultdict(list)
+            for quiz in quizzes.values():
+                if quiz['course_id'] is not None:
+                    course_quizzes[quiz['course_id']] = quiz['id']
+                else:
+                    course_material_quizzes[quiz['course_material__chapter__course_id']].append(quiz)
+                # end if-else
+            # end for
+
+            for course_id, course_title in courses.values_list('id', 'title'):
                 tmp_course = {
-                    'course_id': course.id,
-                    'course_title': course.title,
+                    'course_id': course_id,
+                    'course_title': course_title,
                     'average_score': None,
                     'passing_rate': None,
                     'course_material_quiz': []
                 }
-                course_quiz_results = quiz_results.filter(quiz__course=course).filter(submitted=True)
 
-                if len(course_quiz_results) <= 0:
+                quiz_id = course_quizzes.get(course_id, None)
+                if quiz_id is None:
                     res['breakdown_by_course'].append(tmp_course)
                     continue
                 # end if
 
                 active_courses += 1
 
-                average_score = course_quiz_results.aggregate(Avg('score'))
-                total_score = course_quiz_results.annotate(total_score=Sum('quiz__question_groups__question_bank__questions__shortanswer__marks') + Sum('quiz__question_groups__question_bank__questions__mcq__marks') + Sum('quiz__question_groups__question_bank__questions__mrq__marks'))[0].total_score
-                # print(average_score['score__avg']/total_score)
-                tmp_course['average_score'] = average_score['score__avg'] / total_score if total_score > 0 else 0
-
-                passing_rate = len(course_quiz_results.filter(passed=True).all()) / len(course_quiz_results.all()) if len(course_quiz_results.all()) > 0 else 0
-                # print(passing_rate)
-                tmp_course['passing_rate'] = passing_rate
+                tmp_course['average_score'] = get_average_score(quiz_id)
+                tmp_course['passing_rate'] = get_passing_rate(quiz_id)
                 res['breakdown_by_course'].append(tmp_course)
 
-                res['overall_average_score'] += average_score['score__avg'] / total_score
-                res['overall_passing_rate'] += passing_rate
+                res['overall_average_score'] += tmp_course['average_score']
+                res['overall_passing_rate'] += tmp_course['passing_rate']
 
-                course_material_quiz_results = quiz_results.filter(quiz__course_material__chapter__course=course).values('quiz').order_by()
-                average_score = course_material_quiz_results.annotate(Avg('score'))
-                total_score = course_material_quiz_results.annotate(total_score=Sum('quiz__question_groups__question_bank__questions__shortanswer__marks') + Sum('quiz__question_groups__question_bank__questions__mcq__marks') + Sum('quiz__question_groups__question_bank__questions__mrq__marks'))
-
-                for i in range(len(average_score.all())):
-                    cm = CourseMaterial.objects.get(quiz__pk=average_score[i]['quiz'])
+                for quiz in course_material_quizzes[course_id]:
                     tmp_cm = {
-                        'course_material_id': cm.id,
-                        'course_material_title': cm.title,
-                        'quiz_id': cm.quiz.id,
-                        'average_score': average_score[i]['score__avg'] / total_score[i]['total_score'] if total_score[i]['total_score'] > 0 else 0,
-                        'passing_rate': len(course_material_quiz_results.filter(passed=True).all()) / len(course_material_quiz_results.all()) if len(course_material_quiz_results.all()) > 0 else 0
+                        'course_material_id': quiz['course_material_id'],
+                        'course_material_title': quiz['course_material__title'],
+                        'quiz_id': quiz['id'],
+                        'average_score': get_average_score(quiz['id']),
+                        'passing_rate': get_passing_rate(quiz['id'])
                     }
                     tmp_course['course_material_quiz'].append(tmp_cm)
                 # end for
+            # end for
 
-            # quiz_results_total = quiz_results.annotate(total_score=Sum('quiz__questions__shortanswer__marks') + Sum('quiz__questions__mcq__marks') + Sum('quiz__questions__mrq__marks'))
-            # quiz_results = quiz_results.values('quiz__course').order_by().annotate(average_score=Avg('score'))
             res['overall_average_score'] = res['overall_average_score'] / active_courses if active_courses > 0 else 0
             res['overall_passing_rate'] = res['overall_passing_rate'] / active_courses if active_courses > 0 else 0
 
@@ -131,46 +155,13 @@ def time_spent_breakdown_view(request):
             # end if
 
             days = int(request.query_params.get('days', 9999))
-            now = timezone.now()
-
-            stats = {
-                'PY': 0,
-                'JAVA': 0,
-                'JS': 0,
-                'CPP': 0,
-                'CS': 0,
-                'HTML': 0,
-                'CSS': 0,
-                'RUBY': 0,
-                'SEC': 0,
-                'DB': 0,
-                'FE': 0,
-                'BE': 0,
-                'UI': 0,
-                'ML': 0,
-            }
 
-            event_logs = EventLog.objects.filter(timestamp__date__gte=now - timedelta(days=days)).filter(user=member.user)
-            event_logs = event_logs.filter(payload='stop course material').exclude(duration=None)
+            stats = get_default_member_stats()
 
-            total_time = 0
-            for ev in event_logs:
-                duration = ev.duration
-                total_time += duration
-
-                course = ev.course_material.chapter.course
-                coding_languages = list(course.coding_languages)
-                categories = list(course.categories)
-
-                for cl in coding_languages:
-                    stats[cl] += duration
-                # end for
-
-                for c in categories:
-                    stats[c] += duration
-                # end for
+            total_time, durations = get_member_time_spent(user, get_date_cutoff(days))
+            for skill, duration in durations.items():
+                stats[skill] += duration
             # end for
-            # print(len(event_logs))
 
             return Response({
                 'total_time_spent': total_time,
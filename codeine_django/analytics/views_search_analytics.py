@@ -15,6 +15,8 @@ from rest_framework.permissions import (
 from datetime import timedelta
 
 from .models import EventLog
+from .rollups import get_search_ranking
+from utils.date_utils import get_date_cutoff
 
 
 @api_view(['GET'])
@@ -25,16 +27,10 @@ def course_search_ranking_view(request):
     '''
     if request.method == 'GET':
         try:
-            event_logs = EventLog.objects.filter(payload='search course')
-
             days = int(request.query_params.get('days', 120))
-            now = timezone.now()
-
-            event_logs = event_logs.filter(timestamp__date__gte=now - timedelta(days=days))
 
-            search_ranking = event_logs.values('search_string').order_by().annotate(search_count=Count('id')).order_by('-search_count')
-            # print(search_ranking)
-            return Response(search_ranking.all()[:10], status=status.HTTP_200_OK)
+            search_ranking = get_search_ranking(EventLog.Payload.SEARCH_COURSE, get_date_cutoff(days))
+            return Response(search_ranking, status=status.HTTP_200_OK)
         except (ValidationError) as e:
             print(str(e))
             return Response(status=status.HTTP_400_BAD_REQUEST)
@@ -51,16 +47,10 @@ def ip_search_ranking_view(request):
     '''
     if request.method == 'GET':
         try:
-            event_logs = EventLog.objects.filter(payload='search industry project')
-
             days = int(request.query_params.get('days', 120))
-            now = timezone.now()
-
-            event_logs = event_logs.filter(timestamp__date__gte=now - timedelta(days=days))
 
-            search_ranking = event_logs.values('search_string').order_by().annotate(search_count=Count('id')).order_by('-search_count')
-            # print(search_ranking)
-            return Response(search_ranking.all()[:10], status=status.HTTP_200_OK)
+            search_ranking = get_search_ranking(EventLog.Payload.SEARCH_INDUSTRY_PROJECT, get_date_cutoff(days))
+            return Response(search_ranking, status=status.HTTP_200_OK)
         except (ValidationError) as e:
             print(str(e))
             return Response(status=status.HTTP_400_BAD_REQUEST)
@@ -79,9 +79,14 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.StandardPageNumberPagination',
+    'PAGE_SIZE': 20,
 }
 
+# upper bound for pageSize and for unpaginated list responses, see utils.pagination
+MAX_PAGE_SIZE = 100
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=120),
 }
@@ -137,6 +142,11 @@ DATABASES = {
     }
 }
 
+# trigram lookups for course search, see courses.search
+if 'postgresql' in DATABASES['default']['ENGINE']:
+    INSTALLED_APPS.append('django.contrib.postgres')
+# end if
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -173,7 +183,7 @@ USE_TZ = True
 
 # Silence warnings
 
-SILENCED_SYSTEM_CHECKS = ["urls.W002", "models.W042"]
+SILENCED_SYSTEM_CHECKS = ["urls.W002", "models.W042", "models.W040"]  # W040: covering index columns only apply on postgres
 
 
 # Static files (CSS, JavaScript, Images)
@@ -194,7 +204,35 @@ CELERY_BEAT_SCHEDULE = {
     "scheduled_task": {
         "task": "notifications.tasks.weekly_notification",
         "schedule": crontab(minute=00, hour=12, day_of_week='sat'),
-    }
+    },
+    "membership_tier_sweeper": {
+        "task": "common.tasks.membership_tier_sweeper",
+        "schedule": crontab(minute=00, hour=00),
+    },
+    "reindex_course_search": {
+        "task": "courses.tasks.reindex_course_search",
+        "schedule": crontab(minute=30, hour=00),
+    },
+    "rebuild_member_stats": {
+        "task": "courses.tasks.rebuild_stats",
+        "schedule": crontab(minute=00, hour=1),
+    },
+    "archive_notifications": {
+        "task": "notifications.tasks.archive_notifications",
+        "schedule": crontab(minute=00, hour=3),
+    },
+    "reconcile_unread_counts": {
+        "task": "notifications.tasks.reconcile_unread_counts",
+        "schedule": crontab(minute=30, hour=3),
+    },
+    "expire_active_sessions": {
+        "task": "analytics.tasks.expire_active_sessions",
+        "schedule": crontab(minute='*/15'),
+    },
+    "roll_up_event_logs": {
+        "task": "analytics.tasks.roll_up_event_logs",
+        "schedule": crontab(minute='*/15'),
+    },
 }
 
 CELERY_BROKER_TRANSPORT_OPTIONS = {
@@ -203,3 +241,26 @@ CELERY_BROKER_TRANSPORT_OPTIONS = {
     'interval_step': 0.5,
     'interval_max': 1,
 }
+
+# NOTIFICATIONS CONFIG
+# fan out notifications to enrolled members through celery instead of the request thread, see notifications.fanout
+NOTIFICATION_FANOUT_DEFERRED = os.environ.get('NOTIFICATION_FANOUT_DEFERRED', 'True') == 'True'
+
+# members get one of several identical notifications sent within this long, see notifications.fanout
+NOTIFICATION_DEDUP_WINDOW = int(os.environ.get('NOTIFICATION_DEDUP_WINDOW', 10 * 60))  # seconds
+
+# read notification objects older than this are moved to the archive table, see notifications.retention
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 90))
+
+# ANALYTICS CONFIG
+# event logs are buffered in process and written in batches by a background thread, see analytics.ingestion
+ANALYTICS_BUFFERED = os.environ.get('ANALYTICS_BUFFERED', 'True') == 'True'
+ANALYTICS_BUFFER_SIZE = 10000
+ANALYTICS_BATCH_SIZE = 500
+ANALYTICS_FLUSH_INTERVAL = 2  # seconds
+
+# sessions without a stop event after this long are dropped, see analytics.sessions
+ANALYTICS_SESSION_TIMEOUT = int(os.environ.get('ANALYTICS_SESSION_TIMEOUT', 4 * 60 * 60))  # seconds
+
+# events newer than this are left to the next rollup run so buffered writes can land, see analytics.rollups
+ANALYTICS_ROLLUP_LAG = 5 * 60  # seconds
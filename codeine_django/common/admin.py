@@ -4,7 +4,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.forms import ReadOnlyPasswordHashField
 from django.core.exceptions import ValidationError
 
-from .models import BaseUser, Member, Partner, Organization, PaymentTransaction, MembershipSubscription
+from .models import BaseUser, Member, MemberSkill, Partner, Organization, PaymentTransaction, MembershipSubscription
 
 
 class UserCreationForm(forms.ModelForm):
@@ -121,6 +121,11 @@ class MemberAdmin(admin.ModelAdmin):
 # end class
 
 
+class MemberSkillAdmin(admin.ModelAdmin):
+    list_display = ('id', 'member', 'skill', 'points')
+# end class
+
+
 class PartnerAdmin(admin.ModelAdmin):
     list_display = ('id', 'user')
 # end class
@@ -145,6 +150,7 @@ class MembershipSubscriptionAdmin(admin.ModelAdmin):
 
 admin.site.register(BaseUser, UserAdmin)
 admin.site.register(Member, MemberAdmin)
+admin.site.register(MemberSkill, MemberSkillAdmin)
 admin.site.register(Partner, PartnerAdmin)
 admin.site.register(Organization, OrganizationAdmin)
 admin.site.register(PaymentTransaction, PaymentTransactionAdmin)
@@ -352,7 +352,7 @@ class Command(BaseCommand):
             # create some fake views
             for u in BaseUser.objects.all():
                 EventLog(
-                    payload='course view',
+                    payload=EventLog.Payload.COURSE_VIEW,
                     user=u,
                     course=c
                 ).save()
@@ -869,7 +869,7 @@ class Command(BaseCommand):
             # create some fake views
             for u in BaseUser.objects.all():
                 EventLog(
-                    payload='course view',
+                    payload=EventLog.Payload.COURSE_VIEW,
                     user=u,
                     course=c
                 ).save()
@@ -1345,7 +1345,7 @@ class Command(BaseCommand):
             # create some fake views
             for u in BaseUser.objects.all():
                 EventLog(
-                    payload='course view',
+                    payload=EventLog.Payload.COURSE_VIEW,
                     user=u,
                     course=c
                 ).save()
@@ -1629,7 +1629,7 @@ class Command(BaseCommand):
             # create some fake views
             for u in BaseUser.objects.all():
                 EventLog(
-                    payload='course view',
+                    payload=EventLog.Payload.COURSE_VIEW,
                     user=u,
                     course=c
                 ).save()
@@ -1944,7 +1944,7 @@ class Command(BaseCommand):
             # create some fake views
             for u in BaseUser.objects.all():
                 EventLog(
-                    payload='course view',
+                    payload=EventLog.Payload.COURSE_VIEW,
                     user=u,
                     course=c
                 ).save()
@@ -2258,7 +2258,7 @@ class Command(BaseCommand):
             # create some fake views
             for u in BaseUser.objects.all():
                 EventLog(
-                    payload='course view',
+                    payload=EventLog.Payload.COURSE_VIEW,
                     user=u,
                     course=c
                 ).save()
@@ -2684,14 +2684,14 @@ class Command(BaseCommand):
             searches = ['web', 'react native', 'docker', 'django']
             for i in range(99):
                 EventLog(
-                    payload='search course',
+                    payload=EventLog.Payload.SEARCH_COURSE,
                     search_string=searches[randint(0, 3)]
                 ).save()
             # end for
             searches = ['ui designer', 'frontend dev', 'devops engineer', 'ML sexpert']
             for i in range(99):
                 EventLog(
-                    payload='search industry project',
+                    payload=EventLog.Payload.SEARCH_INDUSTRY_PROJECT,
                     search_string=searches[randint(0, 3)]
                 ).save()
             # end for
@@ -2703,12 +2703,12 @@ class Command(BaseCommand):
             for cm in CourseMaterial.objects.all():
                 for i in range(4):
                     EventLog(
-                        payload='continue course material',
+                        payload=EventLog.Payload.CONTINUE_COURSE_MATERIAL,
                         user=members[randint(0, 1)],
                         course_material=cm
                     ).save()
                     EventLog(
-                        payload='stop course material',
+                        payload=EventLog.Payload.STOP_COURSE_MATERIAL,
                         user=members[randint(0, 1)],
                         course_material=cm,
                         duration=randint(60, 2400),
@@ -2721,12 +2721,12 @@ class Command(BaseCommand):
             cm = chap.course_materials.all()[1]
             for i in range(10):
                 EventLog(
-                    payload='continue course material',
+                    payload=EventLog.Payload.CONTINUE_COURSE_MATERIAL,
                     user=members[randint(0, 1)],
                     course_material=cm
                 ).save()
                 EventLog(
-                    payload='stop course material',
+                    payload=EventLog.Payload.STOP_COURSE_MATERIAL,
                     user=members[randint(0, 1)],
                     course_material=cm,
                     duration=randint(1200, 3600),
@@ -2773,7 +2773,7 @@ class Command(BaseCommand):
             for i in range(3, 25):
                 m = Member.objects.get(user__email=f'm{i}@m{i}.com')
                 EventLog(
-                    payload='view industry project',
+                    payload=EventLog.Payload.VIEW_INDUSTRY_PROJECT,
                     user=m.user,
                     industry_project=ip
                 ).save()
@@ -2801,7 +2801,7 @@ class Command(BaseCommand):
             for i in range(3, 31):
                 m = Member.objects.get(user__email=f'm{i}@m{i}.com')
                 EventLog(
-                    payload='view industry project',
+                    payload=EventLog.Payload.VIEW_INDUSTRY_PROJECT,
                     user=m.user,
                     industry_project=ip
                 ).save()
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+SKILLS = ('PY', 'JAVA', 'JS', 'CPP', 'CS', 'HTML', 'CSS', 'RUBY', 'SEC', 'DB', 'FE', 'BE', 'UI', 'ML')
+
+
+def create_member_skills(apps, schema_editor):
+    Member = apps.get_model('common', 'Member')
+    MemberSkill = apps.get_model('common', 'MemberSkill')
+
+    member_skills = []
+    for member_id, stats in Member.objects.values_list('id', 'stats').iterator():
+        for skill in SKILLS:
+            member_skills.append(MemberSkill(member_id=member_id, skill=skill, points=int((stats or {}).get(skill, 0))))
+        # end for
+
+        if len(member_skills) >= 5000:
+            MemberSkill.objects.bulk_create(member_skills)
+            member_skills = []
+        # end if
+    # end for
+    MemberSkill.objects.bulk_create(member_skills)
+# end def
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberSkill',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(choices=[('PY', 'Python'), ('JAVA', 'Java'), ('JS', 'Javascript'), ('CPP', 'C++'), ('CS', 'C#'), ('HTML', 'HTML'), ('CSS', 'CSS'), ('RUBY', 'Ruby'), ('SEC', 'Security'), ('DB', 'Database Administration'), ('FE', 'Frontend'), ('BE', 'Backend'), ('UI', 'UI/UX'), ('ML', 'Machine Learning')], max_length=10)),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skills', to='common.member')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='memberskill',
+            index=models.Index(fields=['skill', 'points'], name='member_skill_points_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='memberskill',
+            constraint=models.UniqueConstraint(fields=('member', 'skill'), name='MemberSkill Unique Constraint: skill'),
+        ),
+        migrations.RunPython(create_member_skills, migrations.RunPython.noop),
+    ]
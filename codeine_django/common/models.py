@@ -19,23 +19,27 @@ def org_directory_path(instance, filename):
 # end def
 
 
+# skills members earn exp points in, coding languages then categories of courses
+SKILLS = (
+    ('PY', 'Python'),
+    ('JAVA', 'Java'),
+    ('JS', 'Javascript'),
+    ('CPP', 'C++'),
+    ('CS', 'C#'),
+    ('HTML', 'HTML'),
+    ('CSS', 'CSS'),
+    ('RUBY', 'Ruby'),
+    ('SEC', 'Security'),
+    ('DB', 'Database Administration'),
+    ('FE', 'Frontend'),
+    ('BE', 'Backend'),
+    ('UI', 'UI/UX'),
+    ('ML', 'Machine Learning'),
+)
+
+
 def get_default_member_stats():
-    return {
-        'PY': 0,
-        'JAVA': 0,
-        'JS': 0,
-        'CPP': 0,
-        'CS': 0,
-        'HTML': 0,
-        'CSS': 0,
-        'RUBY': 0,
-        'SEC': 0,
-        'DB': 0,
-        'FE': 0,
-        'BE': 0,
-        'UI': 0,
-        'ML': 0,
-    }
+    return {skill: 0 for skill, label in SKILLS}
 # end def
 
 
@@ -144,6 +148,26 @@ class Member(models.Model):
 # end class
 
 
+class MemberSkill(models.Model):
+    '''
+    One row per member and skill mirroring Member.stats, kept in sync by common.skills
+    Indexed for skill range queries and leaderboards
+    '''
+    member = models.ForeignKey('Member', on_delete=models.CASCADE, related_name='skills')
+    skill = models.CharField(max_length=10, choices=SKILLS)
+    points = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['member', 'skill'], name='MemberSkill Unique Constraint: skill')
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'points'], name='member_skill_points_idx'),
+        ]
+    # end Meta
+# end class
+
+
 class Organization(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, unique=True)
     organization_name = models.CharField(max_length=255, unique=True)
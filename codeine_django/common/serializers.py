@@ -1,7 +1,9 @@
+from django.db import models
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 
 from .models import Member, BaseUser, Partner, Organization, PaymentTransaction, BankDetail, MembershipSubscription, CV
-from utils.member_utils import get_membership_tier
+from utils.member_utils import resolve_membership_tier, get_membership_expiry, get_membership_tiers
 
 
 class OrganizationSerializer(serializers.ModelSerializer):
@@ -41,6 +43,79 @@ class NestedMemberSerializer(serializers.ModelSerializer):
 # end class
 
 
+class MembershipTierListSerializer(serializers.ListSerializer):
+    '''
+    Resolves the membership tiers of the users nested in every row in one query
+    user_fields are the lookups from a row to its users, e.g. ('member__user',)
+    The tiers are shared through the root context, so nested user serializers have to be given self.context
+    '''
+    user_fields = ()
+
+    def get_user_fields(self):
+        return self.user_fields
+    # end def
+
+    def get_related_lookups(self):
+        # everything NestedBaseUserSerializer reads off a user
+        lookups = []
+        for field in self.get_user_fields():
+            lookups += [f'{field}__member', f'{field}__partner__organization']
+        # end for
+        return lookups
+    # end def
+
+    def get_users(self, row):
+        users = []
+        for field in self.get_user_fields():
+            user = row
+            for name in field.split('__'):
+                user = getattr(user, name) if user is not None else None
+            # end for
+            users.append(user)
+        # end for
+        return users
+    # end def
+
+    def to_representation(self, data):
+        rows = data.all() if isinstance(data, models.Manager) else data
+        lookups = self.get_related_lookups()
+        if isinstance(rows, models.QuerySet):
+            rows = rows.select_related(*lookups)
+        # end if
+        rows = list(rows)
+        prefetch_related_objects(rows, *lookups)  # pages arrive as lists, loaded relations are skipped
+
+        members = [user.member for row in rows for user in self.get_users(row) if user is not None and hasattr(user, 'member')]
+        self.context.setdefault('membership_tiers', {}).update(get_membership_tiers(members))
+
+        return super().to_representation(rows)
+    # end def
+# end class
+
+
+def get_membership_tier_list_serializer(*user_fields):
+    '''
+    MembershipTierListSerializer for Meta.list_serializer_class, e.g. get_membership_tier_list_serializer('user')
+    '''
+    return type('MembershipTierListSerializer', (MembershipTierListSerializer,), {'user_fields': user_fields})
+# end def
+
+
+class NestedBaseUserListSerializer(MembershipTierListSerializer):
+    '''
+    Resolves membership tiers of all users in one query
+    '''
+
+    def get_related_lookups(self):
+        return ['member', 'partner', 'partner__organization']
+    # end def
+
+    def get_users(self, row):
+        return [row]
+    # end def
+# end class
+
+
 class NestedBaseUserSerializer(serializers.ModelSerializer):
     partner = NestedPartnerSerializer()
     member = serializers.SerializerMethodField('get_member')
@@ -48,6 +123,7 @@ class NestedBaseUserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BaseUser
+        list_serializer_class = NestedBaseUserListSerializer
         fields = (
             'id',
             'email',
@@ -77,8 +153,18 @@ class NestedBaseUserSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         try:
             if obj.member:
-                get_membership_tier(obj.member)
-                return NestedMemberSerializer(obj.member, context={'request': request}).data
+                member = obj.member
+
+                # tiers are resolved read-only, expiries are persisted by the sweeper
+                # lists resolve all tiers up front into the context, single users query their own expiry
+                membership_tiers = self.context.get('membership_tiers', {})
+                if member.id in membership_tiers:
+                    member.membership_tier = membership_tiers[member.id]
+                else:
+                    member.membership_tier = resolve_membership_tier(get_membership_expiry(member))
+                # end if-else
+
+                return NestedMemberSerializer(member, context={'request': request}).data
             # end if
         except Exception as e:
             pass
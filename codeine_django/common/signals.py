@@ -4,6 +4,7 @@ from celery.exceptions import OperationalError
 
 from .models import PaymentTransaction, MembershipSubscription, Member
 from .tasks import subscription_reminder
+from .skills import sync_member_skills
 from notifications.models import Notification, NotificationObject
 
 from datetime import timedelta
@@ -57,3 +58,11 @@ def update_payment_transaction(sender, instance, created, **kwargs):
         # end try-except
     # end if
 # end def
+
+
+@receiver(post_save, sender=Member)
+def update_member_skills(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or 'stats' in update_fields:
+        sync_member_skills([instance])
+    # end if
+# end def
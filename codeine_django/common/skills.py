@@ -0,0 +1,62 @@
+from .models import SKILLS, Member, MemberSkill
+
+# skill labels clients may send -> skill codes
+SKILL_CODES = {label: skill for skill, label in SKILLS}
+
+
+def get_skill_code(value):
+    '''
+    Skill code for a code or a label, None for anything else
+    '''
+    if value in dict(SKILLS):
+        return value
+    # end if
+    return SKILL_CODES.get(value, None)
+# end def
+
+
+def sync_member_skills(members):
+    '''
+    Writes the MemberSkill rows of members to match their stats, with at most three queries
+    '''
+    existing = MemberSkill.objects.filter(member__in=[member.id for member in members])
+    existing = {(member_skill.member_id, member_skill.skill): member_skill for member_skill in existing}
+
+    created = []
+    updated = []
+    for member in members:
+        for skill, label in SKILLS:
+            points = int(member.stats.get(skill, 0))
+            member_skill = existing.get((member.id, skill), None)
+            if member_skill is None:
+                created.append(MemberSkill(member_id=member.id, skill=skill, points=points))
+            elif member_skill.points != points:
+                member_skill.points = points
+                updated.append(member_skill)
+            # end if-else
+        # end for
+    # end for
+
+    MemberSkill.objects.bulk_create(created)
+    MemberSkill.objects.bulk_update(updated, ['points'])
+# end def
+
+
+def get_members_with_skills(requirements):
+    '''
+    Members with at least {skill: points} in every skill, through the (skill, points) index
+    '''
+    members = Member.objects.all()
+    for skill, points in requirements.items():
+        members = members.filter(pk__in=MemberSkill.objects.filter(skill=skill, points__gte=points).values('member'))
+    # end for
+    return members
+# end def
+
+
+def get_skill_leaderboard(skill, limit=10):
+    '''
+    Members with the most points in skill, as MemberSkill rows with member and user loaded
+    '''
+    return MemberSkill.objects.filter(skill=skill).select_related('member__user').order_by('-points', 'member_id')[:limit]
+# end def
@@ -6,6 +6,7 @@ from codeine_django.celery import app
 
 from notifications.models import Notification, NotificationObject
 from .models import BaseUser
+from utils.member_utils import sweep_membership_tiers
 
 
 @shared_task
@@ -21,3 +22,13 @@ def subscription_reminder(base_user_id):
     notification_object = NotificationObject(receiver=base_user, notification=notification)
     notification_object.save()
 # end def
+
+
+@shared_task
+def membership_tier_sweeper():
+    '''
+    Downgrades members with expired subscriptions in bulk
+    '''
+    downgraded, upgraded = sweep_membership_tiers()
+    return {'downgraded': downgraded, 'upgraded': upgraded}
+# end def
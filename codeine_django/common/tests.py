@@ -1,3 +1,87 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import timedelta
+
+from .models import BaseUser, Member, PaymentTransaction, MembershipSubscription
+from .serializers import NestedBaseUserSerializer
+
+
+class NestedBaseUserSerializerTest(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.users = []
+        for i in range(5):
+            user = BaseUser.objects.create_user(f'member{i}@codeine.com', 'password')
+            Member.objects.create(user=user)
+            self.users.append(user)
+        # end for
+
+        self.subscribe(self.users[0].member, now + timedelta(days=30))
+        self.subscribe(self.users[1].member, now - timedelta(days=30))
+    # end def
+
+    def subscribe(self, member, expiry_date):
+        payment_transaction = PaymentTransaction.objects.create(payment_amount=5, payment_status='COMPLETED', payment_type='VISA')
+        MembershipSubscription.objects.create(payment_transaction=payment_transaction, expiry_date=expiry_date, member=member)
+    # end def
+
+    def test_list_resolves_tiers_in_one_query(self):
+        users = BaseUser.objects.filter(pk__in=[user.pk for user in self.users]).order_by('email')
+
+        # users with member and partner, then the subscription expiries
+        with self.assertNumQueries(2):
+            data = NestedBaseUserSerializer(users, many=True).data
+        # end with
+
+        tiers = {row['email']: row['member']['membership_tier'] for row in data}
+        self.assertEqual(tiers['member0@codeine.com'], 'PRO')
+        self.assertEqual(tiers['member1@codeine.com'], 'FREE')
+        self.assertEqual(tiers['member2@codeine.com'], 'FREE')
+    # end def
+
+    def test_single_user_resolves_own_tier(self):
+        data = NestedBaseUserSerializer(BaseUser.objects.get(pk=self.users[0].pk)).data
+        self.assertEqual(data['member']['membership_tier'], 'PRO')
+
+        data = NestedBaseUserSerializer(BaseUser.objects.get(pk=self.users[1].pk)).data
+        self.assertEqual(data['member']['membership_tier'], 'FREE')
+    # end def
+# end class
+
+
+class SkillLeaderboardTest(TestCase):
+
+    def setUp(self):
+        for index, points in enumerate([300, 100, 500, 200]):
+            user = BaseUser.objects.create_user(f'member{index}@codeine.com', 'password')
+            Member.objects.create(user=user, unique_id=f'member{index}', stats={'PY': points})
+        # end for
+        self.client = APIClient()
+    # end def
+
+    def test_leaderboard_is_ordered_by_points(self):
+        response = self.client.get('/members/leaderboard?skill=Python&limit=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['points'] for row in response.json()], [500, 300, 200])
+        self.assertEqual([row['rank'] for row in response.json()], [1, 2, 3])
+        self.assertEqual(response.json()[0]['member']['email'], 'member2@codeine.com')
+    # end def
+
+    def test_query_count_does_not_grow_with_limit(self):
+        # the leaderboard with members and users, their partners, then the subscription expiries
+        for limit in (2, 4):
+            with self.assertNumQueries(3):
+                self.client.get(f'/members/leaderboard?skill=PY&limit={limit}')
+            # end with
+        # end for
+    # end def
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/members/leaderboard?skill=COBOL').status_code, 400)
+        self.assertEqual(self.client.get('/members/leaderboard?skill=PY&limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/members/leaderboard?skill=PY&limit=ten').status_code, 400)
+    # end def
+# end class
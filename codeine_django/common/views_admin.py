@@ -9,6 +9,7 @@ from rest_framework.permissions import (
 )
 from .models import BaseUser
 from .serializers import NestedBaseUserSerializer
+from utils.pagination import paginate
 import json
 
 
@@ -36,8 +37,7 @@ def admin_view(request):
             )
         # end ifs
 
-        serializer = NestedBaseUserSerializer(users.all(), many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginate(request, users.all(), NestedBaseUserSerializer, {"request": request}, ('date_joined', 'id'))
     # end if
 # end def
 
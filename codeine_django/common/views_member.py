@@ -27,6 +27,7 @@ from .serializers import MemberSerializer, NestedBaseUserSerializer
 from .permissions import IsMemberOnly, IsMemberOrAdminOrReadOnly
 from courses.models import Enrollment
 from courses.serializers import NestedEnrollmentSerializer
+from utils.pagination import paginate
 
 
 @api_view(['GET', 'POST'])
@@ -102,8 +103,7 @@ def member_view(request):
             )
         # end ifs
 
-        serializer = NestedBaseUserSerializer(users.all(), many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginate(request, users.all(), NestedBaseUserSerializer, {"request": request}, ('date_joined', 'id'))
     # end if
 # end def
 
@@ -1,7 +1,8 @@
 from django.db import transaction
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
-from django.db.models import Q, Sum
+from django.conf import settings
+from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -9,6 +10,7 @@ from rest_framework.permissions import AllowAny
 
 from .models import BaseUser, Member, CV
 from .serializers import MemberSerializer, NestedBaseUserSerializer, CVSerializer
+from .skills import get_skill_code, get_skill_leaderboard
 from achievements.models import MemberAchievement
 from achievements.serializers import MemberAchievementSerializer
 from courses.models import Enrollment, QuizResult
@@ -49,11 +51,9 @@ def public_member_course_view(request, pk):
                 course = enrollment.course
 
                 # get quiz result
-                quiz_results = QuizResult.objects.filter(member=member).filter(quiz__course=course)
-                quiz_result = quiz_results.first()
+                quiz_result = QuizResult.objects.filter(member=member).filter(quiz__course=course).select_related('quiz').first()
                 if quiz_result is not None:
-                    total_score = quiz_results.annotate(total_score=Sum('quiz__question_groups__question_bank__questions__shortanswer__marks') + Sum('quiz__question_groups__question_bank__questions__mcq__marks') + Sum('quiz__question_groups__question_bank__questions__mrq__marks'))[0].total_score
-                    serialized_enrollments[i]['quiz_result'] = {'actual_score': quiz_result.score, 'total_score': total_score}
+                    serialized_enrollments[i]['quiz_result'] = {'actual_score': quiz_result.score, 'total_score': quiz_result.quiz.max_marks}
                 else:
                     serialized_enrollments[i]['quiz_result'] = None
             # end for
@@ -118,3 +118,38 @@ def check_unique_id_view(request, unique_id):
         # end if-else
     # end if
 # end def
+
+
+@api_view(['GET'])
+@permission_classes((AllowAny,))
+def skill_leaderboard_view(request):
+    '''
+    Members with the most points in ?skill= (code or label), ?limit= of them up to MAX_PAGE_SIZE
+    Reads the (skill, points) index of MemberSkill
+    '''
+    if request.method == 'GET':
+        try:
+            skill = get_skill_code(request.query_params.get('skill', None))
+            if skill is None:
+                raise ValueError('Invalid skill')
+            # end if
+
+            limit = min(int(request.query_params.get('limit', 10)), settings.MAX_PAGE_SIZE)
+            if limit <= 0:
+                raise ValueError('Invalid limit')
+            # end if
+
+            member_skills = [member_skill for member_skill in get_skill_leaderboard(skill, limit=limit) if member_skill.member.user is not None]
+            users = NestedBaseUserSerializer([member_skill.member.user for member_skill in member_skills], many=True, context={'request': request}).data
+
+            leaderboard = [
+                {'rank': rank, 'points': member_skill.points, 'member': user}
+                for rank, (member_skill, user) in enumerate(zip(member_skills, users), start=1)
+            ]
+            return Response(leaderboard, status=status.HTTP_200_OK)
+        except ValueError as e:
+            print(str(e))
+            return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
+        # end try-except
+    # end if
+# end def
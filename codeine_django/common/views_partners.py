@@ -20,6 +20,7 @@ from .models import BaseUser, Partner, Organization, Member, PaymentTransaction
 from .serializers import NestedBaseUserSerializer
 from .permissions import IsPartnerOnly, IsPartnerOrAdminOrReadOnly
 from consultations.models import ConsultationApplication, ConsultationPayment, ConsultationSlot
+from utils.pagination import paginate
 
 import json
 
@@ -136,8 +137,7 @@ def partner_view(request):
             )
         # end ifs
 
-        serializer = NestedBaseUserSerializer(users.all(), many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginate(request, users.all(), NestedBaseUserSerializer, {"request": request}, ('date_joined', 'id'))
     # end if
 # end def
 
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.3 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['date_edited', 'id'], name='article_edited_keyset_idx'),
+        ),
+    ]
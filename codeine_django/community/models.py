@@ -71,6 +71,9 @@ class Article(models.Model):
 
     class Meta:
         ordering = ['date_edited']
+        indexes = [
+            models.Index(fields=['date_edited', 'id'], name='article_edited_keyset_idx'),
+        ]
     # end class
 # end class
 
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from .models import Article, ArticleComment, ArticleEngagement, CodeReview, CodeReviewComment, ArticleCommentEngagement, CodeReviewEngagement, CodeReviewCommentEngagement
-from common.serializers import NestedBaseUserSerializer
+from common.serializers import NestedBaseUserSerializer, get_membership_tier_list_serializer
 
 
 class NestedCodeReviewSerializer(serializers.ModelSerializer):
@@ -30,6 +30,7 @@ class NestedCodeReviewCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CodeReviewComment
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
@@ -92,6 +93,7 @@ class NestedArticleCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ArticleComment
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
@@ -145,6 +147,7 @@ class ArticleCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ArticleComment
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta'
 
@@ -196,12 +199,12 @@ class CodeReviewCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CodeReviewComment
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
     def get_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.user, context=self.context).data
     # end def
 
     def get_parent_comment(self, obj):
@@ -226,12 +229,12 @@ class ArticleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Article
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
     def get_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.user, context=self.context).data
     # end def
 
     def get_top_level_comments(self, obj):
@@ -277,12 +280,12 @@ class ArticleEngagementSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ArticleEngagement
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
     def get_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.user, context=self.context).data
     # end def
 # end class
 
@@ -297,6 +300,7 @@ class CodeReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CodeReview
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
@@ -308,8 +312,7 @@ class CodeReviewSerializer(serializers.ModelSerializer):
     # end def
 
     def get_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.user, context=self.context).data
     # end def
 
     def get_likes(self, obj):
@@ -339,11 +342,11 @@ class CodeReviewEngagementSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CodeReviewEngagement
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
     def get_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.user, context=self.context).data
     # end def
 # end class
@@ -1,3 +1,35 @@
+from django.conf import settings
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import Article
+
+
+class ArticleListTest(TestCase):
+
+    def setUp(self):
+        Article.objects.bulk_create([
+            Article(title=f'Article {index}', content='Content', is_published=True, coding_languages=['PY'], languages=['ENG'], categories=['BE'])
+            for index in range(120)
+        ])
+        self.client = APIClient()
+    # end def
+
+    def test_plain_list_is_capped(self):
+        response = self.client.get('/articles')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), settings.MAX_PAGE_SIZE)
+    # end def
+
+    def test_paging_params_return_pages(self):
+        response = self.client.get('/articles?pageSize=50')
+        self.assertEqual(len(response.json()['results']), 50)
+
+        response = self.client.get('/articles?sortDate=-date_created&cursor=')
+        self.assertEqual(len(response.json()['results']), 20)
+    # end def
+
+    def test_sort_param_is_whitelisted(self):
+        self.assertEqual(self.client.get('/articles?sortDate=content').status_code, 400)
+    # end def
+# end class
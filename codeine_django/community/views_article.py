@@ -16,6 +16,7 @@ from common.permissions import AdminOrReadOnly
 from .models import Article, ArticleEngagement
 from .serializers import ArticleSerializer
 from notifications.models import Notification, NotificationObject
+from utils.pagination import paginate, get_sort, get_keyset_ordering
 # Create your views here.
 
 
@@ -45,7 +46,11 @@ def article_view(request):
 
         # extract query params
         search = request.query_params.get('search', None)
-        date_sort = request.query_params.get('sortDate', None)
+        try:
+            date_sort = get_sort(request, 'sortDate', ('date_created', 'date_edited'))
+        except ValueError as e:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        # end try-except
 
         if search is not None:
             articles = articles.filter(
@@ -62,9 +67,8 @@ def article_view(request):
             articles = articles.order_by(date_sort)
         # end if
 
-        serializer = ArticleSerializer(
-            articles.all(), many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        ordering = get_keyset_ordering(date_sort, default=('date_edited', 'id'))
+        return paginate(request, articles.all(), ArticleSerializer, {'request': request}, ordering)
     # end if
 
     '''
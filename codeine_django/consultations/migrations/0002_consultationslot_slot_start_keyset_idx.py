@@ -0,0 +1,17 @@
+# Generated by Django 3.2.3 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultationslot',
+            index=models.Index(fields=['start_time', 'id'], name='slot_start_keyset_idx'),
+        ),
+    ]
@@ -38,6 +38,9 @@ class ConsultationSlot(models.Model):
 
     class Meta:
         ordering = ['start_time', 'end_time']
+        indexes = [
+            models.Index(fields=['start_time', 'id'], name='slot_start_keyset_idx'),
+        ]
         # ordering = ['start_date', 'start_time', 'end_date', 'end_time']
     # end class
 # end class
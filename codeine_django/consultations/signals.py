@@ -7,6 +7,7 @@ from .models import ConsultationApplication, ConsultationSlot
 from .tasks import consultation_application_reminder, consultation_slot_reminder
 from courses.models import Course, Enrollment
 from notifications.models import Notification, NotificationObject
+from notifications.fanout import fan_out_to_enrolled_members
 
 from datetime import timedelta, datetime
 
@@ -50,23 +51,18 @@ def update_consultation_slot(sender, instance, created, **kwargs):
     partner = instance.partner
 
     if created:
-        title = f'New consultation slot {consultation_slot.title} available!'
-        notification_type = 'CONSULTATION'
-
-        courses = Course.objects.filter(partner=partner)
-        for course in courses:
-            description = f'New consultation slot {consultation_slot.title} available by the instructor of {course.title}!'
+        # one notification for everyone enrolled in any of the partner's courses
+        course_ids = list(Course.objects.filter(partner=partner).values_list('id', flat=True))
+        if len(course_ids) > 0:
+            title = f'New consultation slot {consultation_slot.title} available!'
+            description = f'New consultation slot {consultation_slot.title} available by the instructor of your courses!'
+            notification_type = 'CONSULTATION'
             notification = Notification(
                 title=title, description=description, notification_type=notification_type, consultation_slot=consultation_slot)
             notification.save()
-            enrollments = Enrollment.objects.filter(course=course)
-            for enrollment in enrollments:
-                receiver = enrollment.member.user
-                notification_object = NotificationObject(
-                    receiver=receiver, notification=notification)
-                notification_object.save()
-            # end for
-        # end for
+
+            fan_out_to_enrolled_members(notification, course_ids)
+        # end if
 
         if isinstance(consultation_slot.start_time, str):
             reminder_time = parse_datetime(consultation_slot.start_time) - timedelta(minutes=30)
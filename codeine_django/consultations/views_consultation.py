@@ -13,6 +13,7 @@ from .models import ConsultationSlot, ConsultationApplication
 from common.models import Partner, Member
 from common.permissions import IsMemberOnly, IsPartnerOnly, IsPartnerOrReadOnly
 from .serializers import ConsultationSlotSerializer
+from utils.pagination import paginate
 
 
 @api_view(['GET', 'POST'])
@@ -108,9 +109,7 @@ def consultation_slot_view(request):
             # end if
         # end if
 
-        serializer = ConsultationSlotSerializer(
-            consultation_slots.all(), many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginate(request, consultation_slots.all(), ConsultationSlotSerializer, {"request": request}, ('start_time', 'id'))
     # end if
 # end def
 
@@ -10,6 +10,7 @@ from .models import (
     Question,
     QuestionBank,
     QuestionGroup,
+    CourseCompletion,
     ShortAnswer,
     MCQ,
     MRQ,
@@ -169,6 +170,16 @@ class QuizResultAdmin(admin.ModelAdmin):
 # end class
 
 
+class CourseCompletionAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'date_created',
+        'member',
+        'course',
+    )
+# end class
+
+
 class QuizAnswerAdmin(admin.ModelAdmin):
     list_display = (
         'quiz_result',
@@ -225,6 +236,7 @@ admin.site.register(MCQ, MCQAdmin)
 admin.site.register(MRQ, MRQAdmin)
 admin.site.register(Enrollment, EnrollmentAdmin)
 admin.site.register(QuizResult, QuizResultAdmin)
+admin.site.register(CourseCompletion, CourseCompletionAdmin)
 admin.site.register(QuizAnswer, QuizAnswerAdmin)
 admin.site.register(CourseReview, CourseReviewAdmin)
 admin.site.register(CourseComment, CourseCommentAdmin)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from courses.stats import rebuild_member_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes member stats and course completions from passed course assessments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Members rebuilt per batch')
+    # end def
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding member stats...')
+        rebuilt = rebuild_member_stats(batch_size=options['batch_size'])
+        self.stdout.write(f'{self.style.SUCCESS("Success")}: {rebuilt} members rebuilt')
+    # end def
+# end class
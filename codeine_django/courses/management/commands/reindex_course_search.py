@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from courses.models import Course, CourseSearchDocument
+from courses.search import index_courses
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds course search documents that are missing or out of date'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rewrite every search document')
+    # end def
+
+    def handle(self, *args, **options):
+        self.stdout.write('Indexing courses...')
+        written = index_courses(Course.objects.all(), force=options['all'])
+        self.stdout.write(f'{self.style.SUCCESS("Success")}: {written} search documents written, {CourseSearchDocument.objects.count()} indexed')
+    # end def
+# end class
@@ -0,0 +1,51 @@
+from django.db.models import IntegerField, Value
+from django.db.models.functions import Coalesce
+
+from .models import Quiz, QuestionBank, QuestionGroup, Question
+
+
+def get_group_max_marks(question_marks, count):
+    '''
+    Highest marks a group drawing count questions from a bank can give
+    '''
+    return sum(sorted(question_marks.values(), reverse=True)[:count])
+# end def
+
+
+def refresh_quiz_max_marks(quiz_ids):
+    '''
+    Recomputes Quiz.max_marks from the cached marks of its question banks
+    '''
+    max_marks = {quiz_id: 0 for quiz_id in quiz_ids}
+    question_groups = QuestionGroup.objects.filter(quiz__in=quiz_ids).exclude(question_bank=None)
+    for quiz_id, count, question_marks in question_groups.values_list('quiz_id', 'count', 'question_bank__question_marks'):
+        max_marks[quiz_id] += get_group_max_marks(question_marks, count)
+    # end for
+
+    quizzes = list(Quiz.objects.filter(pk__in=max_marks.keys()))
+    for quiz in quizzes:
+        quiz.max_marks = max_marks[quiz.id]
+    # end for
+    Quiz.objects.bulk_update(quizzes, ['max_marks'])
+# end def
+
+
+def refresh_question_bank_marks(question_bank_ids):
+    '''
+    Recomputes QuestionBank.question_marks and the max marks of quizzes drawing from the banks
+    '''
+    question_marks = {question_bank_id: {} for question_bank_id in question_bank_ids}
+    marks = Coalesce('shortanswer__marks', 'mcq__marks', 'mrq__marks', Value(0), output_field=IntegerField())
+    questions = Question.objects.filter(question_bank__in=question_bank_ids).annotate(marks=marks)
+    for question_id, question_bank_id, question_mark in questions.values_list('id', 'question_bank_id', 'marks'):
+        question_marks[question_bank_id][str(question_id)] = question_mark
+    # end for
+
+    question_banks = list(QuestionBank.objects.filter(pk__in=question_marks.keys()))
+    for question_bank in question_banks:
+        question_bank.question_marks = question_marks[question_bank.id]
+    # end for
+    QuestionBank.objects.bulk_update(question_banks, ['question_marks'])
+
+    refresh_quiz_max_marks(set(QuestionGroup.objects.filter(question_bank__in=question_bank_ids).values_list('quiz_id', flat=True)))
+# end def
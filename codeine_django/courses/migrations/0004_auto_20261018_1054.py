@@ -0,0 +1,21 @@
+# Generated by Django 3.2.3 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_auto_20210414_1446'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['published_date', 'id'], name='course_published_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['date_created', 'id'], name='enrollment_created_keyset_idx'),
+        ),
+    ]
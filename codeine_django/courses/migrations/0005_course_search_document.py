@@ -0,0 +1,60 @@
+# Generated by Django 3.2.3 on 2026-10-18 10:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN indexes only exist on postgres, other databases use the in-process index in courses.search
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # end if
+
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    CourseSearchDocument = apps.get_model('courses', 'CourseSearchDocument')
+    vector = (
+        SearchVector('title', weight='A', config='english') +
+        SearchVector('tags', weight='B', config='english') +
+        SearchVector('provider', weight='C', config='english') +
+        SearchVector('description', weight='D', config='english')
+    )
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.add_index(CourseSearchDocument, GinIndex(vector, name='course_search_vector_idx'))
+    schema_editor.add_index(CourseSearchDocument, GinIndex(fields=['document'], opclasses=['gin_trgm_ops'], name='course_search_trigram_idx'))
+# end def
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # end if
+
+    schema_editor.execute('DROP INDEX IF EXISTS course_search_vector_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS course_search_trigram_idx')
+# end def
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_auto_20261018_1054'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSearchDocument',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='courses.course')),
+                ('title', models.TextField(default='')),
+                ('tags', models.TextField(default='')),
+                ('provider', models.TextField(default='')),
+                ('description', models.TextField(default='')),
+                ('document', models.TextField(default='')),
+                ('date_updated', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:26
+
+from django.db import migrations, models
+from django.db.models import IntegerField, Value
+from django.db.models.functions import Coalesce
+
+from collections import defaultdict
+
+
+def populate_marks(apps, schema_editor):
+    # mirrors courses.marks against the historical models
+    Question = apps.get_model('courses', 'Question')
+    QuestionBank = apps.get_model('courses', 'QuestionBank')
+    QuestionGroup = apps.get_model('courses', 'QuestionGroup')
+    Quiz = apps.get_model('courses', 'Quiz')
+
+    question_marks = defaultdict(dict)
+    marks = Coalesce('shortanswer__marks', 'mcq__marks', 'mrq__marks', Value(0), output_field=IntegerField())
+    questions = Question.objects.exclude(question_bank=None).annotate(marks=marks)
+    for question_id, question_bank_id, question_mark in questions.values_list('id', 'question_bank_id', 'marks'):
+        question_marks[question_bank_id][str(question_id)] = question_mark
+    # end for
+
+    question_banks = list(QuestionBank.objects.filter(pk__in=question_marks.keys()))
+    for question_bank in question_banks:
+        question_bank.question_marks = question_marks[question_bank.id]
+    # end for
+    QuestionBank.objects.bulk_update(question_banks, ['question_marks'])
+
+    max_marks = defaultdict(int)
+    for quiz_id, count, question_bank_id in QuestionGroup.objects.exclude(question_bank=None).values_list('quiz_id', 'count', 'question_bank_id'):
+        max_marks[quiz_id] += sum(sorted(question_marks[question_bank_id].values(), reverse=True)[:count])
+    # end for
+
+    quizzes = list(Quiz.objects.filter(pk__in=max_marks.keys()))
+    for quiz in quizzes:
+        quiz.max_marks = max_marks[quiz.id]
+    # end for
+    Quiz.objects.bulk_update(quizzes, ['max_marks'])
+# end def
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_course_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionbank',
+            name='question_marks',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='max_marks',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_marks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_quiz_max_marks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['member', 'date_created', 'id'], name='enrollment_member_first_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from collections import defaultdict
+
+
+def create_completions(apps, schema_editor):
+    # passed assessments of enrolled courses are already counted in Member.stats, record them so they are not counted again
+    Course = apps.get_model('courses', 'Course')
+    CourseCompletion = apps.get_model('courses', 'CourseCompletion')
+    QuizResult = apps.get_model('courses', 'QuizResult')
+
+    passed = QuizResult.objects.filter(
+        passed=True,
+        quiz__course__enrollments__member=models.F('member')
+    ).values_list('member_id', 'quiz__course_id').distinct().order_by()
+    passed = list(passed)
+
+    course_stats = {}
+    for course in Course.objects.filter(pk__in=set(course_id for member_id, course_id in passed)):
+        stats = defaultdict(int)
+        for skill in list(course.coding_languages) + list(course.categories):
+            stats[skill] += course.exp_points
+        # end for
+        course_stats[course.id] = dict(stats)
+    # end for
+
+    completions = [CourseCompletion(member_id=member_id, course_id=course_id, stats=course_stats[course_id]) for member_id, course_id in passed]
+    CourseCompletion.objects.bulk_create(completions, batch_size=500)
+# end def
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+        ('courses', '0007_enrollment_member_first_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseCompletion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('stats', models.JSONField(default=dict)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completions', to='courses.course')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_completions', to='common.member')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='coursecompletion',
+            constraint=models.UniqueConstraint(fields=('member', 'course'), name='CourseCompletion Unique Constraint: member'),
+        ),
+        migrations.RunPython(create_completions, migrations.RunPython.noop),
+    ]
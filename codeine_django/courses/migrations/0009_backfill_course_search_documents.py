@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_search_documents(apps, schema_editor, batch_size=500):
+    # courses that existed before 0005 have no search document, so searches would find nothing until the nightly reindex
+    from courses.search import get_document_fields
+
+    Course = apps.get_model('courses', 'Course')
+    CourseSearchDocument = apps.get_model('courses', 'CourseSearchDocument')
+
+    courses = Course.objects.filter(search_document__isnull=True).select_related('partner__user', 'partner__organization')
+
+    documents = []
+    for course in courses.iterator(chunk_size=batch_size):
+        documents.append(CourseSearchDocument(course_id=course.id, **get_document_fields(course)))
+        if len(documents) >= batch_size:
+            CourseSearchDocument.objects.bulk_create(documents)
+            documents = []
+        # end if
+    # end for
+    CourseSearchDocument.objects.bulk_create(documents)
+# end def
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_course_completion'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_documents, migrations.RunPython.noop),
+    ]
@@ -91,6 +91,9 @@ class Course(models.Model):
 
     class Meta:
         ordering = ['is_deleted', 'published_date']
+        indexes = [
+            models.Index(fields=['published_date', 'id'], name='course_published_keyset_idx'),
+        ]
     # end Meta
 
     def __str__(self):
@@ -98,6 +101,25 @@ class Course(models.Model):
 # end class
 
 
+class CourseSearchDocument(models.Model):
+    '''
+    Denormalized search text for a course, maintained by courses.search
+    Fields are weighted A to D for ranking
+    '''
+    course = models.OneToOneField('Course', on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    title = models.TextField(default='')  # A
+    tags = models.TextField(default='')  # B, coding languages and categories
+    provider = models.TextField(default='')  # C, partner and organization names
+    description = models.TextField(default='')  # D
+    document = models.TextField(default='')  # all of the above, for trigram matching
+    date_updated = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f'Search document: {self.course_id}'
+    # end def
+# end class
+
+
 class Chapter(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, unique=True)
     title = models.CharField(max_length=255)
@@ -169,6 +191,13 @@ class Enrollment(models.Model):
 
     # ref for member
     member = models.ForeignKey('common.Member', on_delete=models.CASCADE, related_name='enrollments')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_created', 'id'], name='enrollment_created_keyset_idx'),
+            models.Index(fields=['member', 'date_created', 'id'], name='enrollment_member_first_idx'),
+        ]
+    # end Meta
 # end class
 
 
@@ -194,6 +223,9 @@ class Quiz(models.Model):
     # question bank
     is_randomized = models.BooleanField(default=False)
 
+    # highest score an attempt can reach, maintained by courses.marks
+    max_marks = models.PositiveIntegerField(default=0)
+
     # extends course material or mapped to course
     course_material = models.OneToOneField('CourseMaterial', on_delete=models.CASCADE, null=True, blank=True)
     course = models.OneToOneField('Course', on_delete=models.CASCADE, related_name='assessment', null=True, blank=True)
@@ -204,6 +236,9 @@ class QuestionBank(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, unique=True)
     label = models.CharField(max_length=255)
 
+    # {question id: marks}, maintained by courses.marks
+    question_marks = models.JSONField(default=dict, blank=True)
+
     course = models.ForeignKey('Course', on_delete=models.CASCADE, related_name="question_banks")
 
     class Meta:
@@ -290,6 +325,24 @@ class QuizResult(models.Model):
 # end class
 
 
+class CourseCompletion(models.Model):
+    '''
+    Course assessment passed by a member, counted once in Member.stats, see courses.stats
+    '''
+    date_created = models.DateTimeField(auto_now_add=True)
+    stats = models.JSONField(default=dict)  # exp points added to Member.stats, by skill
+
+    member = models.ForeignKey('common.Member', on_delete=models.CASCADE, related_name='course_completions')
+    course = models.ForeignKey('Course', on_delete=models.CASCADE, related_name='completions')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['member', 'course'], name='CourseCompletion Unique Constraint: member')
+        ]
+    # end Meta
+# end class
+
+
 class QuizAnswer(models.Model):
     # parent assessment result
     quiz_result = models.ForeignKey('QuizResult', on_delete=models.CASCADE, related_name='quiz_answers')
@@ -0,0 +1,25 @@
+from collections import defaultdict
+
+import random
+
+
+def sample_questions(question_groups, questions, member_id):
+    '''
+    Samples the questions a member answers for each question group, the same for every attempt
+    questions are those of the groups' banks, as objects with id, order and question_bank_id
+    A group asking for more questions than its bank has gets the whole bank
+    Shared by quiz attempts and QuizSerializer, so both list the same questions
+    '''
+    questions_by_bank = defaultdict(list)
+    for question in sorted(questions, key=lambda question: (question.order, str(question.id))):
+        questions_by_bank[question.question_bank_id].append(question)
+    # end for
+
+    rng = random.Random(int(member_id))
+    sampled = []
+    for question_group in sorted(question_groups, key=lambda question_group: (question_group.order, str(question_group.id))):
+        bank_questions = questions_by_bank.get(question_group.question_bank_id, [])
+        sampled += rng.sample(bank_questions, k=min(question_group.count, len(bank_questions)))
+    # end for
+    return sampled
+# end def
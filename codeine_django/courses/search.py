@@ -0,0 +1,262 @@
+from django.db import connections
+from django.db.models import Case, When, Value, FloatField
+from django.db.models.functions import Cast
+
+from bisect import bisect_left
+from collections import defaultdict
+
+import re
+import threading
+
+from .models import Course, CourseSearchDocument
+
+SEARCH_CONFIG = 'english'
+SEARCH_FIELDS = (('title', 'A'), ('tags', 'B'), ('provider', 'C'), ('description', 'D'))
+SEARCH_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}  # same defaults as postgres ts_rank
+TRIGRAM_THRESHOLD = 0.3
+MAX_SEARCH_RESULTS = 1000
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9#+]+')
+QUERY_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+# end def
+
+
+def get_document_fields(course):
+    '''
+    Builds the search document fields for a course
+    Expects partner__user and partner__organization to be loaded
+    '''
+    coding_languages = dict(Course.CODING_LANGUAGES)
+    categories = dict(Course.CATEGORIES)
+
+    tags = []
+    for code in course.coding_languages:
+        tags += [code, coding_languages.get(code, '')]
+    # end for
+    for code in course.categories:
+        tags += [code, categories.get(code, '')]
+    # end for
+
+    provider = []
+    partner = course.partner
+    if partner is not None:
+        provider += [partner.user.first_name or '', partner.user.last_name or '']
+        if partner.organization is not None:
+            provider.append(partner.organization.organization_name or '')
+        # end if
+    # end if
+
+    fields = {
+        'title': course.title or '',
+        'tags': ' '.join(tag for tag in tags if tag),
+        'provider': ' '.join(name for name in provider if name),
+        'description': course.description or '',
+    }
+    fields['document'] = ' '.join(fields[field] for field, weight in SEARCH_FIELDS)
+    return fields
+# end def
+
+
+def index_courses(courses, force=True):
+    '''
+    Writes search documents for courses
+    Unless force is set, documents that are already up to date are left untouched
+    Returns the number of documents written
+    '''
+    courses = courses.select_related('partner__user', 'partner__organization', 'search_document')
+
+    written = 0
+    for course in courses.iterator(chunk_size=500):
+        fields = get_document_fields(course)
+
+        try:
+            document = course.search_document
+        except CourseSearchDocument.DoesNotExist:
+            document = CourseSearchDocument(course=course)
+        # end try-except
+
+        if not force and document.date_updated is not None and all(getattr(document, key) == value for key, value in fields.items()):
+            continue
+        # end if
+
+        for key, value in fields.items():
+            setattr(document, key, value)
+        # end for
+        document.save()
+        written += 1
+    # end for
+    return written
+# end def
+
+
+class CourseSearchIndex:
+    '''
+    In-process inverted index over CourseSearchDocument, used when the database has no full-text search (sqlite in dev)
+    Documents changed since the last lookup are re-read on every search
+    '''
+
+    def __init__(self):
+        self.postings = defaultdict(dict)  # token -> {course_id: weight}
+        self.course_tokens = defaultdict(set)  # course_id -> tokens
+        self.sorted_tokens = []
+        self.watermark = None
+        self.lock = threading.Lock()
+    # end def
+
+    def add(self, document):
+        course_id = document.course_id
+        for token in self.course_tokens.pop(course_id, set()):
+            self.postings[token].pop(course_id, None)
+        # end for
+
+        for field, weight in SEARCH_FIELDS:
+            for token in tokenize(getattr(document, field)):
+                postings = self.postings[token]
+                postings[course_id] = max(postings.get(course_id, 0), SEARCH_WEIGHTS[weight])
+                self.course_tokens[course_id].add(token)
+            # end for
+        # end for
+    # end def
+
+    def refresh(self):
+        documents = CourseSearchDocument.objects.all()
+        if self.watermark is not None:
+            documents = documents.filter(date_updated__gte=self.watermark)
+        # end if
+
+        changed = False
+        for document in documents.iterator():
+            self.add(document)
+            if self.watermark is None or document.date_updated > self.watermark:
+                self.watermark = document.date_updated
+            # end if
+            changed = True
+        # end for
+
+        if changed:
+            self.sorted_tokens = sorted(token for token, postings in self.postings.items() if len(postings) > 0)
+        # end if
+    # end def
+
+    def match(self, token, prefix):
+        if not prefix:
+            return self.postings.get(token, {})
+        # end if
+
+        # the last search term is matched as a prefix, for search as you type
+        matches = {}
+        index = bisect_left(self.sorted_tokens, token)
+        while index < len(self.sorted_tokens) and self.sorted_tokens[index].startswith(token):
+            for course_id, weight in self.postings[self.sorted_tokens[index]].items():
+                matches[course_id] = max(matches.get(course_id, 0), weight)
+            # end for
+            index += 1
+        # end while
+        return matches
+    # end def
+
+    def search(self, text):
+        '''
+        Returns {course_id: score} for courses matching every term of text
+        '''
+        tokens = tokenize(text)
+        if len(tokens) == 0:
+            return {}
+        # end if
+
+        with self.lock:
+            self.refresh()
+
+            scores = None
+            for index, token in enumerate(tokens):
+                matches = self.match(token, index == len(tokens) - 1)
+                if scores is None:
+                    scores = dict(matches)
+                else:
+                    scores = {course_id: score + matches[course_id] for course_id, score in scores.items() if course_id in matches}
+                # end if-else
+
+                if len(scores) == 0:
+                    break
+                # end if
+            # end for
+        # end with
+        return scores
+    # end def
+# end class
+
+
+course_search_index = CourseSearchIndex()
+
+
+def get_search_vector(prefix='search_document__'):
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field, weight in SEARCH_FIELDS:
+        field_vector = SearchVector(f'{prefix}{field}', weight=weight, config=SEARCH_CONFIG)
+        vector = field_vector if vector is None else vector + field_vector
+    # end for
+    return vector
+# end def
+
+
+def search_courses_postgres(queryset, search):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+    tokens = QUERY_TOKEN_PATTERN.findall(search.lower())
+    if len(tokens) == 0:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+    # end if
+
+    # every term must match, the last one as a prefix
+    raw_query = ' & '.join(tokens[:-1] + [f'{tokens[-1]}:*'])
+    query = SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+
+    courses = queryset.annotate(search_vector=get_search_vector()).filter(search_vector=query)
+    # ranks are real, cast to double so that they round trip exactly through keyset cursors
+    courses = courses.annotate(search_rank=Cast(SearchRank(get_search_vector(), query), FloatField()))
+    if courses.exists():
+        return courses.order_by('-search_rank', 'id')
+    # end if
+
+    # no lexeme matched, fall back to fuzzy matching for typos
+    courses = queryset.filter(search_document__document__trigram_similar=search)
+    courses = courses.annotate(search_rank=Cast(TrigramSimilarity('search_document__document', search), FloatField()))
+    return courses.filter(search_rank__gte=TRIGRAM_THRESHOLD).order_by('-search_rank', 'id')
+# end def
+
+
+def search_courses_in_process(queryset, search):
+    scores = course_search_index.search(search)
+    if len(scores) == 0:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+    # end if
+
+    # truncate only among the courses left by the caller's filters
+    course_ids = set(queryset.filter(pk__in=list(scores)).values_list('pk', flat=True))
+    ranked = sorted(((course_id, scores[course_id]) for course_id in course_ids), key=lambda item: (-item[1], str(item[0])))[:MAX_SEARCH_RESULTS]
+    search_rank = Case(
+        *[When(pk=course_id, then=Value(score)) for course_id, score in ranked],
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+    courses = queryset.filter(pk__in=[course_id for course_id, score in ranked])
+    return courses.annotate(search_rank=search_rank).order_by('-search_rank', 'id')
+# end def
+
+
+def search_courses(queryset, search):
+    '''
+    Filters a Course queryset by a search string, annotated with search_rank and ordered by it
+    Other filters must be applied to queryset first, the in-process search keeps only the top MAX_SEARCH_RESULTS
+    '''
+    if connections[queryset.db].vendor == 'postgresql':
+        return search_courses_postgres(queryset, search)
+    # end if
+    return search_courses_in_process(queryset, search)
+# end def
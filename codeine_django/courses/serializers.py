@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AnonymousUser
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from .models import (
@@ -22,11 +23,9 @@ from .models import (
     QuestionGroup,
     QuestionBank
 )
-
+from .sampling import sample_questions
 from common.models import Member, Partner
-from common.serializers import NestedBaseUserSerializer, MemberSerializer
-
-import random
+from common.serializers import NestedBaseUserSerializer, MemberSerializer, get_membership_tier_list_serializer
 
 # Assessment related
 
@@ -168,20 +167,19 @@ class QuizSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Quiz
-        fields = ('id', 'passing_marks', 'course', 'course_material', 'instructions', 'is_randomized', 'question_groups', 'questions')
+        fields = ('id', 'passing_marks', 'course', 'course_material', 'instructions', 'is_randomized', 'max_marks', 'question_groups', 'questions')
     # end Meta
 
     def get_questions(self, obj):
         request = self.context.get('request')
         try:
             member = request.user.member
-            random.seed(int(member.id))
-            questions = []
 
-            for question_group in obj.question_groups.all():
-                tmp = random.sample(list(question_group.question_bank.questions.all()), k=question_group.count)
-                questions += tmp
-            # end for
+            # the questions of the member's attempts, see courses.views_quiz_result
+            question_groups = [question_group for question_group in obj.question_groups.all() if question_group.question_bank is not None]
+            banks = {question_group.question_bank_id: question_group.question_bank for question_group in question_groups}
+            questions = [question for question_bank in banks.values() for question in question_bank.questions.all()]
+            questions = sample_questions(question_groups, questions, member.id)
             return QuestionSerializer(questions, many=True, context=self.context).data
         except Exception as e:
             try:
@@ -251,6 +249,42 @@ class ChapterSerializer(serializers.ModelSerializer):
 # end class
 
 
+def get_course_viewer(context):
+    '''
+    Resolves the requesting user's member, partner and enrolled courses
+    once per serialization, cached in the serializer context
+    '''
+    if 'viewer' in context:
+        return context['viewer']
+    # end if
+
+    request = context.get('request')
+    user = request.user if request is not None else None
+    viewer = {
+        'member': None,
+        'partner': None,
+        'enrolled_course_ids': set(),
+    }
+
+    if user is not None and user.is_authenticated:
+        viewer['member'] = Member.objects.filter(user=user).first()
+        viewer['partner'] = Partner.objects.filter(user=user).first()
+
+        if viewer['member'] is not None:
+            viewer['enrolled_course_ids'] = set(Enrollment.objects.filter(member=viewer['member']).values_list('course_id', flat=True))
+        # end if
+    # end if
+
+    context['viewer'] = viewer
+    return viewer
+# end def
+
+
+def get_question_lookups(prefix):
+    return [f'{prefix}__question_groups__question_bank__questions__{answer}' for answer in ('shortanswer', 'mcq', 'mrq')]
+# end def
+
+
 class CourseSerializer(serializers.ModelSerializer):
     chapters = serializers.SerializerMethodField()
     thumbnail = serializers.SerializerMethodField('get_thumbnail_url')
@@ -260,9 +294,35 @@ class CourseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Course
+        list_serializer_class = get_membership_tier_list_serializer('partner__user')
         fields = '__all__'
     # end Meta
 
+    @staticmethod
+    def setup_eager_loading(queryset, public=False):
+        '''
+        Prefetches everything the serializer touches,
+        so a page of courses is serialized in a constant number of queries
+        '''
+        course_materials = CourseMaterial.objects.all()
+        if not public:
+            course_materials = course_materials.select_related('course_file', 'video', 'quiz').prefetch_related(
+                'video__video_code_snippets',
+                *get_question_lookups('quiz')
+            )
+        # end if
+
+        return queryset.select_related(
+            'partner__user__member',
+            'partner__organization',
+            'assessment',
+        ).prefetch_related(
+            'chapters',
+            Prefetch('chapters__course_materials', queryset=course_materials),
+            *get_question_lookups('assessment')
+        )
+    # end def
+
     def get_thumbnail_url(self, obj):
         request = self.context.get("request")
         if obj.thumbnail and hasattr(obj.thumbnail, 'url'):
@@ -271,8 +331,7 @@ class CourseSerializer(serializers.ModelSerializer):
     # end def
 
     def get_base_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.partner.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.partner.user, context=self.context).data
     # end def
 
     def get_member_enrolled(self, obj):
@@ -283,14 +342,13 @@ class CourseSerializer(serializers.ModelSerializer):
             return None
         # end if
 
-        member = Member.objects.filter(user=user).first()
-        # print(obj)
+        viewer = get_course_viewer(self.context)
+        member = viewer['member']
 
         if member is None:
             return member
         else:
-            enrollment = Enrollment.objects.filter(member=member).filter(course=obj)
-            return enrollment.exists()
+            return obj.id in viewer['enrolled_course_ids']
         # end if-else
     # end def
 
@@ -302,11 +360,12 @@ class CourseSerializer(serializers.ModelSerializer):
             return ChapterSerializer(obj.chapters, many=True, context=self.context).data
         # end if
 
-        partner = Partner.objects.filter(user=user).first()
-        member = Member.objects.filter(user=user).first()
+        viewer = get_course_viewer(self.context)
+        partner = viewer['partner']
+        member = viewer['member']
 
         pro_member = member is not None and member.membership_tier == 'PRO' if obj.pro else True
-        owner = obj.partner == partner
+        owner = obj.partner_id == (partner.id if partner is not None else None)
 
         context = {
             'public': self.context.get('public'),
@@ -333,6 +392,7 @@ class NestedEnrollmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Enrollment
+        list_serializer_class = get_membership_tier_list_serializer('course__partner__user')
         fields = ('progress', 'member', 'course', 'materials_done')
     # end Meta
 # end class
@@ -344,12 +404,12 @@ class MemberEnrollmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Enrollment
+        list_serializer_class = get_membership_tier_list_serializer('member__user', 'course__partner__user')
         fields = ('progress', 'member', 'course', 'materials_done')
     # end Meta
 
     def get_base_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.member.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.member.user, context=self.context).data
     # end def
 # end class
 
@@ -378,12 +438,12 @@ class NestedQuizResultSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = QuizResult
+        list_serializer_class = get_membership_tier_list_serializer('member__user')
         fields = '__all__'
     # end Meta
 
     def get_member(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.member.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.member.user, context=self.context).data
     # end def
 # end class
 
@@ -394,16 +454,16 @@ class CourseReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CourseReview
+        list_serializer_class = get_membership_tier_list_serializer('member__user')
         fields = '__all__'
     # end Meta
 
     def get_base_user(self, obj):
-        request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.member.user, context={'request': request}).data
+        return NestedBaseUserSerializer(obj.member.user, context=self.context).data
     # end def
 
     def get_course_id(self, obj):
-        return obj.course.id
+        return obj.course_id
     # end def
 # end class
 
@@ -426,6 +486,7 @@ class NestedCourseCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CourseComment
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end Meta
 
@@ -478,6 +539,7 @@ class CourseCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CourseComment
+        list_serializer_class = get_membership_tier_list_serializer('user')
         fields = '__all__'
     # end class
 
@@ -1,11 +1,15 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
 from django.dispatch import receiver
 from django.db.models import Avg
 
-from .models import CourseReview, Course, QuizResult, CourseMaterial, Enrollment, Chapter, CourseComment, CourseCommentEngagement
+from .models import CourseReview, Course, QuizResult, CourseMaterial, Enrollment, Chapter, CourseComment, CourseCommentEngagement, Question, QuestionGroup, ShortAnswer, MCQ, MRQ
+from .marks import refresh_question_bank_marks, refresh_quiz_max_marks
+from .search import index_courses
+from .stats import complete_course, uncomplete_course
+from common.models import BaseUser, Partner, Organization
 from notifications.models import Notification, NotificationObject
-from achievements.models import Achievement, MemberAchievement
-from utils.member_utils import get_member_stats
+from notifications.fanout import fan_out_to_enrolled_members
+from achievements.evaluation import evaluate_achievements
 
 
 @receiver(post_save, sender=CourseReview)
@@ -20,40 +24,53 @@ def aggregate_ratings(sender, instance, **kwargs):
 
 @receiver(post_save, sender=QuizResult)
 def update_stats(sender, instance, **kwargs):
-    # update member stats
-    member = instance.member
-    stats = get_member_stats(member.user.id)
-    member.stats = stats
-    member.save()
-
-    # check for new achievements
-    non_achievements = Achievement.objects.exclude(
-        members_achievements__member=member).all()
-
-    for non_achievement in non_achievements:
-        passed = True
-
-        # check through requirements
-        for requirement in non_achievement.achievement_requirements.all():
-            if requirement.stat in stats and stats[requirement.stat] < requirement.experience_point:
-                # print(requirement)
-                passed = False
-                break
-            # end if
-        # end for
-
-        if passed:
-            MemberAchievement(achievement=non_achievement,
-                              member=member).save()
-        # end if
-    # end for
+    # only the first pass of an enrolled course assessment changes member stats
+    if not instance.submitted or not instance.passed or instance.quiz_id is None:
+        return
+    # end if
+
+    course = Course.objects.filter(assessment=instance.quiz_id, enrollments__member=instance.member_id).first()
+    if course is None:
+        return
+    # end if
+
+    completion = complete_course(instance.member_id, course)
+    if completion is not None:
+        evaluate_achievements(completion.member, completion.stats)
+    # end if
+# end def
+
+
+@receiver(post_save, sender=Enrollment)
+def update_enrollment_stats(sender, instance, created, **kwargs):
+    # an assessment passed before enrolling counts once the member enrolls
+    if not created or instance.course_id is None or instance.member_id is None:
+        return
+    # end if
+
+    passed = QuizResult.objects.filter(member=instance.member_id, quiz__course=instance.course_id, submitted=True, passed=True)
+    if not passed.exists():
+        return
+    # end if
+
+    completion = complete_course(instance.member_id, instance.course)
+    if completion is not None:
+        evaluate_achievements(completion.member, completion.stats)
+    # end if
+# end def
+
+
+@receiver(post_delete, sender=Enrollment)
+def remove_enrollment_stats(sender, instance, **kwargs):
+    if instance.course_id is not None and instance.member_id is not None:
+        uncomplete_course(instance.member_id, instance.course_id)
+    # end if
 # end def
 
 
 @receiver(post_save, sender=CourseMaterial)
 def update_course_material(sender, instance, created, **kwargs):
     course = instance.chapter.course
-    enrollments = Enrollment.objects.filter(course=course)
     title = f'Course {course.title} updated!'
 
     if created:
@@ -69,20 +86,13 @@ def update_course_material(sender, instance, created, **kwargs):
     notification.photo = photo
     notification.save()
 
-    for enrollment in enrollments:
-        # print(enrollment)
-        receiver = enrollment.member.user
-        notification_object = NotificationObject(
-            receiver=receiver, notification=notification)
-        notification_object.save()
-    # end for
+    fan_out_to_enrolled_members(notification, [course.id])
 # end def
 
 
 @receiver(post_save, sender=Chapter)
 def update_course_chapter(sender, instance, created, **kwargs):
     course = instance.course
-    enrollments = Enrollment.objects.filter(course=course)
     title = f'Course {course.title} updated!'
 
     if created:
@@ -98,12 +108,7 @@ def update_course_chapter(sender, instance, created, **kwargs):
     notification.photo = photo
     notification.save()
 
-    for enrollment in enrollments:
-        receiver = enrollment.member.user
-        notification_object = NotificationObject(
-            receiver=receiver, notification=notification)
-        notification_object.save()
-    # end for
+    fan_out_to_enrolled_members(notification, [course.id])
 # end def
 
 
@@ -189,23 +194,98 @@ def update_course(sender, instance, created, update_fields, **kwargs):
     partner = instance.partner
 
     if created:
+        # one notification for everyone enrolled in any of the partner's courses
+        course_ids = list(Course.objects.filter(partner=partner).exclude(pk=instance.pk).values_list('id', flat=True))
+        if len(course_ids) == 0:
+            return
+        # end if
+
         title = f'New Course {instance.title} available!'
+        description = f'New Course {instance.title} available by the instructor of your courses!'
         notification_type = 'COURSE'
+        notification = Notification(
+            title=title, description=description, notification_type=notification_type, course=instance)
+        notification.photo = instance.thumbnail
+        notification.save()
 
-        courses = Course.objects.filter(partner=partner)
-        for course in courses:
-            description = f'New Course {instance.title} available by the instructor of {course.title}!'
-            notification = Notification(
-                title=title, description=description, notification_type=notification_type, course=instance)
-            notification.photo = instance.thumbnail
-            notification.save()
-            enrollments = Enrollment.objects.filter(course=course)
-            for enrollment in enrollments:
-                receiver = enrollment.member.user
-                notification_object = NotificationObject(
-                    receiver=receiver, notification=notification)
-                notification_object.save()
-            # end for
-        # end for
+        fan_out_to_enrolled_members(notification, course_ids)
+    # end if
+# end def
+
+
+SEARCH_DOCUMENT_FIELDS = {'title', 'description', 'coding_languages', 'categories', 'partner'}
+
+
+@receiver(post_save, sender=Course)
+def update_course_search_document(sender, instance, update_fields, **kwargs):
+    if update_fields is not None and SEARCH_DOCUMENT_FIELDS.isdisjoint(update_fields):
+        return
     # end if
+
+    index_courses(Course.objects.filter(pk=instance.pk))
+# end def
+
+
+@receiver(post_save, sender=Partner)
+def update_partner_search_documents(sender, instance, **kwargs):
+    index_courses(Course.objects.filter(partner=instance), force=False)
+# end def
+
+
+@receiver(post_save, sender=Organization)
+def update_organization_search_documents(sender, instance, **kwargs):
+    index_courses(Course.objects.filter(partner__organization=instance), force=False)
+# end def
+
+
+@receiver(post_save, sender=BaseUser)
+def update_user_search_documents(sender, instance, update_fields, **kwargs):
+    if update_fields is not None and {'first_name', 'last_name'}.isdisjoint(update_fields):
+        return
+    # end if
+
+    index_courses(Course.objects.filter(partner__user=instance), force=False)
+# end def
+
+
+@receiver(post_save, sender=ShortAnswer)
+@receiver(post_save, sender=MCQ)
+@receiver(post_save, sender=MRQ)
+@receiver(post_delete, sender=ShortAnswer)
+@receiver(post_delete, sender=MCQ)
+@receiver(post_delete, sender=MRQ)
+def update_question_marks(sender, instance, **kwargs):
+    question = Question.objects.filter(pk=instance.question_id).first()
+    if question is not None and question.question_bank_id is not None:
+        refresh_question_bank_marks([question.question_bank_id])
+    # end if
+# end def
+
+
+@receiver(pre_save, sender=Question)
+@receiver(pre_delete, sender=Question)
+def track_question_bank(sender, instance, **kwargs):
+    # the bank stored before this save or delete, so a bank the question leaves is refreshed too
+    if instance._state.adding:
+        instance._previous_question_bank_id = None
+    else:
+        instance._previous_question_bank_id = Question.objects.filter(pk=instance.pk).values_list('question_bank_id', flat=True).first()
+    # end if-else
+# end def
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def update_question_bank_marks(sender, instance, **kwargs):
+    question_bank_ids = {instance.question_bank_id, getattr(instance, '_previous_question_bank_id', None)} - {None}
+    if len(question_bank_ids) > 0:
+        refresh_question_bank_marks(question_bank_ids)
+    # end if
+# end def
+
+
+@receiver(post_save, sender=QuestionGroup)
+@receiver(post_delete, sender=QuestionGroup)
+def update_quiz_max_marks(sender, instance, **kwargs):
+    refresh_quiz_max_marks([instance.quiz_id])
 # end def
@@ -0,0 +1,131 @@
+from django.db import transaction
+from django.db.models import F
+
+from collections import defaultdict
+
+from .models import Course, CourseCompletion, QuizResult
+from common.models import Member, get_default_member_stats
+from common.skills import sync_member_skills
+
+
+def get_course_stats(course):
+    '''
+    Exp points a member earns in each skill for passing the course assessment
+    '''
+    stats = defaultdict(int)
+    for skill in list(course.coding_languages) + list(course.categories):
+        stats[skill] += course.exp_points
+    # end for
+    return dict(stats)
+# end def
+
+
+def complete_course(member_id, course):
+    '''
+    Adds the exp points of a passed course assessment to the member's stats
+    Only the first pass of each course counts, later calls return None
+    Returns the CourseCompletion otherwise, with the updated member
+    '''
+    stats = get_course_stats(course)
+
+    with transaction.atomic():
+        # the member is locked first, as in uncomplete_course and rebuild_member_stats
+        member = Member.objects.select_for_update().get(pk=member_id)
+        completion, created = CourseCompletion.objects.get_or_create(member_id=member_id, course=course, defaults={'stats': stats})
+        if not created:
+            return None
+        # end if
+
+        for skill, exp_points in stats.items():
+            member.stats[skill] = member.stats.get(skill, 0) + exp_points
+        # end for
+        member.save(update_fields=['stats'])
+    # end with
+
+    completion.member = member
+    return completion
+# end def
+
+
+def uncomplete_course(member_id, course_id):
+    '''
+    Takes the exp points of a course completion back off the member's stats, when the member unenrolls
+    Returns the deleted CourseCompletion, None if the course was not completed
+    '''
+    with transaction.atomic():
+        member = Member.objects.select_for_update().filter(pk=member_id).first()
+        completion = CourseCompletion.objects.filter(member_id=member_id, course_id=course_id).first()
+        if member is None or completion is None:
+            return None
+        # end if
+
+        for skill, exp_points in completion.stats.items():
+            member.stats[skill] = max(member.stats.get(skill, 0) - exp_points, 0)
+        # end for
+        member.save(update_fields=['stats'])
+        completion.delete()
+    # end with
+
+    completion.member = member
+    return completion
+# end def
+
+
+def rebuild_member_stats(batch_size=500):
+    '''
+    Recomputes Member.stats and CourseCompletion rows from passed course assessments of enrolled courses
+    Picks up exp points, coding language and category changes of courses passed earlier, run nightly by courses.tasks
+    Members are processed in batches with a constant number of queries each, locked while their batch is rebuilt
+    Returns the number of members rebuilt
+    '''
+    course_stats = {}
+    member_ids = list(Member.objects.order_by('pk').values_list('pk', flat=True))
+
+    for start in range(0, len(member_ids), batch_size):
+        batch = member_ids[start:start + batch_size]
+
+        with transaction.atomic():
+            rebuild_members(batch, course_stats, batch_size)
+        # end with
+    # end for
+    return len(member_ids)
+# end def
+
+
+def rebuild_members(batch, course_stats, batch_size):
+    '''
+    Rebuilds the stats of a batch of member ids, expects to run inside a transaction
+    '''
+    members = list(Member.objects.select_for_update().filter(pk__in=batch).order_by('pk').only('id', 'stats'))
+
+    passed = QuizResult.objects.filter(
+        member__in=batch,
+        submitted=True,
+        passed=True,
+        quiz__course__enrollments__member=F('member')
+    ).values_list('member_id', 'quiz__course_id').distinct().order_by()
+    passed = list(passed)
+
+    missing = set(course_id for member_id, course_id in passed) - set(course_stats)
+    for course in Course.objects.filter(pk__in=missing).only('id', 'exp_points', 'coding_languages', 'categories'):
+        course_stats[course.id] = get_course_stats(course)
+    # end for
+
+    stats = {member.id: get_default_member_stats() for member in members}
+    completions = []
+    for member_id, course_id in passed:
+        for skill, exp_points in course_stats[course_id].items():
+            stats[member_id][skill] = stats[member_id].get(skill, 0) + exp_points
+        # end for
+        completions.append(CourseCompletion(member_id=member_id, course_id=course_id, stats=course_stats[course_id]))
+    # end for
+
+    for member in members:
+        member.stats = stats[member.id]
+    # end for
+
+    CourseCompletion.objects.filter(member__in=batch).delete()
+    CourseCompletion.objects.bulk_create(completions, batch_size=batch_size)
+    Member.objects.bulk_update(members, ['stats'], batch_size=batch_size)
+    sync_member_skills(members)
+# end def
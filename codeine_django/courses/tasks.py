@@ -0,0 +1,25 @@
+from __future__ import absolute_import, unicode_literals
+
+from celery import shared_task
+
+from .models import Course
+from .search import index_courses
+from .stats import rebuild_member_stats
+
+
+@shared_task
+def reindex_course_search():
+    '''
+    Catches search documents missed by signals, e.g. after bulk updates
+    '''
+    return index_courses(Course.objects.all(), force=False)
+# end def
+
+
+@shared_task
+def rebuild_stats():
+    '''
+    Rebuilds member stats from passed assessments, picking up exp points changes of courses
+    '''
+    return rebuild_member_stats()
+# end def
@@ -1,3 +1,394 @@
+from django.apps import apps
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from datetime import timedelta
+from importlib import import_module
+from unittest import mock
+
+from .models import Course, CourseCompletion, CourseReview, CourseSearchDocument, Chapter, CourseMaterial, CourseFile, Video, Enrollment, QuestionBank, Question, MCQ, MRQ, ShortAnswer, Quiz, QuestionGroup, QuizResult, QuizAnswer
+from .tasks import rebuild_stats
+from common.models import BaseUser, Member, MemberSkill, Partner, Organization, PaymentTransaction, MembershipSubscription
+
+
+def create_course(partner, index, **kwargs):
+    '''
+    Published course with an assessment and a chapter of every material type
+    '''
+    fields = {
+        'title': f'Course {index}',
+        'learning_objectives': [],
+        'requirements': [],
+        'description': 'Learn python',
+        'coding_languages': ['PY'],
+        'languages': ['ENG'],
+        'categories': ['BE'],
+        'exp_points': 100,
+        'duration': 3,
+        'partner': partner,
+        'is_published': True,
+        'published_date': timezone.now() - timedelta(days=index),
+    }
+    fields.update(kwargs)
+    course = Course.objects.create(**fields)
+
+    question_bank = QuestionBank.objects.create(label=f'Bank {index}', course=course)
+    question = Question.objects.create(title='MCQ', order=0, question_bank=question_bank)
+    MCQ.objects.create(question=question, options=['a', 'b'], correct_answer='a', marks=2)
+    question = Question.objects.create(title='MRQ', order=1, question_bank=question_bank)
+    MRQ.objects.create(question=question, options=['a', 'b'], correct_answer=['a'], marks=3)
+    question = Question.objects.create(title='Short answer', order=2, question_bank=question_bank)
+    ShortAnswer.objects.create(question=question, keywords=['python'], marks=1)
+
+    quiz = Quiz.objects.create(course=course, passing_marks=3)
+    QuestionGroup.objects.create(quiz=quiz, question_bank=question_bank, count=3)
+
+    chapter = Chapter.objects.create(title='Chapter', order=0, course=course)
+    course_material = CourseMaterial.objects.create(title='File', material_type='FILE', order=0, chapter=chapter)
+    CourseFile.objects.create(course_material=course_material)
+    course_material = CourseMaterial.objects.create(title='Video', material_type='VIDEO', order=1, chapter=chapter)
+    Video.objects.create(course_material=course_material, video_url='https://codeine.com')
+    return course
+# end def
+
+
+class CourseTestCase(TestCase):
+
+    def setUp(self):
+        organization = Organization.objects.create(organization_name='Codeine')
+        user = BaseUser.objects.create_user('partner@codeine.com', 'password', first_name='Partner')
+        self.partner = Partner.objects.create(user=user, organization=organization)
+        user = BaseUser.objects.create_user('member@codeine.com', 'password', first_name='Member')
+        self.member = Member.objects.create(user=user, unique_id='member')
+        self.client = APIClient()
+    # end def
+
+    def count_queries(self, url, user=None):
+        # a fresh user per request, related lookups are cached on the instance
+        if user is not None:
+            user = BaseUser.objects.get(pk=user.pk)
+        # end if
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        # end with
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+    # end def
+# end class
+
+
+class CourseListTest(CourseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for index in range(12):
+            course = create_course(self.partner, index, pro=index % 2 == 1)
+            if index % 3 == 0:
+                Enrollment.objects.create(course=course, member=self.member, progress=0)
+            # end if
+        # end for
+    # end def
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        for user in (None, self.member.user, self.partner.user):
+            response, small_page = self.count_queries('/courses?pageSize=5', user)
+            self.assertEqual(len(response.json()['results']), 5)
+
+            response, large_page = self.count_queries('/courses?pageSize=50', user)
+            self.assertEqual(len(response.json()['results']), 12)
+
+            self.assertEqual(small_page, large_page)
+        # end for
+    # end def
+# end class
+
+
+class CourseListParamsTest(CourseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        titles = ['Python', 'Python basics', 'Python for data', 'Advanced python', 'Java', 'Intro to python']
+        for index, title in enumerate(titles):
+            create_course(self.partner, index, title=title, description='A course' if index % 2 else 'A python course')
+        # end for
+    # end def
+
+    def test_sort_params_are_whitelisted(self):
+        self.assertEqual(self.client.get('/courses?sortRating=bogus').status_code, 400)
+        self.assertEqual(self.client.get('/courses?sortDate=title').status_code, 400)
+        self.assertEqual(self.client.get('/courses?sortRating=-rating').status_code, 200)
+        self.assertEqual(self.client.get('/courses?sortDate=published_date').status_code, 200)
+    # end def
+
+    def test_malformed_cursor_is_rejected(self):
+        for cursor in ('eyJ2IjogMSwgInIiOiAxfQ==', 'bm90IGpzb24=', '!!!'):
+            self.assertEqual(self.client.get(f'/courses?cursor={cursor}').status_code, 400)
+        # end for
+    # end def
+
+    def test_cursor_pages_keep_search_rank(self):
+        ranked = [row['id'] for row in self.client.get('/courses?search=python&pageSize=50').json()['results']]
+        by_date = [row['id'] for row in self.client.get('/courses?search=python&sortDate=published_date&pageSize=50').json()['results']]
+        self.assertEqual(len(ranked), 6)
+        self.assertNotEqual(ranked, by_date)
+
+        paged = []
+        url = '/courses?search=python&pageSize=2&cursor='
+        while url is not None:
+            data = self.client.get(url).json()
+            paged += [row['id'] for row in data['results']]
+            url = data['next']
+        # end while
+        self.assertEqual(paged, ranked)
+    # end def
+# end class
+
+
+class CourseSearchLimitTest(CourseTestCase):
+
+    def test_filters_apply_before_truncating(self):
+        for index in range(3):
+            create_course(self.partner, index, title=f'Python {index}')
+        # end for
+        javascript = [create_course(self.partner, index, title=f'Web {index}', coding_languages=['JS']).id for index in range(3, 5)]
+
+        # the top ranked results are python titles, all filtered out by the coding language
+        with mock.patch('courses.search.MAX_SEARCH_RESULTS', 2):
+            results = self.client.get('/courses?search=python&coding_language=JS').json()['results']
+        # end with
+        self.assertEqual({row['id'] for row in results}, {str(course_id) for course_id in javascript})
+    # end def
+# end class
+
+class CourseSearchBackfillTest(CourseTestCase):
+
+    def test_backfill_indexes_courses_without_documents(self):
+        courses = [create_course(self.partner, index, title=f'Rust {index}') for index in range(3)]
+        CourseSearchDocument.objects.filter(course__in=courses[:2]).delete()
+        self.assertEqual(self.client.get('/courses?search=rust').json()['count'], 1)
+
+        migration = import_module('courses.migrations.0009_backfill_course_search_documents')
+        migration.create_search_documents(apps, None, batch_size=1)
+
+        self.assertEqual(CourseSearchDocument.objects.filter(course__in=courses).count(), 3)
+        self.assertEqual(self.client.get('/courses?search=rust').json()['count'], 3)
+    # end def
+# end class
+
+
+class QuizSubmissionTest(CourseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = create_course(self.partner, 0)
+        Enrollment.objects.create(course=self.course, member=self.member, progress=0)
+        self.client.force_authenticate(self.member.user)
+    # end def
+
+    def submit(self, responses):
+        quiz_result = QuizResult.objects.create(member=self.member, quiz=self.course.assessment)
+        for question in Question.objects.filter(question_bank__course=self.course):
+            response, multiple = responses.get(question.title, ('', []))
+            QuizAnswer.objects.create(quiz_result=quiz_result, question=question, response=response, responses=multiple)
+        # end for
+
+        response = self.client.patch(f'/quiz-results/{quiz_result.id}/submit')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+    # end def
+
+    def test_scores_from_question_marks(self):
+        # the marks cached on the bank are not read when grading
+        QuestionBank.objects.filter(course=self.course).update(question_marks={})
+
+        data = self.submit({'MCQ': ('a', None), 'MRQ': (None, ['a'])})
+        self.assertEqual(float(data['score']), 5)
+        self.assertTrue(data['passed'])
+        self.assertEqual(Enrollment.objects.get(course=self.course, member=self.member).progress, 100)
+    # end def
+
+    def test_passing_marks(self):
+        data = self.submit({'MCQ': ('b', None), 'Short answer': ('python', None)})
+        self.assertEqual(float(data['score']), 1)
+        self.assertFalse(data['passed'])
+
+        data = self.submit({'MRQ': (None, ['a'])})
+        self.assertEqual(float(data['score']), 3)
+        self.assertTrue(data['passed'])
+    # end def
+# end class
+
+
+class QuestionBankMarksTest(CourseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = create_course(self.partner, 0)
+        self.old_bank = QuestionBank.objects.get(course=self.course)
+        self.new_bank = QuestionBank.objects.create(label='New bank', course=self.course)
+        course_material = CourseMaterial.objects.create(title='Quiz', material_type='QUIZ', order=2, chapter=Chapter.objects.get(course=self.course))
+        self.quiz = Quiz.objects.create(course_material=course_material, passing_marks=0)
+        QuestionGroup.objects.create(quiz=self.quiz, question_bank=self.new_bank, count=3)
+        self.question = Question.objects.get(question_bank=self.old_bank, title='MRQ')
+    # end def
+
+    def assertMarks(self, old_marks, new_marks):
+        self.assertEqual(sum(QuestionBank.objects.get(pk=self.old_bank.pk).question_marks.values()), old_marks)
+        self.assertEqual(Quiz.objects.get(pk=self.course.assessment.pk).max_marks, old_marks)
+        self.assertEqual(sum(QuestionBank.objects.get(pk=self.new_bank.pk).question_marks.values()), new_marks)
+        self.assertEqual(Quiz.objects.get(pk=self.quiz.pk).max_marks, new_marks)
+    # end def
+
+    def test_moving_a_question_refreshes_both_banks(self):
+        self.assertMarks(6, 0)
+
+        self.question.question_bank = self.new_bank
+        self.question.save()
+        self.assertMarks(3, 3)
+    # end def
+
+    def test_deleting_a_question_refreshes_its_stored_bank(self):
+        self.question.question_bank = self.new_bank
+        self.question.delete()
+        self.assertMarks(3, 0)
+    # end def
+# end class
+
+class MemberStatsTest(CourseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = create_course(self.partner, 0)
+        self.client.force_authenticate(self.member.user)
+    # end def
+
+    def pass_assessment(self):
+        return QuizResult.objects.create(member=self.member, quiz=self.course.assessment, submitted=True, passed=True)
+    # end def
+
+    def assertPoints(self, points):
+        member = Member.objects.get(pk=self.member.pk)
+        self.assertEqual(member.stats['PY'], points)
+        self.assertEqual(member.stats['BE'], points)
+        self.assertEqual(MemberSkill.objects.get(member=member, skill='PY').points, points)
+    # end def
+
+    def test_unenroll_takes_back_exp_points(self):
+        self.assertEqual(self.client.post(f'/courses/{self.course.id}/enrollments').status_code, 200)
+        self.pass_assessment()
+        self.assertPoints(100)
+
+        self.assertEqual(self.client.delete(f'/courses/{self.course.id}/enrollments').status_code, 200)
+        self.assertPoints(0)
+        self.assertFalse(CourseCompletion.objects.filter(member=self.member).exists())
+    # end def
+
+    def test_assessment_passed_before_enrolling_counts_once(self):
+        self.pass_assessment()
+        self.assertPoints(0)
+
+        self.assertEqual(self.client.post(f'/courses/{self.course.id}/enrollments').status_code, 200)
+        self.assertPoints(100)
+
+        self.pass_assessment()
+        Enrollment.objects.get(course=self.course, member=self.member).save()
+        self.assertPoints(100)
+    # end def
+
+    def test_rebuild_picks_up_exp_points_changes(self):
+        Enrollment.objects.create(course=self.course, member=self.member, progress=0)
+        self.pass_assessment()
+        Course.objects.filter(pk=self.course.pk).update(exp_points=250)
+        self.assertPoints(100)
+
+        rebuild_stats()
+        self.assertPoints(250)
+        self.assertEqual(CourseCompletion.objects.get(member=self.member).stats, {'PY': 250, 'BE': 250})
+    # end def
+# end class
+
+
+class CourseReviewListTest(CourseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = create_course(self.partner, 0)
+    # end def
+
+    def add_reviews(self, start, end):
+        for index in range(start, end):
+            user = BaseUser.objects.create_user(f'reviewer{index}@codeine.com', 'password')
+            member = Member.objects.create(user=user, unique_id=f'reviewer{index}')
+            CourseReview.objects.create(course=self.course, member=member, rating=5)
+
+            payment_transaction = PaymentTransaction.objects.create(payment_amount=5, payment_status='COMPLETED', payment_type='VISA')
+            MembershipSubscription.objects.create(payment_transaction=payment_transaction, expiry_date=timezone.now() + timedelta(days=30), member=member)
+        # end for
+    # end def
+
+    def test_reviewer_tiers_do_not_add_queries_per_review(self):
+        url = f'/courses/{self.course.id}/reviews'
+        self.add_reviews(0, 2)
+        response, few = self.count_queries(url)
+
+        self.add_reviews(2, 8)
+        response, many = self.count_queries(url)
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.json()), 8)
+        self.assertEqual(set(row['member']['member']['membership_tier'] for row in response.json()), {'PRO'})
+    # end def
+# end class
+
+
+class QuizAttemptTest(CourseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = create_course(self.partner, 0)
+        self.quiz = self.course.assessment
+        Enrollment.objects.create(course=self.course, member=self.member, progress=0)
+    # end def
+
+    def start_attempt(self):
+        self.client.force_authenticate(BaseUser.objects.get(pk=self.member.user_id))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(f'/quiz/{self.quiz.id}/results')
+        # end with
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context.captured_queries)
+    # end def
+
+    def test_attempt_has_the_questions_the_quiz_lists(self):
+        # the group asks for more questions than its bank has
+        QuestionGroup.objects.filter(quiz=self.quiz).update(count=5)
+
+        data, queries = self.start_attempt()
+        answered = [quiz_answer['question'] for quiz_answer in data['quiz_answers']]
+        self.assertEqual(len(answered), 3)
+
+        response = self.client.get(f'/courses/{self.course.id}')
+        self.assertEqual(response.status_code, 200)
+        listed = [question['id'] for question in response.json()['assessment']['questions']]
+        self.assertEqual(sorted(listed), sorted(answered))
+
+        # an ongoing attempt is resumed
+        response = self.client.post(f'/quiz/{self.quiz.id}/results')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['id'], data['id'])
+    # end def
+
+    def test_query_count_does_not_grow_with_groups(self):
+        data, one_group = self.start_attempt()
+        QuizResult.objects.all().delete()
+
+        other_bank = QuestionBank.objects.get(course=create_course(self.partner, 1))
+        QuestionGroup.objects.create(quiz=self.quiz, question_bank=other_bank, count=2, order=1)
+        data, two_groups = self.start_attempt()
+        self.assertEqual(len(data['quiz_answers']), 5)
+        self.assertEqual(one_group, two_groups)
+    # end def
+# end class
@@ -5,7 +5,6 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
 
@@ -13,6 +12,8 @@ import json
 
 from .models import Course, Quiz, Chapter, CourseMaterial, CourseFile, Video
 from .serializers import CourseSerializer, QuizSerializer
+from .search import search_courses
+from utils.pagination import paginate, get_sort, get_keyset_ordering
 from common.models import Partner
 from common.permissions import IsPartnerOrReadOnly, IsPartnerOnly
 from notifications.models import Notification, NotificationObject
@@ -29,25 +30,19 @@ def course_view(request):
         try:
             # extract query params
             search = request.query_params.get('search', None)
-            date_sort = request.query_params.get('sortDate', None)
-            rating_sort = request.query_params.get('sortRating', None)
+            date_sort = get_sort(request, 'sortDate', ('published_date',))
+            rating_sort = get_sort(request, 'sortRating', ('rating',))
             coding_language = request.query_params.get('coding_language', None)
 
-            # get pagination params from request, default is (10, 1)
-            page_size = int(request.query_params.get('pageSize', 1000))
-
             courses = Course.objects.filter(is_deleted=False).filter(is_available=True).filter(is_published=True)  # implicit requirements for public view
 
+            if coding_language is not None:
+                courses = courses.filter(coding_languages__icontains=coding_language)
+            # end if
+
+            # searched last, so that results are truncated after every other filter
             if search is not None:
-                courses = courses.filter(
-                    Q(title__icontains=search) |
-                    Q(description__icontains=search) |
-                    Q(coding_languages__icontains=search) |
-                    Q(categories__icontains=search) |
-                    Q(partner__organization__organization_name__icontains=search) |
-                    Q(partner__user__first_name__icontains=search) |
-                    Q(partner__user__last_name__icontains=search)
-                )
+                courses = search_courses(courses.all(), search)
             # end if
 
             if date_sort is not None:
@@ -58,18 +53,12 @@ def course_view(request):
                 courses = courses.order_by(rating_sort)
             # end if
 
-            if coding_language is not None:
-                courses = courses.filter(coding_languages__icontains=coding_language)
-            # end if
+            courses = CourseSerializer.setup_eager_loading(courses.all(), public=True)
+            # search results page on their rank unless another sort is asked for
+            default_ordering = ('-search_rank', 'id') if search is not None else ('published_date', 'id')
+            ordering = get_keyset_ordering(rating_sort or date_sort, default=default_ordering)
 
-            # paginator configs
-            paginator = PageNumberPagination()
-            paginator.page_size = page_size
-
-            result_page = paginator.paginate_queryset(courses.all(), request)
-            serializer = CourseSerializer(result_page, many=True, context={"request": request, 'public': True})
-
-            return paginator.get_paginated_response(serializer.data)
+            return paginate(request, courses, CourseSerializer, {"request": request, 'public': True}, ordering, always_paginate=True)
         except (ValueError) as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
         # end try-except
@@ -178,7 +167,7 @@ def single_course_view(request, pk):
     '''
     if request.method == 'GET':
         try:
-            course = Course.objects.get(pk=pk)
+            course = CourseSerializer.setup_eager_loading(Course.objects, public=True).get(pk=pk)
             return Response(CourseSerializer(course, context={'request': request, 'public': True}).data, status=status.HTTP_200_OK)
         except Course.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
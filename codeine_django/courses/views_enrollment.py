@@ -1,4 +1,5 @@
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.db.models import Q, Sum
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework import status
@@ -7,9 +8,11 @@ from rest_framework.permissions import IsAuthenticated
 
 from .models import Course, Enrollment, Chapter, CourseMaterial
 from .serializers import EnrollmentSerializer, NestedEnrollmentSerializer, MemberEnrollmentSerializer
+from .stats import uncomplete_course
 from common.models import Member, Partner
 from common.permissions import IsMemberOnly, IsPartnerOnly
 from common.serializers import NestedBaseUserSerializer, MemberSerializer
+from utils.pagination import paginate
 
 
 @api_view(['POST', 'DELETE', 'PATCH'])
@@ -55,9 +58,14 @@ def course_enrollment_views(request, course_id):
             member = Member.objects.get(user=user)
             course = Course.objects.get(pk=course_id)
 
-            enrollment = Enrollment.objects.filter(course=course).get(member=member)
-            enrollment.course = None
-            enrollment.save()
+            with transaction.atomic():
+                enrollment = Enrollment.objects.filter(course=course).get(member=member)
+                enrollment.course = None
+                enrollment.save()
+
+                # exp points of the course assessment only count while enrolled
+                uncomplete_course(member.id, course.id)
+            # end with
 
             serializer = EnrollmentSerializer(enrollment)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -134,8 +142,8 @@ def enrollment_views(request):
                 enrollments = enrollments.filter(course__partner=partner)
             # end if-else
 
-            serializer = NestedEnrollmentSerializer(enrollments.all(), many=True, context={'request': request, 'public': True})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            context = {'request': request, 'public': True}
+            return paginate(request, enrollments.all(), NestedEnrollmentSerializer, context, ('-date_created', '-id'))
         except ObjectDoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
         # end try-except
@@ -169,8 +177,7 @@ def partner_enrollments_view(request):
                 enrollments = enrollments.filter(course__id=course_id)
             # end ifs
 
-            serializer = MemberEnrollmentSerializer(enrollments.all(), many=True, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return paginate(request, enrollments.all(), MemberEnrollmentSerializer, {"request": request}, ('-date_created', '-id'))
         except ObjectDoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
         # end try-except
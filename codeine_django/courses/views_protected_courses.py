@@ -4,7 +4,6 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import (
     IsAuthenticated,
@@ -16,6 +15,8 @@ import json
 
 from .models import Course, Quiz, Enrollment
 from .serializers import CourseSerializer, QuizSerializer
+from .search import search_courses
+from utils.pagination import paginate, get_sort, get_keyset_ordering
 from common.models import Partner, Member, BaseUser
 
 
@@ -31,33 +32,16 @@ def course_view(request):
         try:
             # extract query params
             search = request.query_params.get('search', None)
-            date_sort = request.query_params.get('sortDate', None)
-            rating_sort = request.query_params.get('sortRating', None)
+            date_sort = get_sort(request, 'sortDate', ('published_date',))
+            rating_sort = get_sort(request, 'sortRating', ('rating',))
             partner_id = request.query_params.get('partnerId', None)
             coding_language = request.query_params.get('coding_language', None)
 
-            # get pagination params from request, default is (10, 1)
-            page_size = int(request.query_params.get('pageSize', 10))
-
             courses = Course.objects
 
-            if search is not None:
-                courses = courses.filter(
-                    Q(title__icontains=search) |
-                    Q(description__icontains=search) |
-                    Q(coding_languages__icontains=search) |
-                    Q(categories__icontains=search) |
-                    Q(partner__organization__organization_name__icontains=search) |
-                    Q(partner__user__first_name__icontains=search) |
-                    Q(partner__user__last_name__icontains=search)
-                )
             if partner_id is not None:
                 user = BaseUser.objects.get(pk=partner_id)
                 courses = courses.filter(partner=user.partner)  # get partner courses
-            if date_sort is not None:
-                courses = courses.order_by(date_sort)
-            if rating_sort is not None:
-                courses = courses.order_by(rating_sort)
             if coding_language is not None:
                 courses = courses.filter(coding_languages__icontains=coding_language)
             # end if
@@ -74,14 +58,21 @@ def course_view(request):
                 courses = courses.filter(partner=partner)
             # end if-else
 
-            # paginator configs
-            paginator = PageNumberPagination()
-            paginator.page_size = page_size
+            # searched last, so that results are truncated after every other filter
+            if search is not None:
+                courses = search_courses(courses.all(), search)
+            if date_sort is not None:
+                courses = courses.order_by(date_sort)
+            if rating_sort is not None:
+                courses = courses.order_by(rating_sort)
+            # end if
 
-            result_page = paginator.paginate_queryset(courses.all(), request)
-            serializer = CourseSerializer(result_page, many=True, context={"request": request})
+            courses = CourseSerializer.setup_eager_loading(courses.all())
+            # search results page on their rank unless another sort is asked for
+            default_ordering = ('-search_rank', 'id') if search is not None else ('published_date', 'id')
+            ordering = get_keyset_ordering(rating_sort or date_sort, default=default_ordering)
 
-            return paginator.get_paginated_response(serializer.data)
+            return paginate(request, courses, CourseSerializer, {"request": request}, ordering, always_paginate=True)
         except (ValueError) as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
         except ObjectDoesNotExist:
@@ -101,7 +92,7 @@ def single_course_view(request, course_id):
     '''
     if request.method == 'GET':
         try:
-            course = Course.objects.get(pk=course_id)
+            course = CourseSerializer.setup_eager_loading(Course.objects).get(pk=course_id)
             serializer = CourseSerializer(course, context={'request': request})
 
             return Response(serializer.data, status=status.HTTP_200_OK)
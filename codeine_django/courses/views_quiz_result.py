@@ -1,7 +1,7 @@
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import transaction
 from django.db.utils import IntegrityError
-from django.db.models import Q, Sum
+from django.db.models import Q, Sum, prefetch_related_objects
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework import status
 from rest_framework.response import Response
@@ -10,6 +10,7 @@ from rest_framework.permissions import IsAuthenticated
 import random
 
 from .models import Quiz, QuizResult, QuizAnswer, Enrollment, Question, ShortAnswer, MRQ, MCQ, CourseMaterial
+from .sampling import sample_questions
 from .serializers import QuizResultSerializer, NestedQuizResultSerializer
 from common.models import Member, Partner
 from common.permissions import IsMemberOnly
@@ -42,32 +43,26 @@ def quiz_result_views(request, quiz_id):
                 Q(quiz=quiz) &
                 Q(member=member) &
                 Q(submitted=False)
-            ).first()
+            ).prefetch_related('quiz_answers').first()
             if quiz_result is not None:
-                # print(quiz_result)
                 return Response(QuizResultSerializer(quiz_result).data, status=status.HTTP_202_ACCEPTED)
             # end if
 
-            quiz_result = QuizResult(member=member, quiz=quiz)
-            quiz_result.save()
-
-            random.seed(int(member.id))
-            questions = []
-
-            for question_group in quiz.question_groups.all():
-                tmp = random.sample(list(question_group.question_bank.questions.all()), k=question_group.count)
-                questions += tmp
-            # end for
+            # questions of every bank the quiz draws from, in one query
+            question_groups = [question_group for question_group in quiz.question_groups.all() if question_group.question_bank_id is not None]
+            questions = Question.objects.filter(
+                question_bank__in=[question_group.question_bank_id for question_group in question_groups]
+            ).only('id', 'order', 'question_bank_id')
+            sampled_ids = [question.id for question in sample_questions(question_groups, questions, member.id)]
 
-            for qn in questions:
-                qa = QuizAnswer(
-                    quiz_result=quiz_result,
-                    question=qn,
-                    response=None,
-                    responses=None
-                )
-                qa.save()
-            # end for
+            with transaction.atomic():
+                # unsubmitted results are skipped by the update_stats signal
+                quiz_result = QuizResult.objects.create(member=member, quiz=quiz)
+                QuizAnswer.objects.bulk_create([
+                    QuizAnswer(quiz_result=quiz_result, question_id=question_id, response=None, responses=None) for question_id in sampled_ids
+                ])
+            # end with
+            prefetch_related_objects([quiz_result], 'quiz_answers')
 
             return Response(QuizResultSerializer(quiz_result).data, status=status.HTTP_200_OK)
         except ObjectDoesNotExist as e:
@@ -166,12 +161,9 @@ def sumbit_quiz_result_view(request, quiz_result_id):
             quiz = quiz_result.quiz
 
             with transaction.atomic():
-                # total_marks = ShortAnswer.objects.filter(question__question__bank__question_group__quiz=quiz).aggregate(Sum('marks'))['marks__sum'] if ShortAnswer.objects.filter(question__quiz=quiz).exists() else 0
-                # total_marks += MRQ.objects.filter(question__quiz=quiz).aggregate(Sum('marks'))['marks__sum'] if MRQ.objects.filter(question__quiz=quiz).exists() else 0
-                # total_marks += MCQ.objects.filter(question__quiz=quiz).aggregate(Sum('marks'))['marks__sum'] if MCQ.objects.filter(question__quiz=quiz).exists() else 0
                 score = 0
 
-                for answer in quiz_answers.all():
+                for answer in quiz_answers.select_related('question__shortanswer', 'question__mcq', 'question__mrq'):
                     question = answer.question
 
                     # evaluate short answer questions
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.3 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpdesk', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['timestamp', 'id'], name='ticket_timestamp_keyset_idx'),
+        ),
+    ]
@@ -73,6 +73,9 @@ class Ticket(models.Model):
 
     class Meta:
         ordering = ['-timestamp', 'ticket_status', 'ticket_type']
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='ticket_timestamp_keyset_idx'),
+        ]
     # end class
 # end class
 
@@ -19,6 +19,7 @@ from community.models import Article, CodeReview
 from industry_projects.models import IndustryProject
 from consultations.models import ConsultationSlot
 from notifications.models import Notification, NotificationObject
+from utils.pagination import paginate
 
 import json
 
@@ -88,9 +89,7 @@ def ticket_view(request):
             # end if
         # end if
 
-        serializer = TicketSerializer(
-            tickets.all(), many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginate(request, tickets.all(), TicketSerializer, {"request": request}, ('-timestamp', '-id'))
     # end if
 
     '''
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.db import transaction
+from celery.exceptions import OperationalError
+
+from datetime import timedelta
+
+from courses.models import Enrollment
+from .models import Notification, NotificationObject
+from .unread import adjust_unread_count
+
+NOTIFICATION_BATCH_SIZE = 1000
+
+
+def get_enrolled_user_ids(course_ids):
+    '''
+    Distinct user ids of members enrolled in any of the courses, in one query
+    '''
+    return Enrollment.objects.filter(course__in=course_ids).values_list('member__user_id', flat=True).distinct()
+# end def
+
+
+def get_recent_receiver_ids(notification, window=None):
+    '''
+    Users who already got the same notification (title, description, type, course and slot) within the window before it
+    Repeated events, e.g. a chapter saved several times in a row, reach each user once per window
+    '''
+    if window is None:
+        window = settings.NOTIFICATION_DEDUP_WINDOW
+    # end if
+
+    duplicates = Notification.objects.filter(
+        title=notification.title,
+        description=notification.description,
+        notification_type=notification.notification_type,
+        course=notification.course_id,
+        consultation_slot=notification.consultation_slot_id,
+        timestamp__gte=notification.timestamp - timedelta(seconds=window),
+        timestamp__lte=notification.timestamp
+    ).exclude(pk=notification.pk)
+    return NotificationObject.objects.filter(notification__in=duplicates).values('receiver')
+# end def
+
+
+def create_batch(notification_objects):
+    # bulk_create skips post_save, so unread counts are bumped here
+    NotificationObject.objects.bulk_create(notification_objects)
+    adjust_unread_count([notification_object.receiver_id for notification_object in notification_objects], 1)
+    return len(notification_objects)
+# end def
+
+
+def fan_out(notification_id, receiver_ids, batch_size=NOTIFICATION_BATCH_SIZE):
+    '''
+    Creates one NotificationObject per receiver with chunked bulk inserts
+    Returns the number of objects created
+    '''
+    created = 0
+    batch = []
+    for receiver_id in receiver_ids:
+        batch.append(NotificationObject(receiver_id=receiver_id, notification_id=notification_id))
+        if len(batch) >= batch_size:
+            created += create_batch(batch)
+            batch = []
+        # end if
+    # end for
+
+    if len(batch) > 0:
+        created += create_batch(batch)
+    # end if
+    return created
+# end def
+
+
+def fan_out_to_enrolled_members(notification, course_ids):
+    '''
+    Sends notification to every member enrolled in the courses, except those who got the same one within NOTIFICATION_DEDUP_WINDOW
+    Runs through celery after the current transaction commits when NOTIFICATION_FANOUT_DEFERRED is set,
+    inline when it is not set or the broker is unreachable
+    '''
+    from .tasks import notify_enrolled_members
+
+    notification_id = str(notification.id)
+    course_ids = [str(course_id) for course_id in course_ids]
+
+    def enqueue():
+        try:
+            notify_enrolled_members.apply_async(args=(notification_id, course_ids))
+        except OperationalError:
+            notify_enrolled_members(notification_id, course_ids)
+        # end try-except
+    # end def
+
+    if getattr(settings, 'NOTIFICATION_FANOUT_DEFERRED', False):
+        transaction.on_commit(enqueue)
+    else:
+        notify_enrolled_members(notification_id, course_ids)
+    # end if-else
+# end def
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from notifications.retention import get_retention_cutoff, get_table_stats
+
+
+class Command(BaseCommand):
+    help = 'Reports the size of the notification tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Retention period to report archivable rows for')
+    # end def
+
+    def handle(self, *args, **options):
+        cutoff = get_retention_cutoff(options['days'])
+        self.stdout.write(f'Notification tables, archiving read objects before {cutoff:%Y-%m-%d}')
+        for key, value in get_table_stats(cutoff).items():
+            self.stdout.write(f'{key}: {self.style.SUCCESS(value)}')
+        # end for
+    # end def
+# end class
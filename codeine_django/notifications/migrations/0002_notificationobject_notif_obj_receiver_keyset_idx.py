@@ -0,0 +1,17 @@
+# Generated by Django 3.2.3 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notificationobject',
+            index=models.Index(fields=['receiver', 'timestamp', 'id'], name='notif_obj_receiver_keyset_idx'),
+        ),
+    ]
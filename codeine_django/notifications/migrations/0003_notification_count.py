@@ -0,0 +1,22 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+        ('notifications', '0002_notificationobject_notif_obj_receiver_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCount',
+            fields=[
+                ('receiver', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_count', serialize=False, to='common.baseuser')),
+                ('num_unread', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
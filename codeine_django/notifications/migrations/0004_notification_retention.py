@@ -0,0 +1,42 @@
+# Generated by Django 3.2.3 on 2026-10-18 11:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0003_notification_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotificationObject',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('timestamp', models.DateTimeField()),
+                ('date_archived', models.DateTimeField(auto_now_add=True)),
+                ('title', models.CharField(max_length=255)),
+                ('notification_type', models.TextField(choices=[('GENERAL', 'General'), ('COURSE', 'Course'), ('ARTICLE', 'Article'), ('CODE_REVIEW', 'Code Review'), ('PAYMENT', 'Payment'), ('CONSULTATION', 'Consultation'), ('HELPDESK', 'Helpdesk'), ('INDUSTRY_PROJECTS', 'Industry Project')])),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notificationobject',
+            index=models.Index(fields=['receiver', 'is_read', 'timestamp'], name='notif_obj_receiver_read_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivednotificationobject',
+            name='receiver',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivednotificationobject',
+            index=models.Index(fields=['receiver', 'timestamp'], name='archived_notif_receiver_idx'),
+        ),
+    ]
@@ -79,5 +79,50 @@ class NotificationObject(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['receiver', 'timestamp', 'id'], name='notif_obj_receiver_keyset_idx'),
+            models.Index(fields=['receiver', 'is_read', 'timestamp'], name='notif_obj_receiver_read_idx'),
+        ]
+    # end Meta
+# end class
+
+
+class NotificationCount(models.Model):
+    '''
+    Materialized number of unread notification objects per receiver, see notifications.unread
+    '''
+    receiver = models.OneToOneField(
+        'common.BaseUser', related_name='notification_count', on_delete=models.CASCADE, primary_key=True)
+    num_unread = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'Notification Count: {self.receiver_id}'
+    # end def
+# end class
+
+
+class ArchivedNotificationObject(models.Model):
+    '''
+    Compact copy of a read notification object past the retention period, see notifications.tasks.archive_notifications
+    '''
+    id = models.UUIDField(primary_key=True, editable=False)
+    timestamp = models.DateTimeField()
+    date_archived = models.DateTimeField(auto_now_add=True)
+    title = models.CharField(max_length=255)
+    notification_type = models.TextField(choices=Notification.NOTIFICATION_TYPES)
+
+    # ref
+    receiver = models.ForeignKey(
+        'common.BaseUser', related_name='archived_notifications', on_delete=models.CASCADE, blank=True, null=True)
+
+    def __str__(self):
+        return f'Archived Notification Object: {self.id}'
+    # end def
+
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['receiver', 'timestamp'], name='archived_notif_receiver_idx'),
+        ]
     # end Meta
 # end class
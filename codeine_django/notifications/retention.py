@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from datetime import timedelta
+
+from .models import Notification, NotificationObject, ArchivedNotificationObject
+
+RETENTION_BATCH_SIZE = 1000
+
+
+def get_retention_cutoff(days=None):
+    if days is None:
+        days = settings.NOTIFICATION_RETENTION_DAYS
+    # end if
+    return timezone.now() - timedelta(days=days)
+# end def
+
+
+def archive_read_notifications(cutoff, batch_size=RETENTION_BATCH_SIZE):
+    '''
+    Moves read notification objects older than cutoff into ArchivedNotificationObject, one batch per transaction
+    Returns the number of objects archived
+    '''
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                NotificationObject.objects
+                .filter(is_read=True, timestamp__lt=cutoff)
+                .order_by('timestamp')
+                .values('id', 'timestamp', 'receiver_id', 'notification__title', 'notification__notification_type')[:batch_size]
+            )
+            if len(rows) == 0:
+                break
+            # end if
+
+            ArchivedNotificationObject.objects.bulk_create([
+                ArchivedNotificationObject(
+                    id=row['id'],
+                    timestamp=row['timestamp'],
+                    receiver_id=row['receiver_id'],
+                    title=row['notification__title'],
+                    notification_type=row['notification__notification_type']
+                ) for row in rows
+            ], ignore_conflicts=True)
+            NotificationObject.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        # end with
+
+        archived += len(rows)
+    # end while
+    return archived
+# end def
+
+
+def delete_orphan_notifications(cutoff):
+    '''
+    Deletes notifications older than cutoff that no longer have any notification objects
+    Recent ones are kept, their fan out may still be running
+    '''
+    deleted, _ = Notification.objects.filter(timestamp__lt=cutoff, notification_objects__isnull=True).delete()
+    return deleted
+# end def
+
+
+def get_table_stats(cutoff):
+    '''
+    Row counts of the notification tables, with on disk sizes on postgres
+    '''
+    stats = {
+        'notifications': Notification.objects.count(),
+        'orphan_notifications': Notification.objects.filter(notification_objects__isnull=True).count(),
+        'notification_objects': NotificationObject.objects.count(),
+        'unread_notification_objects': NotificationObject.objects.filter(is_read=False).count(),
+        'archivable_notification_objects': NotificationObject.objects.filter(is_read=True, timestamp__lt=cutoff).count(),
+        'archived_notification_objects': ArchivedNotificationObject.objects.count(),
+    }
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for model in (Notification, NotificationObject, ArchivedNotificationObject):
+                cursor.execute('SELECT pg_total_relation_size(%s)', [model._meta.db_table])
+                stats[f'{model._meta.db_table}_bytes'] = cursor.fetchone()[0]
+            # end for
+        # end with
+    # end if
+    return stats
+# end def
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 
 from .models import Notification, NotificationObject
+from .unread import get_unread_count
 from common.models import PaymentTransaction
-from common.serializers import NestedBaseUserSerializer, NestedMembershipSubscriptionSerializer
+from common.serializers import NestedBaseUserSerializer, NestedMembershipSubscriptionSerializer, MembershipTierListSerializer
 from courses.serializers import CourseSerializer
 from community.serializers import ArticleSerializer, CodeReviewSerializer
 from industry_projects.serializers import IndustryProjectSerializer
@@ -84,7 +85,69 @@ class NestedNotificationOjbectSerializer(serializers.ModelSerializer):
 # end class
 
 
+NOTIFICATION_RELATIONS = ('sender', 'course', 'article', 'code_review', 'transaction', 'consultation_slot', 'ticket', 'industry_project')
+
+
+def get_expand(context):
+    '''
+    Relations to serialize in full, from ?expand=course,article or ?expand=all
+    Parsed once per request, list items share the root serializer's context
+    '''
+    if 'expand' not in context:
+        request = context.get('request')
+        expand = request.query_params.get('expand', '') if request is not None else ''
+        expand = set(name.strip() for name in expand.split(',') if name.strip() != '')
+        if 'all' in expand:
+            expand = set(NOTIFICATION_RELATIONS) | {'receiver'}
+        # end if
+        context['expand'] = expand
+    # end if
+    return context['expand']
+# end def
+
+
+def get_image_url(request, image):
+    if image and hasattr(image, 'url'):
+        return request.build_absolute_uri(image.url)
+    # end if
+# end def
+
+
+def get_compact_user(request, user):
+    if user is None:
+        return None
+    # end if
+    return {
+        'id': user.id,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'profile_photo': get_image_url(request, user.profile_photo),
+    }
+# end def
+
+
+class NotificationListSerializer(MembershipTierListSerializer):
+    '''
+    Resolves the membership tiers of expanded users only, compact users have none
+    '''
+    user_fields = ('sender',)
+
+    def get_user_fields(self):
+        expand = get_expand(self.context)
+        return [field for field in self.user_fields if field.split('__')[-1] in expand]
+    # end def
+# end class
+
+
+class NotificationObjectListSerializer(NotificationListSerializer):
+    user_fields = ('receiver', 'notification__sender')
+# end class
+
+
 class NotificationSerializer(serializers.ModelSerializer):
+    '''
+    Related objects are compact (ids, titles, thumbnails), pass ?expand= to get them in full
+    '''
     photo = serializers.SerializerMethodField('get_photo_url')
     sender = serializers.SerializerMethodField('get_sender')
     course = serializers.SerializerMethodField('get_course')
@@ -96,78 +159,127 @@ class NotificationSerializer(serializers.ModelSerializer):
     ticket = serializers.SerializerMethodField('get_ticket')
     industry_project = serializers.SerializerMethodField(
         'get_industry_project')
-    transaction = serializers.SerializerMethodField('get_transaction')
 
     class Meta:
         model = Notification
+        list_serializer_class = NotificationListSerializer
         fields = '__all__'
     # end Meta
 
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        return queryset.select_related(*[f'{prefix}{relation}' for relation in NOTIFICATION_RELATIONS])
+    # end def
+
     def get_photo_url(self, obj):
         request = self.context.get("request")
-        if obj.photo and hasattr(obj.photo, 'url'):
-            return request.build_absolute_uri(obj.photo.url)
-        # end if
+        return get_image_url(request, obj.photo)
     # end def
 
     def get_sender(self, obj):
         request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.sender, context={'request': request}).data
+        if 'sender' in get_expand(self.context):
+            return NestedBaseUserSerializer(obj.sender, context=self.context).data
+        # end if
+        return get_compact_user(request, obj.sender)
     # end def
 
     def get_transaction(self, obj):
         request = self.context.get("request")
         if obj.transaction:
-            return PaymentTransactionSerializer(obj.transaction, context={'request': request}).data
+            if 'transaction' in get_expand(self.context):
+                return PaymentTransactionSerializer(obj.transaction, context={'request': request}).data
+            # end if
+            return {
+                'id': obj.transaction.id,
+                'payment_amount': obj.transaction.payment_amount,
+                'payment_status': obj.transaction.payment_status,
+                'payment_type': obj.transaction.payment_type,
+            }
         # end if
     # end def
 
     def get_course(self, obj):
         request = self.context.get("request")
         if obj.course:
-            return CourseSerializer(obj.course, context={'request': request}).data
+            if 'course' in get_expand(self.context):
+                return CourseSerializer(obj.course, context={'request': request}).data
+            # end if
+            return {
+                'id': obj.course.id,
+                'title': obj.course.title,
+                'thumbnail': get_image_url(request, obj.course.thumbnail),
+            }
         # end if
     # end def
 
     def get_article(self, obj):
         request = self.context.get("request")
         if obj.article:
-            return ArticleSerializer(obj.article, context={'request': request}).data
+            if 'article' in get_expand(self.context):
+                return ArticleSerializer(obj.article, context={'request': request}).data
+            # end if
+            return {
+                'id': obj.article.id,
+                'title': obj.article.title,
+                'thumbnail': get_image_url(request, obj.article.thumbnail),
+            }
         # end if
     # end def
 
     def get_industry_project(self, obj):
         request = self.context.get("request")
         if obj.industry_project:
-            return IndustryProjectSerializer(obj.industry_project, context={'request': request}).data
+            if 'industry_project' in get_expand(self.context):
+                return IndustryProjectSerializer(obj.industry_project, context={'request': request}).data
+            # end if
+            return {
+                'id': obj.industry_project.id,
+                'title': obj.industry_project.title,
+            }
         # end if
     # end def
 
     def get_consultation_slot(self, obj):
         request = self.context.get("request")
         if obj.consultation_slot:
-            return ConsultationSlotSerializer(obj.consultation_slot, context={'request': request}).data
+            if 'consultation_slot' in get_expand(self.context):
+                return ConsultationSlotSerializer(obj.consultation_slot, context={'request': request}).data
+            # end if
+            return {
+                'id': obj.consultation_slot.id,
+                'title': obj.consultation_slot.title,
+                'start_time': obj.consultation_slot.start_time,
+                'end_time': obj.consultation_slot.end_time,
+            }
         # end if
     # end def
 
     def get_code_review(self, obj):
         request = self.context.get("request")
         if obj.code_review:
-            return CodeReviewSerializer(obj.code_review, context={'request': request}).data
+            if 'code_review' in get_expand(self.context):
+                return CodeReviewSerializer(obj.code_review, context={'request': request}).data
+            # end if
+            return {
+                'id': obj.code_review.id,
+                'title': obj.code_review.title,
+            }
         # end if
     # end def
 
     def get_ticket(self, obj):
         request = self.context.get("request")
         if obj.ticket:
-            return TicketSerializer(obj.ticket, context={'request': request}).data
-        # end if
-    # end def
-
-    def get_transaction(self, obj):
-        request = self.context.get("request")
-        if obj.transaction:
-            return PaymentTransactionSerializer(obj.transaction, context={'request': request}).data
+            if 'ticket' in get_expand(self.context):
+                return TicketSerializer(obj.ticket, context={'request': request}).data
+            # end if
+            return {
+                'id': obj.ticket.id,
+                'ticket_status': obj.ticket.ticket_status,
+                'ticket_type': obj.ticket.ticket_type,
+                'photo': get_image_url(request, obj.ticket.photo),
+            }
         # end if
     # end def
 # end class
@@ -180,22 +292,34 @@ class NotificationObjectSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = NotificationObject
+        list_serializer_class = NotificationObjectListSerializer
         fields = '__all__'
     # end Meta
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return NotificationSerializer.setup_eager_loading(queryset.select_related('receiver', 'notification'), prefix='notification__')
+    # end def
+
     def get_receiver(self, obj):
         request = self.context.get("request")
-        return NestedBaseUserSerializer(obj.receiver, context={'request': request}).data
+        if 'receiver' in get_expand(self.context):
+            return NestedBaseUserSerializer(obj.receiver, context=self.context).data
+        # end if
+        return get_compact_user(request, obj.receiver)
     # end def
 
     def get_notification(self, obj):
-        request = self.context.get("request")
-        return NotificationSerializer(obj.notification, context={'request': request}).data
+        # the expand param, membership tiers and unread counts are shared with the list
+        return NotificationSerializer(obj.notification, context=self.context).data
     # end def
 
     def get_num_unread(self, obj):
-        receiver = obj.receiver
-        num_unread = NotificationObject.objects.filter(receiver=receiver).filter(is_read=False).count()
-        return num_unread
+        # read once per request, list items share the root serializer's context
+        num_unread = self.context.setdefault('num_unread', {})
+        if obj.receiver_id not in num_unread:
+            num_unread[obj.receiver_id] = get_unread_count(obj.receiver_id)
+        # end if
+        return num_unread[obj.receiver_id]
     # end def
 # end class
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import NotificationObject
+from .unread import adjust_unread_count
+
+
+@receiver(post_save, sender=NotificationObject)
+def increment_unread_count(sender, instance, created, **kwargs):
+    # read state changes go through the views in views_notification_objects, which adjust the count themselves
+    if created and not instance.is_read:
+        adjust_unread_count([instance.receiver_id], 1)
+    # end if
+# end def
+
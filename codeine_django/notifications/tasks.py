@@ -6,6 +6,10 @@ from codeine_django.celery import app
 
 from common.models import Partner
 from .models import Notification, NotificationObject
+from .fanout import fan_out, get_enrolled_user_ids, get_recent_receiver_ids
+from .retention import get_retention_cutoff, archive_read_notifications, delete_orphan_notifications
+from .unread import refresh_unread_counts
+
 
 @shared_task
 def weekly_notification():
@@ -17,8 +21,39 @@ def weekly_notification():
         title=title, description=description, notification_type=notification_type)
     notification.save()
 
-    for partner in partners:
-        notification_object = NotificationObject(receiver=partner.user, notification=notification)
-        notification_object.save()
-    # end for
+    fan_out(notification.id, partners.values_list('user_id', flat=True).iterator())
+# end def
+
+
+@shared_task
+def notify_enrolled_members(notification_id, course_ids):
+    notification = Notification.objects.filter(pk=notification_id).first()
+    if notification is None:
+        return 0
+    # end if
+
+    # a notification left without objects is dropped by archive_notifications
+    user_ids = get_enrolled_user_ids(course_ids).exclude(member__user__in=get_recent_receiver_ids(notification))
+    return fan_out(notification_id, user_ids.iterator())
+# end def
+
+
+@shared_task
+def archive_notifications():
+    '''
+    Archives read notification objects past NOTIFICATION_RETENTION_DAYS and drops notifications left without any
+    '''
+    cutoff = get_retention_cutoff()
+    archived = archive_read_notifications(cutoff)
+    deleted = delete_orphan_notifications(cutoff)
+    return {'archived': archived, 'deleted': deleted}
+# end def
+
+
+@shared_task
+def reconcile_unread_counts():
+    '''
+    Recounts materialized unread counts, see notifications.unread
+    '''
+    return refresh_unread_counts()
 # end def
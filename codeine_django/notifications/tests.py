@@ -1,3 +1,245 @@
-from django.test import TestCase
+from django.db.models.deletion import Collector
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from datetime import timedelta
+from unittest import mock
+
+from .models import Notification, NotificationObject, NotificationCount
+from .unread import get_unread_count, refresh_unread_counts
+from .fanout import fan_out, fan_out_to_enrolled_members
+from .views_notification_objects import set_read_state
+from common.models import BaseUser, Member
+from courses.models import Course, Chapter, Enrollment
+
+
+class UnreadCountTest(TestCase):
+
+    def setUp(self):
+        self.sender = BaseUser.objects.create_user('admin@codeine.com', 'password', is_admin=True)
+        self.receivers = [BaseUser.objects.create_user(f'user{index}@codeine.com', 'password') for index in range(3)]
+        self.client = APIClient()
+    # end def
+
+    def notify(self, receivers, is_read=False):
+        notification = Notification.objects.create(title='Title', description='Description', notification_type='GENERAL', sender=self.sender)
+        for receiver in receivers:
+            NotificationObject.objects.create(notification=notification, receiver=receiver, is_read=is_read)
+        # end for
+        return notification
+    # end def
+
+    def get_counts(self):
+        return [get_unread_count(receiver.id) for receiver in self.receivers]
+    # end def
+
+    def test_first_read_counts_unread_objects(self):
+        self.notify(self.receivers[:2])
+        self.notify(self.receivers[:1])
+        self.notify(self.receivers, is_read=True)
+
+        self.assertFalse(NotificationCount.objects.exists())
+        self.assertEqual(self.get_counts(), [2, 1, 0])
+        self.assertEqual(NotificationCount.objects.count(), 3)
+
+        self.notify(self.receivers)
+        self.assertEqual(self.get_counts(), [3, 2, 1])
+    # end def
+
+    def test_deleting_a_notification_takes_off_unread_objects(self):
+        notification = self.notify(self.receivers)
+        self.notify(self.receivers[:1])
+        read = self.notify(self.receivers[1:], is_read=True)
+        self.assertEqual(self.get_counts(), [2, 1, 1])
+
+        # notification objects have no delete receivers and are deleted in bulk
+        self.assertTrue(Collector(using='default').can_fast_delete(NotificationObject.objects.all()))
+
+        self.client.force_authenticate(self.sender)
+        self.assertEqual(self.client.delete(f'/notifications/{notification.id}').status_code, 200)
+        self.assertEqual(self.get_counts(), [1, 0, 0])
+
+        self.assertEqual(self.client.delete(f'/notifications/{read.id}').status_code, 200)
+        self.assertEqual(self.get_counts(), [1, 0, 0])
+    # end def
+
+    def test_deleting_a_notification_object_takes_it_off(self):
+        self.notify(self.receivers[:1])
+        self.notify(self.receivers[:1], is_read=True)
+        self.assertEqual(self.get_counts(), [1, 0, 0])
+
+        self.client.force_authenticate(self.receivers[0])
+        for notification_object in NotificationObject.objects.filter(receiver=self.receivers[0]):
+            self.assertEqual(self.client.delete(f'/notification-objects/{notification_object.id}').status_code, 200)
+        # end for
+        self.assertEqual(self.get_counts(), [0, 0, 0])
+    # end def
+
+    def test_reconcile_fixes_drift(self):
+        self.notify(self.receivers[:2])
+        self.assertEqual(self.get_counts(), [1, 1, 0])
+
+        # deleted outside the views
+        NotificationObject.objects.filter(receiver=self.receivers[0]).delete()
+        NotificationCount.objects.filter(receiver=self.receivers[2]).update(num_unread=5)
+
+        self.assertEqual(refresh_unread_counts(), 3)
+        self.assertEqual(self.get_counts(), [0, 1, 0])
+    # end def
+# end class
+
+
+class ReadStateTest(TestCase):
+
+    def setUp(self):
+        self.user = BaseUser.objects.create_user('user@codeine.com', 'password')
+        self.other = BaseUser.objects.create_user('other@codeine.com', 'password')
+        notification = Notification.objects.create(title='Title', description='Description', notification_type='GENERAL')
+
+        self.unread = [NotificationObject.objects.create(notification=notification, receiver=self.user) for index in range(3)]
+        self.read = NotificationObject.objects.create(notification=notification, receiver=self.user, is_read=True)
+        self.not_owned = NotificationObject.objects.create(notification=notification, receiver=self.other)
+
+        get_unread_count(self.user.id)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    # end def
+
+    def test_mark_multiple_as_read_updates_once(self):
+        notification_object_ids = [str(notification_object.id) for notification_object in (self.unread[0], self.unread[1], self.read, self.not_owned)]
+
+        # a savepoint around the affected ids, one UPDATE of the objects and one of the count, then the count is read
+        with self.assertNumQueries(6):
+            response = set_read_state(self.user, True, notification_object_ids)
+        # end with
+
+        # the foreign and the already read ids are not echoed back
+        self.assertEqual(sorted(response.data['notification_object_ids']), sorted(notification_object_ids[:2]))
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(response.data['num_unread'], 1)
+        self.assertFalse(NotificationObject.objects.get(pk=self.not_owned.pk).is_read)
+        self.assertEqual(NotificationObject.objects.filter(receiver=self.user, is_read=False).count(), 1)
+    # end def
+
+    def test_mark_all_as_unread(self):
+        response = self.client.patch('/notification-objects/mark/all-unread')
+        self.assertEqual(response.json(), {'updated': 1, 'num_unread': 4})
+
+        response = self.client.patch('/notification-objects/mark/multiple-read', {'notification_object_ids': ['not an id']}, format='json')
+        self.assertEqual(response.status_code, 400)
+    # end def
+# end class
+
+
+@override_settings(NOTIFICATION_FANOUT_DEFERRED=False)
+class FanOutTestCase(TestCase):
+
+    def setUp(self):
+        self.courses = [
+            Course.objects.create(
+                title=f'Course {index}', learning_objectives=[], requirements=[], description='Description',
+                coding_languages=['PY'], languages=['ENG'], categories=['BE'], exp_points=100, duration=3
+            ) for index in range(3)
+        ]
+        self.users = []
+        for index in range(5):
+            user = BaseUser.objects.create_user(f'member{index}@codeine.com', 'password')
+            Member.objects.create(user=user, unique_id=f'member{index}')
+            self.users.append(user)
+        # end for
+        self.notification = Notification.objects.create(title='Title', description='Description', notification_type='COURSE')
+    # end def
+
+    def enroll(self, user, course):
+        return Enrollment.objects.create(course=course, member=user.member, progress=0)
+    # end def
+# end class
+
+
+class FanOutTest(FanOutTestCase):
+
+    def test_batches_are_bulk_created(self):
+        receiver_ids = [user.id for user in self.users]
+        with mock.patch.object(NotificationObject.objects, 'bulk_create', wraps=NotificationObject.objects.bulk_create) as bulk_create:
+            self.assertEqual(fan_out(self.notification.id, receiver_ids, batch_size=2), 5)
+        # end with
+
+        self.assertEqual([len(call.args[0]) for call in bulk_create.call_args_list], [2, 2, 1])
+        self.assertEqual(set(NotificationObject.objects.values_list('receiver_id', flat=True)), set(receiver_ids))
+        self.assertEqual([get_unread_count(user.id) for user in self.users], [1] * 5)
+    # end def
+
+    def test_exact_batch_leaves_no_empty_insert(self):
+        with mock.patch.object(NotificationObject.objects, 'bulk_create', wraps=NotificationObject.objects.bulk_create) as bulk_create:
+            self.assertEqual(fan_out(self.notification.id, [user.id for user in self.users[:4]], batch_size=2), 4)
+            self.assertEqual(fan_out(self.notification.id, [], batch_size=2), 0)
+        # end with
+        self.assertEqual(bulk_create.call_count, 2)
+    # end def
+
+    def test_only_enrolled_members_receive_once(self):
+        self.enroll(self.users[0], self.courses[0])
+        self.enroll(self.users[0], self.courses[1])
+        self.enroll(self.users[1], self.courses[1])
+        self.enroll(self.users[2], self.courses[2])  # not one of the notified courses
+
+        # unenrolled members keep their enrollment without a course
+        unenrolled = self.enroll(self.users[3], self.courses[0])
+        unenrolled.course = None
+        unenrolled.save()
+
+        with mock.patch.object(NotificationObject.objects, 'bulk_create', wraps=NotificationObject.objects.bulk_create) as bulk_create:
+            fan_out_to_enrolled_members(self.notification, [self.courses[0].id, self.courses[1].id])
+        # end with
+
+        self.assertEqual(bulk_create.call_count, 1)
+        receivers = list(NotificationObject.objects.filter(notification=self.notification).values_list('receiver_id', flat=True))
+        self.assertEqual(sorted(receivers), sorted([self.users[0].id, self.users[1].id]))
+    # end def
+# end class
+
+
+@override_settings(NOTIFICATION_DEDUP_WINDOW=600)
+class NotificationDedupTest(FanOutTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = self.courses[0]
+        self.enroll(self.users[0], self.course)
+        self.chapter = Chapter.objects.create(title='Chapter', order=0, course=self.course)
+    # end def
+
+    def get_updates(self, user):
+        return NotificationObject.objects.filter(receiver=user, notification__description__startswith='Updated chapter')
+    # end def
+
+    def test_repeated_event_within_the_window_is_sent_once(self):
+        self.chapter.save()
+        self.chapter.save()
+        self.assertEqual(self.get_updates(self.users[0]).count(), 1)
+
+        # members who did not get the first one still get the repeat
+        self.enroll(self.users[1], self.course)
+        self.chapter.save()
+        self.assertEqual(self.get_updates(self.users[0]).count(), 1)
+        self.assertEqual(self.get_updates(self.users[1]).count(), 1)
+    # end def
+
+    def test_event_outside_the_window_is_sent_again(self):
+        self.chapter.save()
+        Notification.objects.update(timestamp=timezone.now() - timedelta(seconds=601))
+
+        self.chapter.save()
+        self.assertEqual(self.get_updates(self.users[0]).count(), 2)
+    # end def
+
+    def test_different_events_are_not_deduplicated(self):
+        self.enroll(self.users[0], self.courses[1])
+        self.chapter.save()
+        Chapter.objects.create(title='Chapter', order=0, course=self.courses[1])
+
+        notifications = NotificationObject.objects.filter(receiver=self.users[0]).values_list('notification__description', flat=True)
+        self.assertEqual(sorted(notifications), ['New chapter for course Course 0!', 'New chapter for course Course 1!', 'Updated chapter for course Course 0!'])
+    # end def
+# end class
@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.db.models import F, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import NotificationObject, NotificationCount
+
+
+def count_unread(receiver_id):
+    return NotificationObject.objects.filter(receiver_id=receiver_id, is_read=False).count()
+# end def
+
+
+def get_unread_count(receiver_id):
+    '''
+    Reads the materialized unread count, counting once for receivers without one
+    The row exists before the count is taken, so concurrent fan outs either adjust it or are part of the count,
+    anything left over is fixed by reconcile_unread_counts
+    '''
+    num_unread = NotificationCount.objects.filter(receiver_id=receiver_id).values_list('num_unread', flat=True).first()
+    if num_unread is not None:
+        return num_unread
+    # end if
+
+    NotificationCount.objects.get_or_create(receiver_id=receiver_id)
+    with transaction.atomic():
+        notification_count = NotificationCount.objects.select_for_update().get(receiver_id=receiver_id)
+        notification_count.num_unread = count_unread(receiver_id)
+        notification_count.save(update_fields=['num_unread'])
+    # end with
+    return notification_count.num_unread
+# end def
+
+
+def adjust_unread_count(receiver_ids, delta):
+    '''
+    Adds delta to the unread count of receivers, in one UPDATE
+    Receivers without a count are skipped, they are counted on their next read
+    '''
+    receiver_ids = [receiver_id for receiver_id in receiver_ids if receiver_id is not None]
+    if delta == 0 or len(receiver_ids) == 0:
+        return
+    # end if
+
+    NotificationCount.objects.filter(receiver_id__in=receiver_ids).update(num_unread=F('num_unread') + delta)
+# end def
+
+
+def subtract_unread_objects(notification_objects):
+    '''
+    Takes the unread ones of notification objects about to be deleted off their receivers' counts, in one grouped UPDATE
+    '''
+    unread = notification_objects.filter(is_read=False, receiver__isnull=False)
+    num_unread = unread.filter(receiver=OuterRef('receiver')).order_by().values('receiver').annotate(num_unread=Count('id')).values('num_unread')
+
+    NotificationCount.objects.filter(receiver__in=unread.values('receiver')).update(num_unread=F('num_unread') - Subquery(num_unread))
+# end def
+
+
+def refresh_unread_counts():
+    '''
+    Recounts every materialized unread count in one UPDATE, correcting drift from deletes outside the views
+    Returns the number of counts refreshed
+    '''
+    num_unread = NotificationObject.objects.filter(receiver=OuterRef('receiver'), is_read=False).order_by().values('receiver').annotate(num_unread=Count('id')).values('num_unread')
+    return NotificationCount.objects.update(num_unread=Coalesce(Subquery(num_unread), 0))
+# end def
@@ -6,6 +6,8 @@ urlpatterns = [
     # notification views
     path('', views_notification_objects.notification_object_view,
          name='Get all/Search Notifications'),
+    path('/unread-count', views_notification_objects.unread_count_view,
+         name='Get number of unread notification objects'),
     path('/<slug:pk>', views_notification_objects.single_notification_object_view,
          name='Read or Delete Notificaiton'),
     path('/<slug:pk>/read', views_notification_objects.mark_notification_as_read,
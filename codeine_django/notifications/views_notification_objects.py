@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from django.db.models import Q
@@ -11,6 +12,35 @@ from rest_framework.permissions import IsAuthenticated
 from .models import NotificationObject
 from common.models import BaseUser
 from .serializers import NotificationObjectSerializer
+from .unread import get_unread_count, adjust_unread_count, subtract_unread_objects
+from utils.pagination import paginate
+
+
+def set_read_state(user, is_read, notification_object_ids=None):
+    '''
+    Sets is_read on the user's notification objects with one filtered UPDATE, all of them if no ids are given
+    Ids the user does not own or that are already in that state are left out by the filter
+    Returns the ids that changed (only for explicit ids), the number of objects updated and the new unread count
+    '''
+    notification_objects = NotificationObject.objects.filter(receiver=user, is_read=not is_read)
+
+    data = {}
+    with transaction.atomic():
+        if notification_object_ids is not None:
+            # the affected ids are locked and read from the same owner and state filter, then updated by pk
+            affected = list(notification_objects.filter(id__in=notification_object_ids).select_for_update().values_list('id', flat=True))
+            notification_objects = NotificationObject.objects.filter(id__in=affected)
+            data['notification_object_ids'] = [str(notification_object_id) for notification_object_id in affected]
+        # end if
+
+        updated = notification_objects.update(is_read=is_read)
+        adjust_unread_count([user.id], -updated if is_read else updated)
+    # end with
+
+    data['updated'] = updated
+    data['num_unread'] = get_unread_count(user.id)
+    return Response(data, status=status.HTTP_200_OK)
+# end def
 
 
 @api_view(['GET', ])
@@ -36,9 +66,8 @@ def notification_object_view(request):
             notification_objects = notification_objects.filter(is_read=is_read)
         # end ifs
 
-        serializer = NotificationObjectSerializer(
-            notification_objects.all(), many=True, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        notification_objects = NotificationObjectSerializer.setup_eager_loading(notification_objects.all())
+        return paginate(request, notification_objects, NotificationObjectSerializer, {"request": request}, ('-timestamp', '-id'))
     # end if
 # end def
 
@@ -51,7 +80,7 @@ def single_notification_object_view(request, pk):
     '''
     if request.method == 'GET':
         try:
-            notification_object = NotificationObject.objects.get(pk=pk)
+            notification_object = NotificationObjectSerializer.setup_eager_loading(NotificationObject.objects).get(pk=pk)
             serializer = NotificationObjectSerializer(
                 notification_object, context={"request": request})
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -72,7 +101,11 @@ def single_notification_object_view(request, pk):
                 return Response(status=status.HTTP_401_UNAUTHORIZED)
             # end if
 
-            notification_object.delete()
+            with transaction.atomic():
+                notification_objects = NotificationObject.objects.filter(pk=notification_object.pk)
+                subtract_unread_objects(notification_objects)
+                notification_objects.delete()
+            # end with
 
             return Response(status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
@@ -90,15 +123,17 @@ def mark_notification_as_read(request, pk):
     '''
     if request.method == 'PATCH':
         try:
-            notification_object = NotificationObject.objects.get(pk=pk)
+            notification_object = NotificationObjectSerializer.setup_eager_loading(NotificationObject.objects).get(pk=pk)
 
             user = request.user
             if notification_object.receiver != user:
                 return Response(status=status.HTTP_401_UNAUTHORIZED)
             # end if
 
+            # conditional update, so that the unread count only moves when the state does
+            updated = NotificationObject.objects.filter(pk=pk, is_read=False).update(is_read=True)
+            adjust_unread_count([user.id], -updated)
             notification_object.is_read = True
-            notification_object.save()
 
             serializer = NotificationObjectSerializer(
                 notification_object, context={"request": request})
@@ -118,15 +153,17 @@ def mark_notification_as_unread(request, pk):
     '''
     if request.method == 'PATCH':
         try:
-            notification_object = NotificationObject.objects.get(pk=pk)
+            notification_object = NotificationObjectSerializer.setup_eager_loading(NotificationObject.objects).get(pk=pk)
 
             user = request.user
             if notification_object.receiver != user:
                 return Response(status=status.HTTP_401_UNAUTHORIZED)
             # end if
 
+            # conditional update, so that the unread count only moves when the state does
+            updated = NotificationObject.objects.filter(pk=pk, is_read=True).update(is_read=False)
+            adjust_unread_count([user.id], updated)
             notification_object.is_read = False
-            notification_object.save()
 
             serializer = NotificationObjectSerializer(
                 notification_object, context={"request": request})
@@ -146,27 +183,10 @@ def mark_multiple_as_read(request):
     '''
     if request.method == 'PATCH':
         try:
-            data = request.data
             user = request.user
-            notification_objects = NotificationObject.objects.filter(receiver=user)
-
-            if 'notification_object_ids' in data:
-                notification_object_ids = data['notification_object_ids']
-                for index, notification_object_id in enumerate(notification_object_ids):
-                    notification_object = NotificationObject.objects.get(pk=notification_object_id)
-                    if notification_object not in notification_objects:
-                        return Response(status=status.HTTP_401_UNAUTHORIZED)
-                    else:
-                        notification_object.is_read = True
-                        notification_object.save()
-                    # end if-else
-                # end for
-            # end if
-
-            serializer = NotificationObjectSerializer(
-                notification_objects.all(), many=True, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except (ObjectDoesNotExist, KeyError, ValueError) as e:
+            notification_object_ids = request.data['notification_object_ids']
+            return set_read_state(user, True, notification_object_ids)
+        except (ValidationError, KeyError, ValueError, TypeError) as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
         # end try-except
     # end if
@@ -181,27 +201,10 @@ def mark_multiple_as_unread(request):
     '''
     if request.method == 'PATCH':
         try:
-            data = request.data
             user = request.user
-            notification_objects = NotificationObject.objects.filter(receiver=user)
-
-            if 'notification_object_ids' in data:
-                notification_object_ids = data['notification_object_ids']
-                for index, notification_object_id in enumerate(notification_object_ids):
-                    notification_object = NotificationObject.objects.get(pk=notification_object_id)
-                    if notification_object not in notification_objects:
-                        return Response(status=status.HTTP_401_UNAUTHORIZED)
-                    else:
-                        notification_object.is_read = False
-                        notification_object.save()
-                    # end if-else
-                # end for
-            # end if
-
-            serializer = NotificationObjectSerializer(
-                notification_objects.all(), many=True, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except (ObjectDoesNotExist, KeyError, ValueError) as e:
+            notification_object_ids = request.data['notification_object_ids']
+            return set_read_state(user, False, notification_object_ids)
+        except (ValidationError, KeyError, ValueError, TypeError) as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
         # end try-except
     # end if
@@ -210,88 +213,38 @@ def mark_multiple_as_unread(request):
 
 @api_view(['PATCH'])
 @permission_classes((IsAuthenticated,))
-def mark_multiple_as_read(request):
+def mark_all_as_read(request):
     '''
-    Mark multiple notification object as read
+    Mark all notification objects as read
     '''
     if request.method == 'PATCH':
-        try:
-            data = request.data
-            user = request.user
-            notification_objects = NotificationObject.objects.filter(receiver=user)
-
-            if 'notification_object_ids' in data:
-                notification_object_ids = data['notification_object_ids']
-                for index, notification_object_id in enumerate(notification_object_ids):
-                    notification_object = NotificationObject.objects.get(pk=notification_object_id)
-                    if notification_object not in notification_objects:
-                        return Response(status=status.HTTP_401_UNAUTHORIZED)
-                    else:
-                        notification_object.is_read = True
-                        notification_object.save()
-                    # end if-else
-                # end for
-            # end if
-
-            serializer = NotificationObjectSerializer(
-                notification_objects.all(), many=True, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except (ObjectDoesNotExist, KeyError, ValueError) as e:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-        # end try-except
+        user = request.user
+        return set_read_state(user, True)
     # end if
 # end def
 
 
 @api_view(['PATCH'])
 @permission_classes((IsAuthenticated,))
-def mark_all_as_read(request):
+def mark_all_as_unread(request):
     '''
-    Mark all notification objects as read
+    Mark all notification objects as unread
     '''
     if request.method == 'PATCH':
-        try:
-            data = request.data
-            user = request.user
-            notification_objects = NotificationObject.objects.filter(receiver=user)
-
-            for notification_object in notification_objects:
-                notification_object.is_read = True
-                notification_object.save()
-            # end for
-
-            serializer = NotificationObjectSerializer(
-                notification_objects.all(), many=True, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except (ObjectDoesNotExist, KeyError, ValueError) as e:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-        # end try-except
+        user = request.user
+        return set_read_state(user, False)
     # end if
 # end def
 
 
-@api_view(['PATCH'])
+@api_view(['GET'])
 @permission_classes((IsAuthenticated,))
-def mark_all_as_unread(request):
+def unread_count_view(request):
     '''
-    Mark all notification objects as unread
+    Get number of unread notification objects of user
     '''
-    if request.method == 'PATCH':
-        try:
-            data = request.data
-            user = request.user
-            notification_objects = NotificationObject.objects.filter(receiver=user)
-
-            for notification_object in notification_objects:
-                notification_object.is_read = False
-                notification_object.save()
-            # end for
-
-            serializer = NotificationObjectSerializer(
-                notification_objects.all(), many=True, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except (ObjectDoesNotExist, KeyError, ValueError) as e:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-        # end try-except
+    if request.method == 'GET':
+        user = request.user
+        return Response({'num_unread': get_unread_count(user.id)}, status=status.HTTP_200_OK)
     # end if
 # end def
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from django.db.models import Q
@@ -11,6 +12,7 @@ from common.permissions import IsPartnerOrAdminOrReadOnly
 
 from .models import Notification, NotificationObject
 from .serializers import NotificationSerializer
+from .unread import subtract_unread_objects
 from common.models import BaseUser, PaymentTransaction
 from courses.models import Course
 from community.models import Article, CodeReview
@@ -49,7 +51,7 @@ def notification_view(request):
         # end ifs
 
         serializer = NotificationSerializer(
-            notifications.all(), many=True, context={"request": request})
+            NotificationSerializer.setup_eager_loading(notifications.all()), many=True, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
     # end if
 
@@ -127,7 +129,7 @@ def single_notification_view(request, pk):
     '''
     if request.method == 'GET':
         try:
-            notification = Notification.objects.get(pk=pk)
+            notification = NotificationSerializer.setup_eager_loading(Notification.objects).get(pk=pk)
 
             serializer = NotificationSerializer(
                 notification, context={"request": request})
@@ -149,7 +151,11 @@ def single_notification_view(request, pk):
                 return Response(status=status.HTTP_401_UNAUTHORIZED)
             # end if
 
-            notification.delete()
+            # notification objects are deleted in bulk with the notification, their unread counts are taken off first
+            with transaction.atomic():
+                subtract_unread_objects(notification.notification_objects.all())
+                notification.delete()
+            # end with
 
             return Response(status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
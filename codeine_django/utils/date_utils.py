@@ -0,0 +1,20 @@
+from django.utils import timezone
+
+from datetime import timedelta
+
+
+def get_start_of_day(value):
+    '''
+    Midnight of the day value falls on, in the current timezone
+    Filtering on field__gte=get_start_of_day(value) matches field__date__gte=value without casting the column
+    '''
+    return timezone.localtime(value).replace(hour=0, minute=0, second=0, microsecond=0)
+# end def
+
+
+def get_date_cutoff(days):
+    '''
+    Start of the day a number of days ago, for "last n days" range filters
+    '''
+    return get_start_of_day(timezone.now() - timedelta(days=days))
+# end def
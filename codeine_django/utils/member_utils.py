@@ -1,149 +1,158 @@
-from common.models import Member, MembershipSubscription
+from common.models import Member, MembershipSubscription, get_default_member_stats
 from courses.models import Course
-from django.db.models import Q, Sum
+from django.db import connections
+from django.db.models import Q, Sum, Max, Avg, Count, FloatField, Value
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
-from django.core.exceptions import ObjectDoesNotExist
-import pytz
-
-
-def get_member_stats(pk):
-    member = Member.objects.get(user_id=pk)
-
-    # courses member is enrolled in
-    courses = Course.objects.filter(enrollments__member=member)
-    courses = courses.filter(
-        Q(assessment__quiz_results__member=member) &
-        Q(assessment__quiz_results__passed=True)
-    )
-    courses = courses.distinct()
-
-    stats = {
-        'PY': 0,
-        'JAVA': 0,
-        'JS': 0,
-        'CPP': 0,
-        'CS': 0,
-        'HTML': 0,
-        'CSS': 0,
-        'RUBY': 0,
-        'SEC': 0,
-        'DB': 0,
-        'FE': 0,
-        'BE': 0,
-        'UI': 0,
-        'ML': 0,
-    }
 
-    for course in courses:
-        exp_points = course.exp_points
-        for coding_language in course.coding_languages:
-            stats[coding_language] += exp_points
-        # end for
-        for category in course.categories:
-            stats[category] += exp_points
-        # end for
-    # end for
+from collections import defaultdict
 
-    return stats
+
+def resolve_membership_tier(expiry_date, now=None):
+    '''
+    Computes the effective tier from the latest completed subscription expiry
+    Does not touch the database
+    '''
+    if now is None:
+        now = timezone.now()
+    # end if
+
+    if expiry_date is not None and expiry_date >= now:
+        return 'PRO'
+    # end if
+    return 'FREE'
 # end def
 
 
-def get_default_member_stats():
-    return {
-        'PY': 0,
-        'JAVA': 0,
-        'JS': 0,
-        'CPP': 0,
-        'CS': 0,
-        'HTML': 0,
-        'CSS': 0,
-        'RUBY': 0,
-        'SEC': 0,
-        'DB': 0,
-        'FE': 0,
-        'BE': 0,
-        'UI': 0,
-        'ML': 0,
-    }
+def get_membership_expiry(member):
+    '''
+    Returns the latest expiry date of member's completed subscriptions
+    '''
+    return MembershipSubscription.objects.filter(
+        member=member,
+        payment_transaction__payment_status='COMPLETED'
+    ).aggregate(Max('expiry_date'))['expiry_date__max']
+# end def
+
+
+def get_membership_tiers(members):
+    '''
+    Bulk resolves the tiers of members with a single query
+    Returns a dict of member id to tier
+    '''
+    member_ids = [member.id for member in members]
+    if len(member_ids) == 0:
+        return {}
+    # end if
+
+    expiries = MembershipSubscription.objects.filter(
+        member__in=member_ids,
+        payment_transaction__payment_status='COMPLETED'
+    ).values('member').order_by().annotate(latest_expiry=Max('expiry_date'))
+    expiries = {row['member']: row['latest_expiry'] for row in expiries}
+
+    now = timezone.now()
+    return {member_id: resolve_membership_tier(expiries.get(member_id), now=now) for member_id in member_ids}
 # end def
 
 
 def get_membership_tier(member):
-    try:
-        subscription = MembershipSubscription.objects.filter(
-            member=member, payment_transaction__payment_status='COMPLETED').first()
-        if subscription:
-            if subscription.expiry_date < pytz.utc.localize(timezone.now().today()):
-                member.membership_tier = 'FREE'
-                member.save()
-            else:
-                member.membership_tier = 'PRO'
-                member.save()
-            # end if-else
-        else:
-            member.membership_tier = 'FREE'
-            member.save()
-        # end if-else
-    except ObjectDoesNotExist:
-        member.membership_tier = 'FREE'
-        member.save()
-    # end try-except
+    '''
+    Resolves member's tier, only persisting when it has changed
+    '''
+    tier = resolve_membership_tier(get_membership_expiry(member))
+
+    if member.membership_tier != tier:
+        member.membership_tier = tier
+        member.save(update_fields=['membership_tier'])
+    # end if
+
+    return tier
 # end def
 
 
-def get_average_skill_set(member_list):
-    stats = {
-        'PY': 0,
-        'JAVA': 0,
-        'JS': 0,
-        'CPP': 0,
-        'CS': 0,
-        'HTML': 0,
-        'CSS': 0,
-        'RUBY': 0,
-        'SEC': 0,
-        'DB': 0,
-        'FE': 0,
-        'BE': 0,
-        'UI': 0,
-        'ML': 0,
+def sweep_membership_tiers():
+    '''
+    Persists tier changes for subscriptions that started or expired
+    Returns the number of members downgraded and upgraded
+    '''
+    active_member_ids = MembershipSubscription.objects.filter(
+        payment_transaction__payment_status='COMPLETED',
+        expiry_date__gte=timezone.now()
+    ).exclude(member=None).values('member')
+
+    downgraded = Member.objects.filter(membership_tier='PRO').exclude(id__in=active_member_ids).update(membership_tier='FREE')
+    upgraded = Member.objects.filter(membership_tier='FREE').filter(id__in=active_member_ids).update(membership_tier='PRO')
+
+    return downgraded, upgraded
+# end def
+
+
+def get_skill_averages(stats_field='stats'):
+    '''
+    Avg aggregates of every skill in a stats JSONField, keyed by skill
+    Missing skills count as 0, as in average_skill_sets
+    '''
+    return {
+        skill: Avg(Coalesce(Cast(KeyTextTransform(skill, stats_field), FloatField()), Value(0.0)))
+        for skill in get_default_member_stats()
     }
+# end def
 
-    if len(member_list) <= 0:
-        return stats
-    # end if
 
-    for member in member_list:
-        stats['PY'] += member.stats['PY']
-        stats['JAVA'] += member.stats['JAVA']
-        stats['JS'] += member.stats['JS']
-        stats['CPP'] += member.stats['CPP']
-        stats['CS'] += member.stats['CS']
-        stats['HTML'] += member.stats['HTML']
-        stats['CSS'] += member.stats['CSS']
-        stats['RUBY'] += member.stats['RUBY']
-        stats['SEC'] += member.stats['SEC']
-        stats['DB'] += member.stats['DB']
-        stats['FE'] += member.stats['FE']
-        stats['BE'] += member.stats['BE']
-        stats['UI'] += member.stats['UI']
-        stats['ML'] += member.stats['ML']
+def average_skill_sets(skill_sets):
+    '''
+    Average of every skill over stats dicts, for databases without JSON support and groups built in Python
+    '''
+    stats = get_default_member_stats()
+    count = 0
+    for skill_set in skill_sets:
+        for skill in stats:
+            stats[skill] += skill_set.get(skill, 0)
+        # end for
+        count += 1
     # end for
 
-    stats['PY'] /= len(member_list)
-    stats['JAVA'] /= len(member_list)
-    stats['JS'] /= len(member_list)
-    stats['CPP'] /= len(member_list)
-    stats['CS'] /= len(member_list)
-    stats['HTML'] /= len(member_list)
-    stats['CSS'] /= len(member_list)
-    stats['RUBY'] /= len(member_list)
-    stats['SEC'] /= len(member_list)
-    stats['DB'] /= len(member_list)
-    stats['FE'] /= len(member_list)
-    stats['BE'] /= len(member_list)
-    stats['UI'] /= len(member_list)
-    stats['ML'] /= len(member_list)
-
+    if count > 0:
+        for skill in stats:
+            stats[skill] /= count
+        # end for
+    # end if
     return stats
 # end def
+
+
+def get_average_skill_set(members):
+    '''
+    Average of every skill over a Member queryset, in one query
+    '''
+    if not connections[members.db].features.supports_json_field:
+        return average_skill_sets(members.values_list('stats', flat=True).iterator())
+    # end if
+
+    averages = members.aggregate(**get_skill_averages())
+    return {skill: average or 0 for skill, average in averages.items()}
+# end def
+
+
+def get_grouped_average_skill_sets(queryset, group_field, stats_field):
+    '''
+    {group: (number of rows, average skill set)} over queryset grouped by group_field, in one query
+    stats_field is the lookup from queryset to the stats JSONField
+    '''
+    if not connections[queryset.db].features.supports_json_field:
+        skill_sets = defaultdict(list)
+        for group, skill_set in queryset.values_list(group_field, stats_field).iterator():
+            skill_sets[group].append(skill_set)
+        # end for
+        return {group: (len(rows), average_skill_sets(rows)) for group, rows in skill_sets.items()}
+    # end if
+
+    rows = queryset.values(group_field).annotate(row_count=Count('pk'), **get_skill_averages(stats_field)).order_by()
+    groups = {}
+    for row in rows:
+        groups[row[group_field]] = (row['row_count'], {skill: row[skill] or 0 for skill in get_default_member_stats()})
+    # end for
+    return groups
+# end def
@@ -0,0 +1,253 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+import base64
+import json
+
+
+def get_page_size(request):
+    '''
+    Reads pageSize from query params, capped at MAX_PAGE_SIZE
+    Falls back to PAGE_SIZE when missing or invalid
+    '''
+    try:
+        page_size = int(request.query_params.get('pageSize', api_settings.PAGE_SIZE))
+    except (TypeError, ValueError):
+        page_size = api_settings.PAGE_SIZE
+    # end try-except
+
+    if page_size <= 0:
+        page_size = api_settings.PAGE_SIZE
+    # end if
+
+    return min(page_size, settings.MAX_PAGE_SIZE)
+# end def
+
+
+def invert_ordering(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+# end def
+
+
+def get_sort(request, param, fields):
+    '''
+    Reads a sort param naming one of fields, optionally prefixed with '-'
+    Raises ValueError for anything else, views return 400
+    '''
+    sort = request.query_params.get(param, None)
+    if sort is None:
+        return None
+    # end if
+
+    if sort.lstrip('-') not in fields or sort.startswith('--'):
+        raise ValueError(f'Invalid {param}: {sort}')
+    # end if
+    return sort
+# end def
+
+
+def get_keyset_ordering(sort, default):
+    '''
+    Ordering for a user supplied sort param, e.g. '-rating' -> ['-rating', '-id']
+    The id tiebreaker keeps the ordering unique so that cursors are stable
+    '''
+    if not sort:
+        return list(default)
+    # end if
+
+    return [sort, '-id' if sort.startswith('-') else 'id']
+# end def
+
+
+class StandardPageNumberPagination(PageNumberPagination):
+    '''
+    Page number pagination with ?page=&pageSize=, capped at MAX_PAGE_SIZE
+    '''
+    page_size_query_param = 'pageSize'
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE
+        self.max_page_size = settings.MAX_PAGE_SIZE
+    # end def
+# end class
+
+
+class KeysetPagination(BasePagination):
+    '''
+    Cursor pagination seeking on an indexed, unique ordering, e.g. ('-timestamp', '-id')
+    The cursor encodes the ordering values of the last row served,
+    so every page costs the same regardless of its depth
+    Malformed cursors are rejected with 400
+    '''
+    cursor_query_param = 'cursor'
+
+    def __init__(self, ordering):
+        self.ordering = list(ordering)
+    # end def
+
+    def encode_cursor(self, row, reverse):
+        values = [getattr(row, field.lstrip('-')) for field in self.ordering]
+        values = [str(value) if value is not None else None for value in values]
+        payload = json.dumps({'v': values, 'r': reverse}).encode('utf-8')
+        cursor = base64.urlsafe_b64encode(payload).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+    # end def
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param, None)
+        if not encoded:
+            return None
+        # end if
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            values, reverse = payload['v'], payload['r']
+        except (TypeError, ValueError, KeyError, UnicodeError) as e:
+            raise ParseError('Invalid cursor')
+        # end try-except
+
+        # valid json of the wrong shape, e.g. {"v": 1, "r": 1}
+        if not isinstance(values, list) or not isinstance(reverse, bool) or len(values) != len(self.ordering):
+            raise ParseError('Invalid cursor')
+        # end if
+        if not all(value is None or isinstance(value, str) for value in values):
+            raise ParseError('Invalid cursor')
+        # end if
+
+        return values, reverse
+    # end def
+
+    def get_order_by(self, ordering, nulls_last):
+        # nulls always sort after the values when paging forward, before them when paging back
+        nulls = {'nulls_last': True} if nulls_last else {'nulls_first': True}
+        return [F(field[1:]).desc(**nulls) if field.startswith('-') else F(field).asc(**nulls) for field in ordering]
+    # end def
+
+    def get_seek_filter(self, ordering, values, nulls_last):
+        '''
+        (a, b) > (x, y) expanded as a > x OR (a = x AND b > y)
+        '''
+        seek = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            value = values[index]
+
+            if value is None:
+                if nulls_last:
+                    continue  # nothing sorts after a null on this column
+                # end if
+                clause = Q(**{f'{name}__isnull': False})
+            else:
+                lookup = f'{name}__lt' if field.startswith('-') else f'{name}__gt'
+                clause = Q(**{lookup: value})
+                if nulls_last:
+                    clause |= Q(**{f'{name}__isnull': True})
+                # end if
+            # end if-else
+
+            for prev_field, prev_value in zip(ordering[:index], values[:index]):
+                prev_name = prev_field.lstrip('-')
+                if prev_value is None:
+                    clause &= Q(**{f'{prev_name}__isnull': True})
+                else:
+                    clause &= Q(**{prev_name: prev_value})
+                # end if-else
+            # end for
+
+            seek |= clause
+        # end for
+        return seek
+    # end def
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[1]
+        ordering = invert_ordering(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*self.get_order_by(ordering, not reverse))
+        if cursor is not None:
+            try:
+                queryset = queryset.filter(self.get_seek_filter(ordering, cursor[0], not reverse))
+            except (ValidationError, ValueError) as e:
+                raise ParseError('Invalid cursor')  # values that do not fit the ordering columns
+            # end try-except
+        # end if
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        # end if
+
+        self.first_row = rows[0] if len(rows) > 0 else None
+        self.last_row = rows[-1] if len(rows) > 0 else None
+        return rows
+    # end def
+
+    def get_next_link(self):
+        if not self.has_next or self.last_row is None:
+            return None
+        # end if
+        return self.encode_cursor(self.last_row, False)
+    # end def
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        # end if
+        if self.first_row is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        # end if
+        return self.encode_cursor(self.first_row, True)
+    # end def
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+    # end def
+# end class
+
+
+def paginate(request, queryset, serializer_class, context, ordering, always_paginate=False):
+    '''
+    Serializes a list endpoint with a bounded response size
+    ?cursor= -> keyset pagination on ordering
+    ?page= / ?pageSize= -> page number pagination
+    otherwise a plain list of at most MAX_PAGE_SIZE rows, unless always_paginate is set
+    '''
+    query_params = request.query_params
+
+    if not queryset.ordered:
+        queryset = queryset.order_by(*ordering)
+    # end if
+
+    if KeysetPagination.cursor_query_param in query_params:
+        paginator = KeysetPagination(ordering)
+    elif always_paginate or 'page' in query_params or 'pageSize' in query_params:
+        paginator = StandardPageNumberPagination()
+    else:
+        serializer = serializer_class(queryset[:settings.MAX_PAGE_SIZE], many=True, context=context)
+        return Response(serializer.data)
+    # end if-else
+
+    result_page = paginator.paginate_queryset(queryset, request)
+    serializer = serializer_class(result_page, many=True, context=context)
+    return paginator.get_paginated_response(serializer.data)
+# end def